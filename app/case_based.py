@@ -1,18 +1,13 @@
 import streamlit as st
-from logic.loaders import load_case, list_cases
+from collections.abc import Mapping
+from typing import Dict, NamedTuple, Tuple
+from logic.loaders import load_case_revision, list_case_summaries
+from logic import principles as pfce
+from logic import navigation as nav
+from logic.audit_log import default_log
+from logic.navigation import CASE_STEP_TITLES, CB_TOTAL_STEPS
 import html
 
-CB_TOTAL_STEPS = 9  
-
-def _safe_rerun():
-    try:
-        if hasattr(st, "rerun"):
-            st.rerun()
-        elif hasattr(st, "experimental_rerun"):
-            st.experimental_rerun()
-    except Exception:
-        pass
-
 
 PFCE_DEFINITIONS = {
     "Beneficence": (
@@ -75,7 +70,7 @@ def _bullets_html(value) -> str:
     if value is None:
         return "<div class='wt-tbd'>TBD</div>"
 
-    if isinstance(value, list):
+    if isinstance(value, (list, tuple)):
         if not value:
             return "<div class='wt-tbd'>TBD</div>"
         items = "".join(f"<li>{html.escape(str(item))}</li>" for item in value)
@@ -83,7 +78,204 @@ def _bullets_html(value) -> str:
 
     # plain string
     return f"<div class='wt-text'>{html.escape(str(value))}</div>"
-    
+
+
+# ==========================================================
+# WALKTHROUGH RENDER PLANS
+# ==========================================================
+# Each case is compiled once per file content into a CasePlan: the escaped
+# title header and the nine step tiles as finished HTML. Flipping steps is
+# then an index into plan.steps; nothing is re-escaped or rebuilt per rerun.
+
+class CaseStep(NamedTuple):
+    title: str        # plain step name
+    html: str         # complete tile markup
+
+
+class CasePlan(NamedTuple):
+    case_id: str
+    sha256: str
+    header_html: str
+    steps: Tuple[CaseStep, ...]
+
+
+def _tbd_html() -> str:
+    return "<div class='wt-tbd'>TBD</div>"
+
+
+def _list_html(items) -> str:
+    return f"<ul class='wt-list'>{''.join(items)}</ul>" if items else _tbd_html()
+
+
+def _title_link_html(url: str, hover: str, label: str) -> str:
+    # Framework name with tooltip + link to its source
+    return (
+        f'<a href="{html.escape(url)}" target="_blank" style="text-decoration: none;">'
+        f'  <span title="{html.escape(hover)}" '
+        f'        style="font-weight: 800; text-decoration: underline; cursor: help;">'
+        f'    {label}'
+        f'  </span>'
+        f'</a>'
+    )
+
+
+def _csf_mapping_html(mapping) -> str:
+    items = []
+    for m in mapping or []:
+        fn = html.escape(m.get("function", "TBD"))
+
+        cats = m.get("categories", [])
+        if isinstance(cats, str):
+            cats = [cats]
+        cat_text = html.escape(", ".join(cats) if cats else "TBD")
+
+        line = f"<li><strong>{fn} — {cat_text}</strong>"
+        if m.get("rationale"):
+            rationale = html.escape(m.get("rationale"))
+            line += (
+                f'<div class="wt-rationale">'
+                f'<span class="wt-rationale-label">Rationale:</span> {rationale}'
+                f'</div>'
+            )
+        items.append(line + "</li>")
+    return _list_html(items)
+
+
+def _tension_html(tension) -> str:
+    return _list_html([f"<li>{html.escape(t.get('description', 'TBD'))}</li>" for t in tension or []])
+
+
+def _pfce_analysis_html(pfce_items) -> str:
+    if not (isinstance(pfce_items, (list, tuple)) and pfce_items and isinstance(pfce_items[0], Mapping)):
+        # Fallback: render list/string/None as HTML bullets/text
+        return _bullets_html(pfce_items)
+
+    items = []
+    for p in pfce_items:
+        principle_raw = p.get("principle", "TBD")
+        principle = html.escape(str(principle_raw))
+        desc = html.escape(str(p.get("description", "TBD")))
+
+        definition = PFCE_DEFINITIONS.get(pfce.canonical(principle_raw) or principle_raw, "")
+        if definition:
+            principle_html = (
+                f"<span title='{html.escape(str(definition))}' "
+                f"style='font-weight:700; text-decoration: underline; cursor: help;'>"
+                f"{principle}</span>"
+            )
+        else:
+            principle_html = f"<strong>{principle}</strong>"
+
+        items.append(f"<li>{principle_html}: {desc}</li>")
+    return _list_html(items)
+
+
+def _constraints_html(constraints) -> str:
+    items = []
+    for c in constraints or []:
+        # Dict form: {type, description, effect_on_decision}
+        if isinstance(c, Mapping):
+            c_type = html.escape(str(c.get("type", "TBD")))
+            c_desc = html.escape(str(c.get("description", "TBD")))
+            line = f"<li><strong>{c_type}</strong> – {c_desc}"
+            if c.get("effect_on_decision"):
+                effect = html.escape(str(c.get("effect_on_decision")))
+                line += f"<div class='wt-effect'><em>Effect on decision:</em> {effect}</div>"
+            items.append(line + "</li>")
+        # String fallback
+        else:
+            items.append(f"<li>{html.escape(str(c))}</li>")
+    return _list_html(items)
+
+
+def _step_tile_html(title_html: str, body_html: str) -> str:
+    return _html_block(f"""
+        <div class="cb-wt-wrap">
+        <div class="cb-wt-tile-anchor"></div>
+        <div class="listbox walkthrough-tile">
+            <div class="walkthrough-step-title">{title_html}</div>
+            {body_html}
+        </div>
+        </div>
+    """)
+
+
+def compile_case_plan(case_id: str, sha256: str, case: Mapping) -> CasePlan:
+    """Build every step tile of a case walkthrough (pure; _case_plan caches it)."""
+    # Read-only view shared across sessions (see logic.loaders.DataCatalog):
+    # missing sections fall back to empty defaults instead of setdefault().
+    background = case.get("background") or {}
+    technical = case.get("technical") or {}
+    ethical = case.get("ethical") or {}
+    decision_outcome = case.get("decision_outcome") or {}
+
+    nist_title = _title_link_html(NIST_CSF_URL, NIST_CSF_HOVER, "NIST CSF")
+    pfce_title = _title_link_html(PFCE_URL, PFCE_HOVER, "PFCE")
+
+    # (title markup when it differs from the plain title, body markup),
+    # in the order of CASE_STEP_TITLES
+    steps = (
+        (None, _bullets_html(background.get("technical_operational_background"))),
+        (None, _bullets_html(background.get("triggering_condition_key_events"))),
+        (None, _bullets_html(technical.get("decision_context"))),
+        (f"{nist_title} Mapping", _csf_mapping_html(technical.get("nist_csf_mapping"))),
+        (None, _tension_html(ethical.get("tension"))),
+        (f"{pfce_title} Analysis", _pfce_analysis_html(ethical.get("pfce_analysis", []))),
+        (None, _constraints_html(case.get("constraints"))),
+        (None, _bullets_html(decision_outcome.get("decision"))),
+        (None, _bullets_html(decision_outcome.get("outcomes_implications"))),
+    )
+
+    case_title = case.get("ui_title") or case.get("title") or case_id or ""
+    header_html = _html_block(f"""
+        <div style="text-align:center; margin-top: 0;">
+          <h2 style="margin: 0 0 0.25rem 0;">{html.escape(str(case_title))}</h2>
+        </div>
+    """)
+
+    return CasePlan(
+        case_id=case_id,
+        sha256=sha256,
+        header_html=header_html,
+        steps=tuple(
+            CaseStep(title, _step_tile_html(title_html or title, body))
+            for title, (title_html, body) in zip(CASE_STEP_TITLES, steps, strict=True)
+        ),
+    )
+
+
+# (case_id, file sha256) -> plan, shared by every session. A plain dict, not
+# st.cache_resource: its per-call key hashing costs more than the lookup saves.
+_PLANS: Dict[Tuple[str, str], CasePlan] = {}
+_PLANS_MAX = 64
+
+
+def _case_plan(case_id: str, sha256: str, case: Mapping) -> CasePlan:
+    key = (case_id, sha256)
+    plan = _PLANS.get(key)
+    if plan is None:
+        plan = compile_case_plan(case_id, sha256, case)
+        if len(_PLANS) >= _PLANS_MAX:
+            _PLANS.pop(next(iter(_PLANS)), None)   # oldest first
+        _PLANS[key] = plan
+    return plan
+
+
+def _audit_completion(case_id: str, sha256: str, step: int):
+    """Log a completed walkthrough once each time its final step is reached."""
+    if not sha256:
+        return   # not a case file (NO_CASE); nothing was walked through
+    if step < CB_TOTAL_STEPS:
+        st.session_state.pop("cb_audited", None)
+        return
+    if st.session_state.get("cb_audited") == case_id:
+        return
+    st.session_state["cb_audited"] = case_id
+    log = default_log()
+    if log is not None:
+        log.record("cb.completed", case_id=case_id, case_sha256=sha256)
+
+
 def render_case(case_id: str):
     # ==========================================================
     # VIEW STATE (default to "select" to avoid dropdown + open button)
@@ -96,8 +288,8 @@ def render_case(case_id: str):
     # VIEW 0: SELECT (three tiles, landing-page styling)
     # ==========================================================
     if view == "select":
-        cases = list_cases() or []
-        top_cases = cases[:3]
+        # Header-only summaries; full documents load when a walkthrough opens
+        top_cases = list_case_summaries(limit=3)
 
         # --- Select a Case header ---
         st.markdown(
@@ -144,8 +336,8 @@ def render_case(case_id: str):
         cols = st.columns(3, gap="large")
 
         for col, c in zip(cols, top_cases):
-            cid = c.get("id", "")
-            title = c.get("ui_title") or c.get("title", "TBD")
+            cid = c.id
+            title = c.ui_title or c.title or "TBD"
             cid_norm = str(cid).strip().lower()
             hook = CASE_HOOKS.get(cid_norm, "")
 
@@ -192,20 +384,12 @@ def render_case(case_id: str):
     # ==========================================================
     # WALKTHROUGH: load selected case
     # ==========================================================
-    case = load_case(case_id) or {}
-
-    # --- normalize expected top-level sections ---
-    case.setdefault("background", {})
-    case.setdefault("technical", {})
-    case.setdefault("ethical", {})
-    case.setdefault("constraints", [])
-    case.setdefault("decision_outcome", {})
-    case.setdefault("at_a_glance", {})  # <-- ensure at_a_glance exists
-
-    case["technical"].setdefault("nist_csf_mapping", [])
-    case["ethical"].setdefault("tensions", [])
-    case["ethical"].setdefault("pfce_analysis", [])
-    case["decision_outcome"].setdefault("ethical_implications", [])
+    revision = load_case_revision(case_id)
+    if not revision.sha256:
+        # Unknown id (e.g. a hand-edited ?cb_case_id= link): there is no walkthrough to show or audit
+        st.error(f"Case not found: {case_id or '—'}. Go back to the case selection to pick a case.")
+        return
+    plan = _case_plan(case_id, revision.sha256, revision.doc)
 
     # ==========================================================
     # RESET NAVIGATION WHEN CASE CHANGES
@@ -222,7 +406,6 @@ def render_case(case_id: str):
         st.session_state["cb_prev_case_id"] = case_id
         st.session_state["cb_view"] = "walkthrough"
         st.session_state.pop("cb_step_return", None)
-        # IMPORTANT: do NOT call _safe_rerun() here
 
     # ==========================================================
     # VIEW 2: WALKTHROUGH (STEP-BASED)
@@ -234,31 +417,12 @@ def render_case(case_id: str):
         if "cb_step" not in st.session_state:
             st.session_state["cb_step"] = 1
         step = st.session_state["cb_step"]
-
-        def _render_step_tile_html(title, body):
-            st.markdown(f"""
-            <div class="cb-wt-wrap">
-            <div class="cb-wt-tile-anchor"></div>
-            <div class="listbox walkthrough-tile">
-                <div class="walkthrough-step-title">{title}</div>
-                {body}
-            </div>
-            </div>
-            """, unsafe_allow_html=True)
-
+        _audit_completion(case_id, revision.sha256, step)
 
         # -------------------------
         # Walkthrough header (case title)
         # -------------------------
-        case_title = case.get("ui_title") or case.get("title") or case_id or ""
-        st.markdown(
-            f"""
-            <div style="text-align:center; margin-top: 0;">
-              <h2 style="margin: 0 0 0.25rem 0;">{html.escape(str(case_title))}</h2>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+        st.markdown(plan.header_html, unsafe_allow_html=True)
 
         # Divider under case title
         st.markdown(
@@ -278,176 +442,10 @@ def render_case(case_id: str):
             unsafe_allow_html=True,
         )
 
-        st.progress(step / 9.0)
-        st.caption(f"Step {step} of 9")
-
-        if step == 1:
-            title = "Technical and Operational Background"
-            body = _bullets_html(case["background"].get("technical_operational_background"))
-            _render_step_tile_html(title, body)
-
-        elif step == 2:
-            title = "Triggering Condition and Key Events"
-            body = _bullets_html(case["background"].get("triggering_condition_key_events"))
-            _render_step_tile_html(title, body)
-
-        elif step == 3:
-            title = "Decision Context"
-            body = _bullets_html(case["technical"].get("decision_context"))
-            _render_step_tile_html(title, body)
+        st.progress(step / float(CB_TOTAL_STEPS))
+        st.caption(f"Step {step} of {CB_TOTAL_STEPS}")
 
-        elif step == 4:
-            mapping = case["technical"].get("nist_csf_mapping", [])
-
-            if mapping:
-                items = []
-                for m in mapping:
-                    fn = html.escape(m.get("function", "TBD"))
-
-                    cats = m.get("categories", [])
-                    if isinstance(cats, str):
-                        cats = [cats]
-                    cat_text = html.escape(", ".join(cats) if cats else "TBD")
-
-                    line = f"<li><strong>{fn} — {cat_text}</strong>"
-
-                    if m.get("rationale"):
-                        rationale = html.escape(m.get("rationale"))
-                        line += f"""
-                        <div class="wt-rationale">
-                            <span class="wt-rationale-label">Rationale:</span> {rationale}
-                        </div>
-                        """
-                    line += "</li>"
-
-                    items.append(line)
-
-                body = f"<ul class='wt-list'>{''.join(items)}</ul>"
-            else:
-                body = "<div class='wt-tbd'>TBD</div>"
-
-            # NIST CSF title with tooltip + link (unchanged behavior)
-            nist_title = (
-                f'<a href="{html.escape(NIST_CSF_URL)}" target="_blank" style="text-decoration: none;">'
-                f'  <span title="{html.escape(NIST_CSF_HOVER)}" '
-                f'        style="font-weight: 800; text-decoration: underline; cursor: help;">'
-                f'    NIST CSF'
-                f'  </span>'
-                f'</a>'
-            )
-
-            title = f"{nist_title} Mapping"
-
-            _render_step_tile_html(title, body)
-
-
-        elif step == 5:
-            tension = case["ethical"].get("tension", [])
-
-            if tension:
-                items = []
-                for t in tension:
-                    desc = html.escape(t.get("description", "TBD"))
-                    items.append(f"<li>{desc}</li>")
-                body = f"<ul class='wt-list'>{''.join(items)}</ul>"
-            else:
-                body = "<div class='wt-tbd'>TBD</div>"
-
-            title = "Ethical Tension"
-
-            _render_step_tile_html(title, body)
-
-
-        elif step == 6:
-            pfce_items = case["ethical"].get("pfce_analysis", [])
-
-            # PFCE title tooltip + link (preserved)
-            pfce_title = (
-                f'<a href="{html.escape(PFCE_URL)}" target="_blank" style="text-decoration: none;">'
-                f'  <span title="{html.escape(PFCE_HOVER)}" '
-                f'        style="font-weight: 800; text-decoration: underline; cursor: help;">'
-                f'    PFCE'
-                f'  </span>'
-                f'</a>'
-            )
-
-            # Body
-            if isinstance(pfce_items, list) and pfce_items and isinstance(pfce_items[0], dict):
-                items = []
-                for p in pfce_items:
-                    principle_raw = p.get("principle", "TBD")
-                    desc_raw = p.get("description", "TBD")
-
-                    principle = html.escape(str(principle_raw))
-                    desc = html.escape(str(desc_raw))
-
-                    definition = PFCE_DEFINITIONS.get(principle_raw, "")
-                    if definition:
-                        definition_esc = html.escape(str(definition))
-                        principle_html = (
-                            f"<span title='{definition_esc}' "
-                            f"style='font-weight:700; text-decoration: underline; cursor: help;'>"
-                            f"{principle}</span>"
-                        )
-                    else:
-                        principle_html = f"<strong>{principle}</strong>"
-
-                    items.append(f"<li>{principle_html}: {desc}</li>")
-
-                body = f"<ul class='wt-list'>{''.join(items)}</ul>"
-            else:
-                # Fallback: render list/string/None as HTML bullets/text
-                body = _bullets_html(pfce_items)
-
-            title = f"{pfce_title} Analysis"
-
-            _render_step_tile_html(title, body)
-
-
-        elif step == 7:
-            constraints = case.get("constraints", [])
-
-            if constraints:
-                items = []
-
-                for c in constraints:
-                    # Dict form: {type, description, effect_on_decision}
-                    if isinstance(c, dict):
-                        c_type = html.escape(str(c.get("type", "TBD")))
-                        c_desc = html.escape(str(c.get("description", "TBD")))
-
-                        line = f"<li><strong>{c_type}</strong> – {c_desc}"
-
-                        if c.get("effect_on_decision"):
-                            effect = html.escape(str(c.get("effect_on_decision")))
-                            line += f"<div class='wt-effect'><em>Effect on decision:</em> {effect}</div>"
-
-                        line += "</li>"
-                        items.append(line)
-
-                    # String fallback
-                    else:
-                        items.append(f"<li>{html.escape(str(c))}</li>")
-
-                body = f"<ul class='wt-list'>{''.join(items)}</ul>"
-            else:
-                body = "<div class='wt-tbd'>TBD</div>"
-
-            title = "Institutional and Governance Constraints"
-
-            _render_step_tile_html(title, body)
-
-
-        elif step == 8:
-            title = "Decision"
-            body = _bullets_html(case["decision_outcome"].get("decision"))
-            _render_step_tile_html(title, body)
-
-
-        elif step == 9:
-            title = "Outcomes and Implications"
-            body = _bullets_html(case["decision_outcome"].get("outcomes_implications"))
-            _render_step_tile_html(title, body)
+        st.markdown(plan.steps[step - 1].html, unsafe_allow_html=True)
 
 
     # NAV CONTROLS
@@ -461,17 +459,19 @@ def render_case(case_id: str):
 
         with col_l:
             if step > 1:
-                if st.button("◀ Previous", key=f"cb_prev_{case_id}_{step}", use_container_width=False):
-                    st.session_state["cb_step"] = step - 1
-                    _safe_rerun()
+                st.button(
+                    "◀ Previous", key=f"cb_prev_{case_id}_{step}", use_container_width=False,
+                    on_click=nav.fire, args=(st.session_state, "prev", "cb"),
+                )
             else:
                 st.empty()
 
         with col_r:
             if step < CB_TOTAL_STEPS:
-                if st.button("Next ▶", key=f"cb_next_{case_id}_{step}", use_container_width=False):
-                    st.session_state["cb_step"] = step + 1
-                    _safe_rerun()
+                st.button(
+                    "Next ▶", key=f"cb_next_{case_id}_{step}", use_container_width=False,
+                    on_click=nav.fire, args=(st.session_state, "next", "cb"),
+                )
             else:
                 st.button("End of Case", key=f"cb_end_{case_id}", disabled=True, use_container_width=False)
 
@@ -0,0 +1,98 @@
+import streamlit as st
+import numpy as np
+
+from logic import decision_analytics as da
+from logic import navigation as nav
+from logic import principles as pfce
+from logic.perf import timed
+
+
+@st.cache_resource(max_entries=2)
+def _columns(signature: tuple) -> da.DecisionColumns:
+    # Keyed on the log's (segment, size) signature, so new events are picked
+    # up on the next render; the arrays are shared read-only across sessions.
+    return da.load_columns()
+
+
+def _month_rows(cols: da.DecisionColumns, first: str, last: str) -> np.ndarray:
+    months = cols.ts.astype("datetime64[M]")
+    return (months >= np.datetime64(first, "M")) & (months <= np.datetime64(last, "M"))
+
+
+def _render_principles_by_month(cols: da.DecisionColumns):
+    st.markdown("#### Most-implicated PFCE principle per CSF function per month")
+    rows = da.top_principles(da.principles_by_function_month(cols))
+    if not rows:
+        st.caption("No open-ended rationales in this period.")
+        return
+    table = {"Month": [], "CSF function": [], "Principle": [], "Implicated in": [], "Rationales": []}
+    for month, function, principle, count, total in rows:
+        table["Month"].append(month)
+        table["CSF function"].append(function)
+        table["Principle"].append(principle)
+        table["Implicated in"].append(count)
+        table["Rationales"].append(total)
+    st.dataframe(table, hide_index=True)
+
+
+def _render_principles_by_function(cols: da.DecisionColumns):
+    st.markdown("#### PFCE principles by CSF function")
+    counts = da.principle_counts_by_function(cols)
+    table = {"CSF function": list(cols.functions)}
+    table.update({name: counts[:, i].tolist() for i, name in enumerate(pfce.PRINCIPLES)})
+    st.dataframe(table, hide_index=True)
+
+
+def _render_constraint_cooccurrence(cols: da.DecisionColumns):
+    st.markdown("#### Constraint co-occurrence")
+    if not cols.constraints:
+        st.caption("No constraints selected in this period.")
+        return
+    st.caption("How often two constraints were selected in the same rationale; the diagonal counts each on its own.")
+    matrix = da.constraint_cooccurrence(cols)
+    table = {"Constraint": list(cols.constraints)}
+    table.update({name: matrix[:, i].tolist() for i, name in enumerate(cols.constraints)})
+    st.dataframe(table, hide_index=True)
+
+
+def _render_case_completions(cols: da.DecisionColumns):
+    st.markdown("#### Case walkthroughs completed")
+    counts = da.counts_by(cols.case[cols.event == da.CASE_COMPLETED], cols.cases)
+    st.dataframe({"Case": list(cols.cases), "Completions": counts.tolist()}, hide_index=True)
+
+
+def render_dashboard():
+    st.button(
+        "← Back", key="dashboard_back", type="secondary",
+        on_click=nav.fire, args=(st.session_state, "close_dashboard"),
+    )
+    st.markdown("<h2>Decision Analytics</h2>", unsafe_allow_html=True)
+
+    signature = da.signature()
+    if not signature:
+        st.info("No decisions have been logged yet. Generated open-ended rationales and completed case walkthroughs appear here.")
+        return
+
+    with timed("dashboard.load"), st.spinner("Reading the decision log..."):
+        cols = _columns(signature)
+    if not cols.rows:
+        st.info("No decisions have been logged yet.")
+        return
+
+    months = np.unique(cols.ts.astype("datetime64[M]")).astype(str).tolist()
+    if len(months) > 1:
+        first, last = st.select_slider("Period", options=months, value=(months[0], months[-1]), key="dashboard_period")
+        cols = cols.where(_month_rows(cols, first, last))
+
+    with timed("dashboard.aggregate"):
+        rationales = int((cols.event == da.RATIONALE).sum())
+        completions = int((cols.event == da.CASE_COMPLETED).sum())
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Open-ended rationales", f"{rationales:,}")
+        c2.metric("Case walkthroughs completed", f"{completions:,}")
+        c3.metric("Months", len(np.unique(cols.ts.astype("datetime64[M]"))))
+
+        _render_principles_by_month(cols)
+        _render_principles_by_function(cols)
+        _render_constraint_cooccurrence(cols)
+        _render_case_completions(cols)
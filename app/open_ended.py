@@ -1,28 +1,45 @@
+import html
+import logging
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from collections.abc import Mapping
+from contextlib import contextmanager
 from datetime import datetime
-from io import BytesIO
+from functools import partial
+from urllib.parse import quote
 
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import LETTER
-import textwrap
 
 from logic.loaders import (
     load_csf_data,
     load_pfce_crosswalk,
+    load_crosswalk_index,
+    load_incidence_matrix,
+    load_subcategory_index,
+    load_outcome_index,
+    load_case_similarity,
     load_pfce_principles,
     load_constraints,
 )
-from logic.reasoning import apply_crosswalk, summarize_pfce
-
-
-def _safe_rerun():
-    try:
-        if hasattr(st, "rerun"):
-            st.rerun()
-        elif hasattr(st, "experimental_rerun"):
-            st.experimental_rerun()
-    except Exception:
-        pass
+from logic.reasoning import apply_crosswalk, summarize_pfce, scan_csf_functions
+from logic import navigation as nav
+from logic.audit_log import default_log
+from logic.draft import OpenEndedDraft
+from logic.draft_store import DraftStore, new_draft_id
+from logic import principles as pfce
+from logic.navigation import OE_TOTAL_STEPS
+from logic.pdf_jobs import PdfJobPool
+from logic.perf import timed
+from logic import session_token
+from logic.rationale import (
+    TEXT_FORMATS,
+    Field as RationaleField,
+    RationaleDocument,
+    Text as RationaleText,
+    build_open_ended_rationale,
+    sections as rationale_sections,
+    to_pdf_blocks,
+    visible_entries,
+)
 
 
 def _html_block(s: str) -> str:
@@ -111,13 +128,13 @@ CSF_FUNCTION_OPTIONS = {
 }
 
 
-@st.cache_data
 def _load_core_data():
+    # Frozen views into the shared catalog; no per-rerun copies.
     csf = load_csf_data()
     crosswalk = load_pfce_crosswalk()
-    pfce = load_pfce_principles()
+    principles = load_pfce_principles()
     constraints = load_constraints()
-    return csf, crosswalk, pfce, constraints
+    return csf, crosswalk, principles, constraints
 
 OE_STEP_TITLES = {
     1: "Decision Context",
@@ -126,10 +143,16 @@ OE_STEP_TITLES = {
     4: "Institutional and Governance Constraints",
     5: "Decision (and documented rationale)",
 }
-OE_TOTAL_STEPS = len(OE_STEP_TITLES)
 
 
 CSF_DATA, PFCE_CROSSWALK, PFCE_PRINCIPLES, GOV_CONSTRAINTS_RAW = _load_core_data()
+CROSSWALK_INDEX = load_crosswalk_index()
+INCIDENCE = load_incidence_matrix()
+SUBCATEGORY_INDEX = load_subcategory_index()
+OUTCOME_INDEX = load_outcome_index()
+
+# Step 2 subcategory picker: rows rendered per page
+SUB_PAGE_SIZE = 10
 PFCE_NAMES = [p.get("name", "") for p in PFCE_PRINCIPLES if p.get("name")]
 
 
@@ -167,9 +190,9 @@ PFCE_PROMPTS = {
 
 
 def _index_csf(csf_raw):
-    if isinstance(csf_raw, dict):
+    if isinstance(csf_raw, Mapping):
         functions = csf_raw.get("functions", []) or []
-    elif isinstance(csf_raw, list):
+    elif isinstance(csf_raw, (list, tuple)):
         functions = csf_raw
     else:
         functions = []
@@ -220,10 +243,10 @@ CATS_BY_FUNC, SUBS_BY_CAT, CAT_DESC_BY_ID = _index_csf(CSF_DATA)
 
 
 def _normalize_constraints(raw):
-    if isinstance(raw, list):
+    if isinstance(raw, (list, tuple)):
         return [str(x) for x in raw]
-    if isinstance(raw, dict):
-        if isinstance(raw.get("constraints"), list):
+    if isinstance(raw, Mapping):
+        if isinstance(raw.get("constraints"), (list, tuple)):
             return [str(x) for x in raw["constraints"]]
         return [str(v) for v in raw.values()]
     return []
@@ -232,32 +255,11 @@ def _normalize_constraints(raw):
 GOV_CONSTRAINTS = _normalize_constraints(GOV_CONSTRAINTS_RAW)
 
 
-CSF_HINT_KEYWORDS = {
-    "GV": ["policy", "policies", "authority", "approval", "oversight", "governance", "charter", "compliance", "board", "council"],
-    "ID": ["inventory", "inventories", "classify", "classification", "asset", "assets", "dependency", "dependencies", "risk register", "risk assessment"],
-    "PR": ["access", "permission", "privilege", "authorization", "encrypt", "encryption", "credential", "password", "data protection", "control", "controls", "configuration"],
-    "DE": ["monitor", "monitoring", "alert", "alerts", "anomaly", "anomalies", "flagged", "suspicious", "detection", "log review"],
-    "RS": ["disconnect", "isolate", "contain", "mitigate", "shutdown", "shut down", "take offline", "incident response", "triage", "manual control", "disable automation", "block traffic"],
-    "RC": ["restore", "restoration", "rebuild", "recover", "back online", "return to operations", "post-incident review", "lessons learned"],
-}
-
-
 def guess_csf_function(decision_text: str):
+    """Best-matching CSF function id for the decision text, or None."""
     if not decision_text:
         return None
-
-    text = decision_text.lower()
-    scores = {fn: 0 for fn in CSF_HINT_KEYWORDS.keys()}
-
-    for fn, keywords in CSF_HINT_KEYWORDS.items():
-        for kw in keywords:
-            if kw in text:
-                scores[fn] += 1
-
-    if all(score == 0 for score in scores.values()):
-        return None
-
-    return max(scores, key=scores.get)
+    return scan_csf_functions(decision_text).best
 
 
 TRIGGER_EXAMPLE_OPTIONS = [
@@ -304,35 +306,96 @@ ETHICAL_CONDITION_TAG_OPTIONS = [
 ]
 
 
-def _build_pdf(title: str, lines: list[str]) -> BytesIO:
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=LETTER)
-    width, height = LETTER
+@st.cache_resource
+def _pdf_jobs() -> PdfJobPool:
+    # One pool per server process, shared by every session; deferred PDF
+    # downloads wait on it from Streamlit's download thread, never the script.
+    return PdfJobPool()
 
-    x = 54
-    y = height - 54
 
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(x, y, title[:120])
-    y -= 24
+@st.cache_resource
+def _draft_store():
+    # One store (and writer thread) per server process; None disables autosave
+    # when the database cannot be opened, e.g. on a read-only filesystem.
+    try:
+        return DraftStore()
+    except Exception:
+        logging.getLogger(__name__).exception("draft autosave disabled")
+        return None
 
-    c.setFont("Helvetica", 10)
 
-    for raw in lines:
-        wrapped = textwrap.wrap(raw, width=100) if raw else [""]
-        for wline in wrapped:
-            if y < 72:
-                c.showPage()
-                c.setFont("Helvetica", 10)
-                y = height - 54
-            c.drawString(x, y, wline)
-            y -= 14
-        y -= 6
+def _render_rationale(doc: RationaleDocument):
+    st.markdown(f"#### {doc.title}")
+    st.write(f"**Timestamp:** {doc.record['generated_at']}")
+    for section in rationale_sections(doc):
+        st.markdown(f"**{section.heading}**")
+        for e in visible_entries(section):
+            if isinstance(e, RationaleField):
+                st.write(f"**{e.label}:** {e.value or '—'}")
+            elif isinstance(e, RationaleText):
+                st.write(e.text or "—")
+            else:
+                if e.label:
+                    st.write(f"**{e.label}:**")
+                st.markdown("\n".join(f"- {item}" for item in e.items or ("—",)))
+
+
+def _render_rationale_downloads(doc: RationaleDocument):
+    """
+    One download per format; each file is rendered only when its button is
+    clicked. on_click="ignore" keeps a download from rerunning the script, so
+    the rationale and the other formats stay on screen (and Generate is not
+    needed, or audited, again).
+    """
+    jobs = _pdf_jobs()
+    cols = st.columns(1 + len(TEXT_FORMATS))
+    with cols[0]:
+        st.download_button(
+            "Download PDF",
+            data=partial(jobs.render, doc.title, to_pdf_blocks(doc)),
+            file_name="decision_rationale_open_ended.pdf",
+            mime="application/pdf",
+            key="oe_download_pdf",
+            on_click="ignore",
+        )
+    for col, (label, ext, mime, renderer) in zip(cols[1:], TEXT_FORMATS):
+        with col:
+            st.download_button(
+                f"Download {label}",
+                data=partial(renderer, doc),
+                file_name=f"decision_rationale_open_ended.{ext}",
+                mime=mime,
+                key=f"oe_download_{ext}",
+                on_click="ignore",
+            )
+
+
+def _render_function_coverage(func_id: str):
+    """Crosswalk coverage view: which PFCE principles dominate a CSF function."""
+    rollup = INCIDENCE.function_rollup(func_id)
+    if not rollup or not rollup["subcategories"]:
+        st.caption("—")
+        return
+
+    func_label = CSF_FUNCTION_OPTIONS.get(func_id, {}).get("label", func_id)
+    total = rollup["subcategories"]
+    top = rollup["dominant"][:2]
+    if top:
+        st.caption(
+            f"Across the {total} subcategory outcomes in {func_label}, the crosswalk most often implicates "
+            + " and ".join(f"**{name}** ({rollup['counts'][name]} of {total})" for name in top)
+            + "."
+        )
+
+    table = {"Category": [], "Outcomes": []}
+    table.update({name: [] for name in pfce.PRINCIPLES})
+    for cat in rollup["categories"]:
+        table["Category"].append(cat["category_id"])
+        table["Outcomes"].append(cat["subcategories"])
+        for name in pfce.PRINCIPLES:
+            table[name].append(cat["counts"][name])
+    st.dataframe(table, hide_index=True)
 
-    c.showPage()
-    c.save()
-    buffer.seek(0)
-    return buffer
 
 def _render_open_header(step: int):
     step_title = OE_STEP_TITLES.get(step, "Open-Ended Mode")
@@ -362,49 +425,172 @@ def _render_open_header(step: int):
         """,
         unsafe_allow_html=True,
     )
-def render_open_ended():
-    # ==========================================================
-    # WALKTHROUGH STATE (single flow, no gate)
-    # ==========================================================
-    if "oe_step" not in st.session_state:
-        st.session_state["oe_step"] = 1
-    step = st.session_state["oe_step"]
 
-    total_steps = OE_TOTAL_STEPS
 
-    _render_open_header(step)
-    st.progress(step / float(total_steps))
-    st.caption(f"Step {step} of {total_steps}")
+def _render_similar_cases(func_id: str, cat_id: str, pfce_mask: int, text: str) -> None:
+    """Top library cases for the current decision, linked into Case-Based mode."""
+    hits = load_case_similarity().rank(func_id or None, cat_id or None, pfce_mask, text, k=3)
+    if not hits:
+        return
 
-    def _render_step_tile_html(title: str, body_html: str):
+    st.markdown("---")
+    st.markdown("#### Similar cases from the library")
+    st.caption("Ranked by shared CSF function/category, PFCE principles, and decision wording.")
+    for hit in hits:
         st.markdown(
             f"""
-            <div class="listbox walkthrough-tile">
-            <div class="walkthrough-step-title">{title}</div>
-            {body_html}
+            <a href="?cb_case_id={html.escape(quote(hit.case_id, safe=''))}" target="_self"
+            style="text-decoration:none; color: inherit; display:block;">
+            <div class="listbox" style="cursor:pointer;">
+                <div class="walkthrough-step-title">{html.escape(hit.ui_title or hit.case_id)}</div>
+                <div>Match {hit.score:.0%} · CSF {hit.csf:.0%} · PFCE {hit.pfce:.0%} · Text {hit.text:.0%}</div>
             </div>
+            </a>
             """,
             unsafe_allow_html=True,
         )
 
-    # ==========================================================
-    # STEP 1: DECISION CONTEXT
-    # ==========================================================
-    if step == 1:
-        # Tighten spacing ONLY for this Step 1 text area
-        st.markdown(
-            """
-            <style>
-            /* Scope to Open-Ended Step 1 only */
-            div[data-testid="stVerticalBlock"]:has(#oe-step1-anchor)
-            div[data-testid="stTextArea"]{
-            margin-top: 0 !important;
-            }
-            </style>
-            <div id="oe-step1-anchor"></div>
-            """,
-            unsafe_allow_html=True,
-        )
+
+def _render_step_tile_html(title: str, body_html: str = ""):
+    st.markdown(
+        f"""
+        <div class="listbox walkthrough-tile">
+        <div class="walkthrough-step-title">{title}</div>
+        {body_html}
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+
+def _in_fragment_rerun() -> bool:
+    # Streamlit has no public "is this a fragment-only rerun?" check, and a flag
+    # set by the fragment itself can't tell (fragments also run in full reruns).
+    # ScriptRunContext.fragment_ids_this_run is internal API: read it defensively
+    # so an upgrade that drops it degrades to "not a fragment rerun".
+    ctx = get_script_run_ctx()
+    return bool(ctx is not None and getattr(ctx, "fragment_ids_this_run", None))
+
+
+def _set_step_complete(step: int, complete: bool):
+    """
+    Record whether a step's required selections are complete. The nav controls
+    sit outside the step fragment, so when a fragment-only rerun flips this,
+    rerun the whole app once to show/hide them.
+    """
+    key = f"oe_step{step}_complete"
+    changed = st.session_state.get(key) != complete
+    st.session_state[key] = complete
+    if changed and _in_fragment_rerun():
+        st.rerun()
+
+
+# ---------- Wizard state ----------
+
+def _draft() -> OpenEndedDraft:
+    """The wizard's working state (see logic.draft), one object per session."""
+    draft = st.session_state.get("oe_draft")
+    if draft is None:
+        draft = st.session_state["oe_draft"] = OpenEndedDraft()
+    return draft
+
+
+def _seed(key: str, value) -> str:
+    """
+    Widget key for a draft field. Streamlit drops a widget's key once it is
+    not rendered, so re-seed it from the draft when the step comes back.
+    """
+    if key not in st.session_state:
+        st.session_state[key] = value
+    return key
+
+
+def _autosave():
+    """
+    Queue the draft for the durable store when it changed since the last
+    save, and keep its resume link (?draft=<id>) in the URL. The store
+    debounces and batches the actual writes. In stateless replica mode the
+    signed state token (?s=) is refreshed here too.
+    """
+    session_token.sync_to(st.query_params, st.session_state)
+    draft = _draft()
+    store = _draft_store()
+    if store is None or draft.is_empty():
+        return
+
+    draft_id = st.session_state.get("oe_draft_id")
+    if not draft_id:
+        draft_id = st.session_state["oe_draft_id"] = new_draft_id()
+    if st.query_params.get("draft") != draft_id:
+        st.query_params["draft"] = draft_id
+
+    marker = (st.session_state.get("oe_step", 1), draft.snapshot())
+    if st.session_state.get("oe_saved") != marker:
+        st.session_state["oe_saved"] = marker
+        store.save(draft_id, marker[0], draft)
+
+
+def _resume_draft():
+    """Load the draft a ?draft=<id> link asked for (navigation's resume_draft)."""
+    draft_id = st.session_state.pop("oe_resume", None)
+    if not draft_id:
+        return
+    store = _draft_store()
+    saved = store.load(draft_id) if store is not None else None
+    if saved is None:
+        st.warning("That saved draft could not be found. Starting a new one.")
+        return
+
+    # Widget keys of the draft being replaced would override the restored values
+    for key in [k for k in st.session_state if k.startswith("oe_")]:
+        del st.session_state[key]
+    st.session_state["oe_draft"] = saved.draft
+    st.session_state["oe_draft_id"] = draft_id
+    st.session_state["oe_step"] = saved.step
+    st.session_state["oe_saved"] = (saved.step, saved.draft.snapshot())
+
+
+@contextmanager
+def _step_run(label: str):
+    """Time a step (fragment) run and autosave whatever it changed, including on st.stop()."""
+    with timed(label):
+        try:
+            yield
+        finally:
+            with timed("oe.autosave"):
+                _autosave()
+
+
+# ---------- Step 2 outcome selection ----------
+# Only the visible page has oe_sub_* checkboxes; their on_change callbacks
+# update draft.subcategories, so outcomes filtered or paged out stay selected.
+
+def _toggle_sub(sid: str):
+    draft = _draft()
+    selected = set(draft.subcategories)
+    if st.session_state.get(f"oe_sub_{sid}"):
+        selected.add(sid)
+    else:
+        selected.discard(sid)
+    draft.subcategories = tuple(OUTCOME_INDEX.in_catalog_order(selected))
+
+
+def _set_sub_page(page: int):
+    st.session_state["oe_sub_page"] = page
+
+
+# Wizard steps 1-4 are fragments: widget changes inside a step (e.g. toggling
+# an oe_sub_* or oe_pfce_* checkbox) rerun only that step, not main().
+
+# ==========================================================
+# STEP 1: DECISION CONTEXT
+# ==========================================================
+@st.fragment
+def _render_step1():
+    """Step 1: decision context and the keyword-suggested CSF function."""
+    with _step_run("oe.step1"):
+        # Tighten spacing ONLY for this Step 1 text area (rule in app/styles/main.css)
+        st.markdown('<div id="oe-step1-anchor"></div>', unsafe_allow_html=True)
 
         # Instruction text above the input
         st.markdown(
@@ -422,15 +608,30 @@ def render_open_ended():
             unsafe_allow_html=True
         )
 
+        draft = _draft()
+
         # Text box with ONLY guidance as placeholder
         decision_context = st.text_area(
             "Decision context",
-            key="oe_decision_context",
+            key=_seed("oe_decision_context", draft.decision_context),
             height=120,
             placeholder="1–2 sentences describing the decision context (not the outcome or justification).",
             label_visibility="collapsed",
         )
 
+        # Keyword pre-suggestion for the Step 2 CSF function (single-pass scan)
+        draft.decision_context = decision_context
+        scan = scan_csf_functions(decision_context)
+        suggested = scan.best
+        draft.suggested_function = suggested or ""
+        if suggested:
+            matched = ", ".join(scan.keywords_for(suggested))
+            st.caption(
+                f"Suggested NIST CSF function from your description: "
+                f"**{CSF_FUNCTION_OPTIONS[suggested]['label']}** (matched: {matched}). "
+                "You can confirm or change this in Step 2."
+            )
+
         # Optional examples (expander)
         st.markdown(
             _html_block(
@@ -457,10 +658,28 @@ def render_open_ended():
         )
 
 
-    # ==========================================================
-    # STEP 2: NIST CSF
-    # ==========================================================
-    elif step == 2:
+# ==========================================================
+# STEP 2: NIST CSF
+# ==========================================================
+@st.fragment
+def _render_step2():
+    """Step 2: CSF function, category and subcategory outcomes."""
+    with _step_run("oe.step2"):
+        # Outcomes whose text best matches the Step 1 decision context (BM25)
+        draft = _draft()
+        sub_hits = SUBCATEGORY_INDEX.search(draft.decision_context, k=5)
+        suggested_sub_ids = {hit.sub_id for hit in sub_hits}
+
+        if sub_hits:
+            sub_labels_all = {sid: lbl for _, subs in SUBS_BY_CAT.items() for sid, lbl in subs}
+            with st.expander("Outcomes most related to your decision context (optional)"):
+                st.caption(
+                    "Ranked by text similarity between your Step 1 description and each outcome "
+                    "and its implementation examples. Suggested outcomes are marked ★ below."
+                )
+                for hit in sub_hits:
+                    st.markdown(f"**{hit.sub_id}** — {sub_labels_all.get(hit.sub_id, '')}")
+
         # ---------- CSF Function ----------
         with st.container():
             st.markdown('<div class="csf-func-anchor"></div>', unsafe_allow_html=True)
@@ -472,52 +691,56 @@ def render_open_ended():
 
             codes_list = ["GV", "ID", "PR", "DE", "RS", "RC"]
 
+            # Pre-select the prior choice, else the Step 1 keyword suggestion
+            default_code = draft.csf_function or draft.suggested_function
+
             selected_code = st.radio(
                 "Select the description that best matches your situation:",
                 options=codes_list,
-                index=None,
-                key="oe_csf_choice_step2",
+                key=_seed("oe_csf_choice_step2", default_code if default_code in codes_list else None),
                 format_func=lambda c: CSF_FUNCTION_OPTIONS[c]["prompt"],
             )
 
-            prev_func = st.session_state.get("oe_csf_function")
-            if selected_code is not None and selected_code != prev_func:
+            if selected_code is not None and selected_code != draft.csf_function:
                 st.session_state["oe_csf_category"] = None
-                st.session_state["oe_csf_subcategories"] = []
+                draft.csf_category = ""
+                draft.subcategories = ()
 
             if selected_code is None:
                 csf_section_close()
+                _set_step_complete(2, False)
                 st.stop()
 
-            st.session_state["oe_csf_function"] = selected_code
-            st.session_state["oe_csf_function_label"] = CSF_FUNCTION_OPTIONS[selected_code]["label"]
+            draft.csf_function = selected_code
+            func_label = CSF_FUNCTION_OPTIONS[selected_code]["label"]
 
             st.info(
                 f"Based on your selection, your NIST CSF Function is: "
-                f"**{st.session_state['oe_csf_function_label']}**"
+                f"**{func_label}**"
             )
 
             csf_section_close()
 
 
         # ---------- CSF Category (subordinate) ----------
-        selected_func_id = st.session_state.get("oe_csf_function")
+        selected_func_id = draft.csf_function
 
         with st.container():
             st.markdown('<div class="csf-cat-anchor"></div>', unsafe_allow_html=True)
 
             csf_section_open(
                 "NIST CSF Category",
-                f"Within the {st.session_state['oe_csf_function_label']} function, what kind of work or concern is this decision about?"
+                f"Within the {func_label} function, what kind of work or concern is this decision about?"
             )
 
             cat_options = CATS_BY_FUNC.get(selected_func_id, [])
             cat_ids = [cid for cid, _ in cat_options]
             cat_labels = {cid: lbl for cid, lbl in cat_options}
 
-            current_cat = st.session_state.get("oe_csf_category")
+            current_cat = st.session_state.get("oe_csf_category", draft.csf_category)
             if current_cat not in cat_ids:
-                st.session_state["oe_csf_category"] = None 
+                current_cat = None
+            st.session_state["oe_csf_category"] = current_cat
 
 
             selected_cat_id = st.radio(
@@ -527,6 +750,7 @@ def render_open_ended():
                 key="oe_csf_category",
                 format_func=lambda cid: cat_labels.get(cid, cid),
             )
+            draft.csf_category = selected_cat_id or ""
 
 
             with st.expander("Preview category descriptions (optional)"):
@@ -539,8 +763,12 @@ def render_open_ended():
                         st.caption("—")
 
 
+            with st.expander("Preview PFCE coverage across this function (optional)"):
+                _render_function_coverage(selected_func_id)
+
             if selected_cat_id is None:
                 csf_section_close()
+                _set_step_complete(2, False)
                 st.stop()
 
             csf_section_close()
@@ -554,31 +782,71 @@ def render_open_ended():
                 "Select all outcomes that are directly implicated by this decision."
             )
 
-            subs = SUBS_BY_CAT.get(selected_cat_id, [])
-            selected_sub_ids = []
+            sub_labels = dict(SUBS_BY_CAT.get(selected_cat_id, []))
+            # Drop picks from another category
+            draft.subcategories = tuple(sid for sid in draft.subcategories if sid in sub_labels)
+            selected = set(draft.subcategories)
+
+            # Filter (prefix/trigram index) and page; only the visible slice gets widgets
+            query = ""
+            if len(sub_labels) > SUB_PAGE_SIZE:
+                query = st.text_input(
+                    "Filter outcomes",
+                    key="oe_sub_filter",
+                    placeholder="Type an ID or words, e.g. RS.MI-01 or contain",
+                    on_change=_set_sub_page,
+                    args=(0,),
+                )
+            matches = OUTCOME_INDEX.search(query, selected_cat_id)
+            n_pages = max(1, -(-len(matches) // SUB_PAGE_SIZE))
+            page = min(max(int(st.session_state.get("oe_sub_page", 0)), 0), n_pages - 1)
+            visible = matches[page * SUB_PAGE_SIZE:(page + 1) * SUB_PAGE_SIZE]
 
             with st.container(height=320):
-                for sid, label in subs:
-                    if st.checkbox(f"**{sid}** — {label}", key=f"oe_sub_{sid}"):
-                        selected_sub_ids.append(sid)
+                if not visible:
+                    st.caption("No outcomes in this category match the filter.")
+                for sid in visible:
+                    star = " ★" if sid in suggested_sub_ids else ""
+                    st.session_state[f"oe_sub_{sid}"] = sid in selected
+                    st.checkbox(
+                        f"**{sid}**{star} — {sub_labels[sid]}",
+                        key=f"oe_sub_{sid}",
+                        on_change=_toggle_sub,
+                        args=(sid,),
+                    )
+
+            if n_pages > 1:
+                col_prev, col_info, col_next = st.columns([1, 3, 1])
+                with col_prev:
+                    st.button("◀", key="oe_sub_page_prev", disabled=page == 0,
+                              on_click=_set_sub_page, args=(page - 1,))
+                with col_info:
+                    st.caption(
+                        f"Outcomes {page * SUB_PAGE_SIZE + 1}–{page * SUB_PAGE_SIZE + len(visible)} "
+                        f"of {len(matches)} · page {page + 1} of {n_pages}"
+                    )
+                with col_next:
+                    st.button("▶", key="oe_sub_page_next", disabled=page >= n_pages - 1,
+                              on_click=_set_sub_page, args=(page + 1,))
 
-            st.session_state["oe_csf_subcategories"] = selected_sub_ids
+            hidden = [sid for sid in draft.subcategories if sid not in visible]
+            if hidden:
+                st.caption("Also selected: " + ", ".join(hidden))
 
-            if not selected_sub_ids:
+            if not draft.subcategories:
                 st.warning("Select at least one CSF subcategory outcome to complete your CSF mapping.")
                 csf_section_close()
+                _set_step_complete(2, False)
                 st.stop()
 
 
         # ---------- CSF mapping summary (end-of-step confirmation) ----------
-        func_label = st.session_state.get("oe_csf_function_label", "—")
-
         # Build a global category label map (safe at end of Step 2)
         cat_labels_all = {cid: lbl for _, cats in CATS_BY_FUNC.items() for cid, lbl in cats}
-        cat_id = st.session_state.get("oe_csf_category")
+        cat_id = draft.csf_category
         cat_label = cat_labels_all.get(cat_id, cat_id) if cat_id else "—"
 
-        sub_ids = st.session_state.get("oe_csf_subcategories", []) or []
+        sub_ids = draft.subcategories
 
         st.info(
             "**NIST CSF 2.0 mapping complete**\n\n"
@@ -588,11 +856,45 @@ def render_open_ended():
             f"**Subcategory IDs:** {', '.join(sub_ids)}"
         )
 
+        _set_step_complete(2, True)
 
-    # ==========================================================
-    # STEP 3: PFCE + TENSION
-    # ==========================================================
-    elif step == 3:
+
+# ==========================================================
+# STEP 3: PFCE + TENSION
+# ==========================================================
+@st.fragment
+def _render_step3():
+    """Step 3: crosswalk suggestions, PFCE triage, analysis and ethical tension."""
+    with _step_run("oe.step3"):
+
+        # ---------- Crosswalk suggestions for the Step 2 subcategories ----------
+        draft = _draft()
+        step2_sub_ids = list(draft.subcategories)
+        crosswalk_hits = apply_crosswalk(step2_sub_ids, CROSSWALK_INDEX)
+
+        if crosswalk_hits:
+            with st.container():
+                st.markdown('<div class="pfce-crosswalk-anchor"></div>', unsafe_allow_html=True)
+
+                csf_section_open(
+                    "CSF → PFCE Crosswalk",
+                    "Principles the crosswalk associates with the subcategory outcomes you selected in Step 2. "
+                    "Use these as prompts for the triage below, not as conclusions."
+                )
+
+                counts = CROSSWALK_INDEX.principle_counts(step2_sub_ids)
+                ranked = sorted(counts.items(), key=lambda kv: (-kv[1], pfce.bit(kv[0])))
+                st.info(
+                    "Suggested principle(s): "
+                    + ", ".join(f"**{name}** ({n} of {len(crosswalk_hits)})" for name, n in ranked)
+                )
+
+                with st.expander("View crosswalk rationale per subcategory", expanded=False):
+                    for hit in crosswalk_hits:
+                        st.markdown(f"**{hit['csf_id']}** — {', '.join(hit['pfce'])}")
+                        st.caption(str(hit["rationale"]).strip())
+
+                csf_section_close()
 
         # ---------- PFCE principle triage (multi-select) ----------
         with st.container():
@@ -605,7 +907,7 @@ def render_open_ended():
             )
 
             selected_pfce_ids = []
-            pfce_ids = list(PFCE_DEFINITIONS.keys())  # e.g., ["Beneficence", "Non-maleficence", ...]
+            pfce_ids = list(pfce.PRINCIPLES)  # canonical order: ["Beneficence", "Non-maleficence", ...]
 
             # Keep list scannable; definitions available on demand
             with st.container(height=280):
@@ -615,7 +917,7 @@ def render_open_ended():
 
                     checked = st.checkbox(
                         f"**{pid}** — {prompt}" if prompt else f"**{pid}**",
-                        key=f"oe_pfce_{pid}",
+                        key=_seed(f"oe_pfce_{pid}", bool(draft.pfce_mask & pfce.bit(pid))),
                     )
                     if checked:
                         selected_pfce_ids.append(pid)
@@ -625,7 +927,7 @@ def render_open_ended():
                         with st.expander(f"View {pid} definition", expanded=False):
                             st.write(definition)
 
-            st.session_state["oe_pfce_principles"] = selected_pfce_ids
+            draft.pfce_mask = pfce.to_mask(selected_pfce_ids)
 
             if selected_pfce_ids:
                 st.info(f"Selected PFCE principle(s): **{', '.join(selected_pfce_ids)}**")
@@ -634,7 +936,7 @@ def render_open_ended():
 
             csf_section_close()
 
-        if not st.session_state.get("oe_pfce_principles"):
+        if not draft.pfce_mask:
             st.warning("Select at least one PFCE principle to continue to analysis and ethical tension.")
         else:
 
@@ -648,9 +950,9 @@ def render_open_ended():
                     "In 2–4 sentences, explain what is ethically significant about this decision context using the selected principles as reference points."
                 )
 
-                st.text_area(
+                draft.pfce_analysis = st.text_area(
                     "PFCE analysis",
-                    key="oe_pfce_analysis",
+                    key=_seed("oe_pfce_analysis", draft.pfce_analysis),
                     height=160,
                     placeholder=(
                         "Example: Containment actions may reduce spread but disrupt essential services; "
@@ -670,45 +972,81 @@ def render_open_ended():
                     "State the central tension as two justified obligations that cannot both be fully fulfilled."
                 )
 
-                a = st.text_area(
+                draft.tension_a = st.text_area(
                     "Obligation A",
-                    key="oe_tension_a",
+                    key=_seed("oe_tension_a", draft.tension_a),
                     height=90,
                     placeholder="Example: Maintain continuity of essential services to prevent harm to residents.",
                 )
 
-                b = st.text_area(
+                draft.tension_b = st.text_area(
                     "Obligation B",
-                    key="oe_tension_b",
+                    key=_seed("oe_tension_b", draft.tension_b),
                     height=90,
                     placeholder="Example: Contain the threat quickly to prevent wider compromise and longer disruption.",
                 )
 
-                st.session_state["oe_ethical_tension"] = f"{a.strip()}  ⟷  {b.strip()}".strip(" ⟷ ")
-
                 csf_section_close()
 
 
-    # ==========================================================
-    # STEP 4: CONSTRAINTS
-    # ==========================================================
-    elif step == 4:
+# ==========================================================
+# STEP 4: CONSTRAINTS
+# ==========================================================
+@st.fragment
+def _render_step4():
+    """Step 4: institutional and governance constraints."""
+    with _step_run("oe.step4"):
         _render_step_tile_html(
             "Document constraints that shape or limit feasible actions or justification.",
         )
 
-        st.multiselect(
+        draft = _draft()
+
+        draft.constraints = tuple(st.multiselect(
             "Constraints (select any that apply)",
             options=GOV_CONSTRAINTS,
-            key="oe_constraints",
-        )
+            key=_seed("oe_constraints", [c for c in draft.constraints if c in GOV_CONSTRAINTS]),
+        ))
 
-        st.text_area(
+        draft.constraints_other = st.text_area(
             "Other constraints (optional)",
-            key="oe_constraints_other",
+            key=_seed("oe_constraints_other", draft.constraints_other),
             height=90,
         )
 
+
+def render_open_ended():
+    # ==========================================================
+    # WALKTHROUGH STATE (single flow, no gate)
+    # ==========================================================
+    _resume_draft()
+
+    if "oe_step" not in st.session_state:
+        st.session_state["oe_step"] = 1
+    step = st.session_state["oe_step"]
+
+    total_steps = OE_TOTAL_STEPS
+
+    _render_open_header(step)
+    st.progress(step / float(total_steps))
+    st.caption(f"Step {step} of {total_steps}")
+
+    draft_id = st.session_state.get("oe_draft_id")
+    if draft_id:
+        st.caption(
+            f"Draft autosaved. To continue later or on another device, "
+            f"[use this resume link](?draft={draft_id})."
+        )
+
+    if step == 1:
+        _render_step1()
+    elif step == 2:
+        _render_step2()
+    elif step == 3:
+        _render_step3()
+    elif step == 4:
+        _render_step4()
+
     # ==========================================================
     # STEP 5: DECISION + OUTPUT 
     # ==========================================================
@@ -717,12 +1055,15 @@ def render_open_ended():
             "Record the decision in operational terms, then generate a structured rationale for demonstration purposes.",
         )
 
-        st.text_area(
+        draft = _draft()
+
+        draft.decision = st.text_area(
             "Decision (operational)",
-            key="oe_decision",
+            key=_seed("oe_decision", draft.decision),
             height=120,
             placeholder="Example: Disconnect additional systems while confirming scope; preserve critical service workflows via manual workarounds.",
         )
+        _autosave()
 
         st.markdown("---")
 
@@ -731,139 +1072,39 @@ def render_open_ended():
 
             ts = datetime.now().isoformat(timespec="minutes")
             st.success("Decision rationale generated below.")
-            st.markdown("#### Decision Rationale (Open-Ended Mode)")
-            st.write(f"**Timestamp:** {ts}")
-
-            func_labels = {fid: meta["label"] for fid, meta in CSF_FUNCTION_OPTIONS.items()}
-            cat_labels = {cid: lbl for _, cats in CATS_BY_FUNC.items() for cid, lbl in cats}
-            sub_labels = {sid: lbl for _, subs in SUBS_BY_CAT.items() for sid, lbl in subs}
-
-            trigger_example = st.session_state.get("oe_gate_trigger_example", "")
-            trigger_type = st.session_state.get("oe_gate_trigger_type", "")
-            triggering_condition = st.session_state.get("oe_gate_triggering_condition", "")
-
-            decision_type = st.session_state.get("oe_decision_type", "")
-            decision_context = st.session_state.get("oe_decision_context", "")
-
-            selected_func_id = st.session_state.get("oe_csf_function", "")
-            selected_cat_id = st.session_state.get("oe_csf_category", "")
-            selected_sub_ids = st.session_state.get("oe_csf_subcategories", [])
-            csf_rationale = st.session_state.get("oe_csf_rationale", "")
-
-            ethical_tags = st.session_state.get("oe_ethical_condition_tags", [])
-            pfce_analysis = st.session_state.get("oe_pfce_analysis", "")
-            ethical_tension = st.session_state.get("oe_ethical_tension", "")
-
-            selected_pfce = st.session_state.get("oe_pfce_principles", [])
-            pfce_rationale = st.session_state.get("oe_pfce_rationale", "")
-
-            selected_constraints = st.session_state.get("oe_constraints", [])
-            other_constraints = st.session_state.get("oe_constraints_other", "")
-
-            decision = st.session_state.get("oe_decision", "")
-
-            st.markdown("**Triggering condition and key events**")
-            if trigger_example:
-                st.write(f"Example: {trigger_example}")
-            st.write(f"Trigger type: {trigger_type or '—'}")
-            st.write(triggering_condition or "—")
-
-            st.markdown("**Decision context**")
-            if decision_type:
-                st.write(f"Decision context type: {decision_type}")
-            st.write(decision_context or "—")
-
-            st.markdown("**NIST CSF mapping**")
-            st.write(f"- Function: {func_labels.get(selected_func_id, selected_func_id or '—')}")
-            st.write(f"- Category: {cat_labels.get(selected_cat_id, selected_cat_id or '—')}")
-            if selected_sub_ids:
-                st.write("- Subcategories / outcomes:")
-                for sid in selected_sub_ids:
-                    st.write(f"  - {sid} — {sub_labels.get(sid, '') or '—'}")
-            else:
-                st.write("- Subcategories / outcomes: —")
-            if csf_rationale:
-                st.write(f"- Rationale: {csf_rationale}")
-
-            st.markdown("**PFCE analysis and ethical tension**")
-            if ethical_tags:
-                st.write("Tags: " + ", ".join(ethical_tags))
-            st.write(pfce_analysis or "—")
-            st.write(f"**Ethical tension:** {ethical_tension or '—'}")
-
-            st.markdown("**PFCE principles (if selected)**")
-            if selected_pfce:
-                st.write(", ".join(selected_pfce))
-                st.write("**Overall ethical focus:** " + summarize_pfce(selected_pfce))
-            else:
-                st.write("—")
-            if pfce_rationale:
-                st.markdown("**PFCE rationale**")
-                st.write(pfce_rationale)
-
-            st.markdown("**Institutional and governance constraints**")
-            if selected_constraints:
-                for c in selected_constraints:
-                    st.write(f"- {c}")
-            else:
-                st.write("—")
-            if other_constraints:
-                st.write(f"Other: {other_constraints}")
-
-            st.markdown("**Decision**")
-            st.write(decision or "—")
-
-            lines = [
-                f"Timestamp: {ts}",
-                "",
-                "Triggering condition and key events",
-                f"Example: {trigger_example or '—'}",
-                f"Trigger type: {trigger_type or '—'}",
-                triggering_condition or "—",
-                "",
-                "Decision context",
-                f"Decision context type: {decision_type or '—'}",
-                decision_context or "—",
-                "",
-                "NIST CSF mapping",
-                f"Function: {func_labels.get(selected_func_id, selected_func_id or '—')}",
-                f"Category: {cat_labels.get(selected_cat_id, selected_cat_id or '—')}",
-                "Subcategories / outcomes:",
-                *(
-                    ["  - " + sid + " — " + (sub_labels.get(sid, "") or "—") for sid in selected_sub_ids]
-                    if selected_sub_ids
-                    else ["  - —"]
-                ),
-                ("Rationale: " + csf_rationale) if csf_rationale else "",
-                "",
-                "PFCE analysis and ethical tension",
-                ("Tags: " + ", ".join(ethical_tags)) if ethical_tags else "Tags: —",
-                pfce_analysis or "—",
-                "Ethical tension: " + (ethical_tension or "—"),
-                "",
-                "PFCE principles",
-                (", ".join(selected_pfce) if selected_pfce else "—"),
-                ("Overall ethical focus: " + summarize_pfce(selected_pfce)) if selected_pfce else "",
-                ("PFCE rationale: " + pfce_rationale) if pfce_rationale else "",
-                "",
-                "Institutional and governance constraints",
-                *(selected_constraints if selected_constraints else ["—"]),
-                ("Other: " + other_constraints) if other_constraints else "",
-                "",
-                "Decision",
-                decision or "—",
-            ]
-
-            pdf = _build_pdf(
-                "Decision Rationale (Open-Ended Mode)",
-                [ln for ln in lines if ln is not None and ln != ""],
+
+            doc = build_open_ended_rationale(
+                draft,
+                ts,
+                func_labels={fid: meta["label"] for fid, meta in CSF_FUNCTION_OPTIONS.items()},
+                cat_labels={cid: lbl for _, cats in CATS_BY_FUNC.items() for cid, lbl in cats},
+                sub_labels={sid: lbl for _, subs in SUBS_BY_CAT.items() for sid, lbl in subs},
+                pfce_focus=summarize_pfce(draft.pfce_mask) if draft.pfce_mask else "",
             )
+            log = default_log()
+            if log is not None:
+                log.record(
+                    "oe.rationale",
+                    draft_id=st.session_state.get("oe_draft_id"),
+                    pfce_mask=draft.pfce_mask,
+                    rationale=doc.record,
+                )
 
-            st.download_button(
-                "Download decision rationale (PDF)",
-                data=pdf,
-                file_name="decision_rationale_open_ended.pdf",
-                mime="application/pdf",
+            _render_rationale(doc)
+            _render_rationale_downloads(doc)
+
+            record = doc.record
+            _render_similar_cases(
+                draft.csf_function,
+                draft.csf_category,
+                draft.pfce_mask,
+                " ".join([
+                    record["decision_context"]["text"],
+                    record["trigger"]["condition"],
+                    record["ethics"]["pfce_analysis"],
+                    record["ethics"]["tension"],
+                    record["decision"],
+                ]),
             )
 
     # NAV CONTROLS
@@ -874,21 +1115,24 @@ def render_open_ended():
 
         with col_l:
             if step > 1:
-                if st.button("◀ Previous", key=f"oenav_prev_{step}", use_container_width=False):
-                    st.session_state["oe_step"] = step - 1
-                    _safe_rerun()
+                st.button(
+                    "◀ Previous", key=f"oenav_prev_{step}", use_container_width=False,
+                    on_click=nav.fire, args=(st.session_state, "prev", "oe"),
+                )
             else:
                 st.empty()
 
         with col_r:
             if step < total_steps:
-                if st.button("Next ▶", key=f"oenav_next_{step}", use_container_width=False):
-                    st.session_state["oe_step"] = step + 1
-                    _safe_rerun()
+                st.button(
+                    "Next ▶", key=f"oenav_next_{step}", use_container_width=False,
+                    on_click=nav.fire, args=(st.session_state, "next", "oe"),
+                )
             else:
-                if st.button("Generate PDF", key="oe_generate_pdf", use_container_width=False):
-                    st.session_state["oe_generate"] = True
-                    _safe_rerun()
+                st.button(
+                    "Generate PDF", key="oe_generate_pdf", use_container_width=False,
+                    on_click=nav.fire, args=(st.session_state, "generate"),
+                )
 
 
 
@@ -0,0 +1,183 @@
+# logic/assets.py
+
+"""
+Static stylesheet pipeline.
+
+The app's CSS lives in app/styles/*.css. tools/build_static_assets.py
+minifies it and writes a content-fingerprinted file to app/static/css/
+(served by Streamlit at /app/static/ when server.enableStaticServing is on)
+plus a manifest recording the source hash. Each rerun then sends a one-line
+<link> tag instead of the whole stylesheet, and the browser caches the file:
+a new fingerprint is a new URL, so the cache never goes stale.
+
+When the built stylesheet is missing or older than the sources (or
+MCEDS_INLINE_CSS=1 is set), stylesheet_html() falls back to inlining the
+source CSS, so editing styles never requires a build step.
+
+Self-hosted fonts in app/static/fonts/ (tools/build_fonts.py) get their
+@font-face rules prepended to the sources while the files are present.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+STYLES_DIR = ROOT_DIR / "app" / "styles"
+STATIC_DIR = ROOT_DIR / "app" / "static"
+CSS_BUILD_DIR = STATIC_DIR / "css"
+CSS_MANIFEST_PATH = CSS_BUILD_DIR / "manifest.json"
+FONTS_DIR = STATIC_DIR / "fonts"
+
+# URL prefix Streamlit serves app/static/ under
+STATIC_URL = "app/static"
+
+STYLESHEET_NAME = "app"
+
+# Self-hosted fonts: (family, file in FONTS_DIR, weight range). A face is
+# declared only while its file is present, so a missing font never 404s and
+# the stack in main.css falls through to system fonts.
+FONT_FACES = (
+    ("Inter", "InterVariable.woff2", "100 900"),
+)
+
+# Font URLs are relative to the built file (app/static/css/);
+# inlined CSS resolves URLs against the page instead.
+_FONT_URL_PREFIX = "url('../fonts/"
+_INLINE_FONT_URL_PREFIX = f"url('{STATIC_URL}/fonts/"
+
+
+# ---------- sources ----------
+
+def style_sources() -> List[Path]:
+    """Stylesheet sources in cascade order (file name order)."""
+    return sorted(STYLES_DIR.glob("*.css"))
+
+
+def font_faces_css() -> str:
+    """@font-face rules for the FONT_FACES whose files are installed."""
+    return "\n".join(
+        f"@font-face{{font-family:'{family}';font-style:normal;font-weight:{weight};"
+        f"font-display:swap;src:{_FONT_URL_PREFIX}{file_name}') format('woff2')}}"
+        for family, file_name, weight in FONT_FACES
+        if (FONTS_DIR / file_name).is_file()
+    )
+
+
+def read_sources() -> Tuple[str, str]:
+    """Font faces plus the concatenated source CSS, and its sha256."""
+    parts = [font_faces_css(), *(p.read_text(encoding="utf-8") for p in style_sources())]
+    css = "\n".join(part for part in parts if part)
+    return css, hashlib.sha256(css.encode("utf-8")).hexdigest()
+
+
+# ---------- minification ----------
+
+# Strings are matched first so a "/*" inside one is not taken for a comment
+_CSS_STRING = r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')"""
+_CSS_COMMENT = re.compile(_CSS_STRING + r"|/\*.*?\*/", re.S)
+_CSS_STRING_SPLIT = re.compile(_CSS_STRING)
+_CSS_SPACE = re.compile(r"\s+")
+_CSS_PUNCT = re.compile(r"\s*([{};,>])\s*")
+
+
+def _minify_chunk(chunk: str) -> str:
+    chunk = _CSS_SPACE.sub(" ", chunk)
+    chunk = _CSS_PUNCT.sub(r"\1", chunk)
+    return chunk.replace(";}", "}")
+
+
+def minify_css(css: str) -> str:
+    """
+    Conservative CSS minifier: drops comments and collapses whitespace around
+    braces, semicolons, commas and child combinators. Spaces that can be
+    significant (descendant combinators, before ':' in selectors, inside
+    calc()) are kept, and quoted strings are left untouched.
+    """
+    css = _CSS_COMMENT.sub(lambda m: m.group(1) or "", css)
+    parts = _CSS_STRING_SPLIT.split(css)
+    # re.split with one group: even indices are code, odd indices are strings
+    return "".join(p if i % 2 else _minify_chunk(p) for i, p in enumerate(parts)).strip()
+
+
+# ---------- build ----------
+
+def build_stylesheet() -> Dict[str, Any]:
+    """
+    Minify and fingerprint the sources into CSS_BUILD_DIR, remove stale
+    builds, and write the manifest. Returns the manifest.
+    """
+    css, source_hash = read_sources()
+    minified = minify_css(css)
+    digest = hashlib.sha256(minified.encode("utf-8")).hexdigest()[:12]
+    file_name = f"{STYLESHEET_NAME}.{digest}.css"
+
+    CSS_BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    (CSS_BUILD_DIR / file_name).write_text(minified, encoding="utf-8")
+    for old in CSS_BUILD_DIR.glob(f"{STYLESHEET_NAME}.*.css"):
+        if old.name != file_name:
+            old.unlink()
+
+    manifest = {
+        "file": file_name,
+        "source_sha256": source_hash,
+        "source_bytes": len(css.encode("utf-8")),
+        "bytes": len(minified.encode("utf-8")),
+    }
+    CSS_MANIFEST_PATH.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+# ---------- runtime ----------
+
+_cache: Dict[str, Tuple[Tuple, str]] = {}
+
+
+def _signature() -> Tuple:
+    # (mtime_ns, size) of every source, font and the manifest: cheap per rerun
+    sig = []
+    fonts = [FONTS_DIR / file_name for _, file_name, _ in FONT_FACES]
+    for p in [*style_sources(), *fonts, CSS_MANIFEST_PATH]:
+        try:
+            s = p.stat()
+            sig.append((p.name, s.st_mtime_ns, s.st_size))
+        except OSError:
+            sig.append((p.name, None, None))
+    return tuple(sig)
+
+
+def _built_stylesheet(source_hash: str) -> Optional[str]:
+    try:
+        manifest = json.loads(CSS_MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    file_name = manifest.get("file")
+    if manifest.get("source_sha256") != source_hash or not file_name:
+        return None
+    if not (CSS_BUILD_DIR / file_name).is_file():
+        return None
+    return f"{STATIC_URL}/css/{file_name}"
+
+
+def stylesheet_html() -> str:
+    """
+    Markup that applies the app stylesheet: a <link> to the fingerprinted
+    build when it is current, otherwise the source CSS inline.
+    """
+    inline_only = os.environ.get("MCEDS_INLINE_CSS") == "1"
+    sig = (_signature(), inline_only)
+    cached = _cache.get("html")
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+
+    css, source_hash = read_sources()
+    url = None if inline_only else _built_stylesheet(source_hash)
+    if url:
+        markup = f'<link rel="stylesheet" href="{url}">'
+    else:
+        markup = f"<style>\n{css.replace(_FONT_URL_PREFIX, _INLINE_FONT_URL_PREFIX)}\n</style>"
+    _cache["html"] = (sig, markup)
+    return markup
@@ -0,0 +1,243 @@
+# logic/audit_log.py
+
+"""
+Append-only audit log of decisions: generated open-ended rationales and
+completed case walkthroughs, one JSON object per line.
+
+record() only enqueues the event. It never touches the disk, so the script
+thread does not block. One writer thread drains the queue, waiting
+BATCH_WINDOW_S after the first event so a burst lands as one write. Each
+batch is appended to the current segment as its own gzip member. The
+segments are plain concatenated gzip streams that `zcat` and gzip.open()
+read whole, and a crash can only truncate the last member of the active
+segment (read_events() skips such a tail).
+
+    data/logs/decisions-<UTC start>-<pid>-<rand>.jsonl.gz
+
+Every process writes its own segments, so replicas can share the
+directory without locking. A segment is closed once it reaches
+SEGMENT_BYTES. While the directory holds more than RETENTION_BYTES, the
+oldest segments are deleted, but only ones no live writer can still be
+appending to: this process's own closed segments, and other processes'
+segments untouched for RETENTION_IDLE_S (their writers rotated or exited).
+The directory can be moved with MCEDS_AUDIT_DIR.
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_LOG_DIR = ROOT_DIR / "data" / "logs"
+
+SEGMENT_GLOB = "decisions-*.jsonl.gz"
+SEGMENT_BYTES = 8 * 1024 * 1024        # compressed size at which a segment is closed
+RETENTION_BYTES = 512 * 1024 * 1024    # total compressed size kept on disk
+RETENTION_IDLE_S = 24 * 3600           # another process's segment is only deleted after this long unwritten
+BATCH_WINDOW_S = 0.25                  # how long the writer lets a burst pile up
+MEMBER_EVENTS = 2048                   # events per gzip member, so a burst cannot overshoot a segment by much
+
+_STOP = object()
+
+
+def log_dir() -> Path:
+    return Path(os.environ.get("MCEDS_AUDIT_DIR") or DEFAULT_LOG_DIR)
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class AuditLog:
+    """
+    Queue-fed, batched writer of rotating gzip JSONL segments.
+
+    record() is safe from any thread. flush() waits until everything queued
+    before it is on disk; close() (run at interpreter exit) drains the queue.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        segment_bytes: int = SEGMENT_BYTES,
+        retention_bytes: int = RETENTION_BYTES,
+        batch_window_s: float = BATCH_WINDOW_S,
+    ):
+        self.directory = Path(directory or log_dir())
+        self._segment_bytes = segment_bytes
+        self._retention_bytes = retention_bytes
+        self._batch_window_s = batch_window_s
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._segment: Optional[Path] = None
+        self._segment_size = 0
+        self._closed_segments: Set[Path] = set()    # this writer's rotated-out segments
+        self._unwritten: List[Dict[str, Any]] = []   # events from a failed write, retried first
+        self._closed = False
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._writer = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    # ---------- public API ----------
+
+    def record(self, event: str, **fields: Any) -> None:
+        """Queue one event; fields must be JSON-ready and not mutated afterwards."""
+        self._queue.put({
+            "ts": _utc_now().isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+            "event": event,
+            **fields,
+        })
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until events queued so far are written; False on timeout or after close()."""
+        if self._closed:
+            return False
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join(timeout=10.0)
+
+    # ---------- writer thread ----------
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            if batch[0] is not _STOP:
+                time.sleep(self._batch_window_s)
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            events = [e for e in batch if isinstance(e, dict)]
+            if self._unwritten and not events:
+                self._write([])
+            for i in range(0, len(events), MEMBER_EVENTS):
+                self._write(events[i:i + MEMBER_EVENTS])
+            for marker in batch:
+                if isinstance(marker, threading.Event):
+                    marker.set()
+            if any(e is _STOP for e in batch):
+                return
+
+    def _write(self, events: List[Dict[str, Any]]) -> None:
+        events = self._unwritten + events
+        lines = "".join(
+            json.dumps(e, ensure_ascii=False, separators=(",", ":"), default=str) + "\n"
+            for e in events
+        )
+        member = gzip.compress(lines.encode("utf-8"), mtime=0)
+        try:
+            if self._segment is None or self._segment_size >= self._segment_bytes:
+                self._rotate()
+            with open(self._segment, "ab") as f:
+                f.write(member)
+        except OSError:
+            logger.exception("audit log: write of %d event(s) failed; retrying", len(events))
+            self._unwritten = events
+            return
+        self._unwritten = []
+        self._segment_size += len(member)
+
+    def _rotate(self) -> None:
+        if self._segment is not None:
+            self._closed_segments.add(self._segment)
+        stamp = _utc_now().strftime("%Y%m%dT%H%M%S%f")
+        self._segment = self.directory / f"decisions-{stamp}-{os.getpid()}-{secrets.token_hex(2)}.jsonl.gz"
+        self._segment_size = 0
+        self._enforce_retention()
+
+    def _deletable(self, path: Path, mtime: float) -> bool:
+        # Pids are no proof of ownership (every container replica may be pid 1)
+        if path in self._closed_segments:
+            return True
+        return path != self._segment and time.time() - mtime > RETENTION_IDLE_S
+
+    def _enforce_retention(self) -> None:
+        segments = []
+        for path in segments_in(self.directory):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue                      # removed by another process
+            segments.append((path, st.st_size, st.st_mtime))
+        total = sum(size for _, size, _ in segments)
+        for path, size, mtime in segments:    # oldest first
+            if total <= self._retention_bytes:
+                break
+            if not self._deletable(path, mtime):
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            self._closed_segments.discard(path)
+            total -= size
+
+
+# ---------- reading ----------
+
+def segments_in(directory: Optional[Path] = None) -> List[Path]:
+    """Segments in write order (their names start with the UTC start time)."""
+    directory = Path(directory or log_dir())
+    return sorted(directory.glob(SEGMENT_GLOB), key=lambda p: p.name)
+
+
+def read_segment(path: Path) -> Iterator[Dict[str, Any]]:
+    """Events of one segment; a truncated tail (crashed writer) ends it early."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    except (EOFError, gzip.BadGzipFile, zlib.error, json.JSONDecodeError):
+        logger.warning("audit log: %s ends in an incomplete record", path.name)
+
+
+def read_events(directory: Optional[Path] = None) -> Iterator[Dict[str, Any]]:
+    for path in segments_in(directory):
+        yield from read_segment(path)
+
+
+# ---------- process-wide log ----------
+
+_default: Optional[AuditLog] = None
+_default_failed = False
+_default_lock = threading.Lock()
+
+
+def default_log() -> Optional[AuditLog]:
+    """
+    The process's shared AuditLog (one writer thread per server process), or
+    None when the log directory cannot be created, e.g. on a read-only filesystem.
+    """
+    global _default, _default_failed
+    if _default is None and not _default_failed:
+        with _default_lock:
+            if _default is None and not _default_failed:
+                try:
+                    _default = AuditLog()
+                except OSError:
+                    logger.exception("audit log: disabled, %s is not writable", log_dir())
+                    _default_failed = True
+    return _default
@@ -0,0 +1,79 @@
+# logic/bundle.py
+
+"""
+Compiled binary bundle of the parsed data sources.
+
+Layout (one file, written by tools/build_data_bundle.py):
+
+    MAGIC
+    pickle(header)   {"format": int, "sources": {relpath: sha256}}
+    pickle(payload)  output of logic.loaders.parse_sources()
+
+The header is read first; the payload is only unpickled when the recorded
+source hashes match the files on disk. Any mismatch (edited, added or
+removed source) makes read_bundle() return None so the caller falls back to
+parsing the YAML/JSON sources.
+
+The bundle is a local build artifact (data/build/ is git-ignored) and is
+loaded with pickle, so it must only ever be read from the app's own data
+directory.
+"""
+
+import hashlib
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+BUNDLE_MAGIC = b"MCEDS-BUNDLE\n"
+BUNDLE_FORMAT = 1
+
+
+def hash_sources(paths: Iterable[Path], root: Path) -> Dict[str, str]:
+    """Map each source path (relative to root, posix style) to its sha256."""
+    hashes: Dict[str, str] = {}
+    for path in paths:
+        with path.open("rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        hashes[path.relative_to(root).as_posix()] = digest
+    return hashes
+
+
+def write_bundle(path: Path, payload: Dict[str, Any], sources: Dict[str, str]) -> int:
+    """
+    Write payload plus its source hashes to path (atomically via a temp file).
+
+    Returns the bundle size in bytes.
+    """
+    header = {"format": BUNDLE_FORMAT, "sources": dict(sources)}
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(BUNDLE_MAGIC)
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(path)
+    return path.stat().st_size
+
+
+def read_bundle(path: Path, sources: Iterable[Path], root: Path) -> Optional[Dict[str, Any]]:
+    """
+    Return the bundled payload if path is a valid bundle built from exactly
+    the given source files (same set, same content hashes); otherwise None.
+    """
+    try:
+        with path.open("rb") as f:
+            if f.read(len(BUNDLE_MAGIC)) != BUNDLE_MAGIC:
+                return None
+
+            header = pickle.load(f)
+            if not isinstance(header, dict) or header.get("format") != BUNDLE_FORMAT:
+                return None
+            if header.get("sources") != hash_sources(sources, root):
+                return None
+
+            payload = pickle.load(f)
+    except Exception:
+        return None
+
+    return payload if isinstance(payload, dict) else None
@@ -0,0 +1,218 @@
+# logic/case_export.py
+
+"""
+Bulk export of case walkthroughs to PDF briefs.
+
+Every data/cases/*.yaml is rendered as a printable brief containing the same
+nine steps as the Case-Based walkthrough. Cases are rendered in parallel on a
+process pool (ReportLab is CPU-bound pure Python, so threads would serialize
+on the GIL). A manifest in the output directory records the content hash each
+PDF was rendered from. A re-run skips every case whose file (and the
+renderer) is unchanged, and the manifest is rewritten after each finished case
+so an interrupted run keeps its progress.
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import yaml
+
+from logic.navigation import CASE_STEP_TITLES
+from logic.pdf_layout import Block, Bullet, Heading, Paragraph, build_pdf
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+MANIFEST_NAME = "manifest.json"
+
+# Bump when the brief layout changes so existing PDFs are re-rendered
+RENDERER_VERSION = 2
+
+
+class ExportResult(NamedTuple):
+    source: str            # case file name, e.g. "baltimore.yaml"
+    pdf: Optional[str]     # output file name, None on failure
+    status: str            # "rendered", "skipped" or "failed"
+    error: str = ""
+
+
+# ---------- brief content ----------
+
+def _bullets(value: Any) -> List[Block]:
+    if value is None or value == "" or value == [] or value == ():
+        return ["TBD"]
+    if isinstance(value, (list, tuple)):
+        return [Bullet(str(item)) for item in value]
+    return [str(value)]
+
+
+def case_brief_lines(doc: Mapping[str, Any]) -> Tuple[str, List[Block]]:
+    """Title and layout blocks of a case brief, one section per walkthrough step."""
+    background = doc.get("background") or {}
+    technical = doc.get("technical") or {}
+    ethical = doc.get("ethical") or {}
+    decision_outcome = doc.get("decision_outcome") or {}
+
+    mapping_lines: List[Block] = []
+    for m in technical.get("nist_csf_mapping") or []:
+        if not isinstance(m, Mapping):
+            continue
+        cats = m.get("categories") or []
+        if isinstance(cats, str):
+            cats = [cats]
+        mapping_lines.append(Bullet(f"{m.get('function', 'TBD')} — {', '.join(cats) if cats else 'TBD'}"))
+        if m.get("rationale"):
+            mapping_lines.append(Paragraph(f"Rationale: {m['rationale']}", level=1))
+
+    tension_lines: List[Block] = [
+        Bullet(str(t.get("description", "TBD"))) for t in ethical.get("tension") or [] if isinstance(t, Mapping)
+    ]
+
+    pfce_items = ethical.get("pfce_analysis")
+    if isinstance(pfce_items, (list, tuple)) and pfce_items and isinstance(pfce_items[0], Mapping):
+        pfce_lines: List[Block] = [
+            Bullet(f"{p.get('principle', 'TBD')}: {p.get('description', 'TBD')}") for p in pfce_items
+        ]
+    else:
+        pfce_lines = _bullets(pfce_items)
+
+    constraint_lines: List[Block] = []
+    for c in doc.get("constraints") or []:
+        if isinstance(c, Mapping):
+            constraint_lines.append(Bullet(f"{c.get('type', 'TBD')} – {c.get('description', 'TBD')}"))
+            if c.get("effect_on_decision"):
+                constraint_lines.append(Paragraph(f"Effect on decision: {c['effect_on_decision']}", level=1))
+        else:
+            constraint_lines.append(Bullet(str(c)))
+
+    sections = (
+        _bullets(background.get("technical_operational_background")),
+        _bullets(background.get("triggering_condition_key_events")),
+        _bullets(technical.get("decision_context")),
+        mapping_lines or ["TBD"],
+        tension_lines or ["TBD"],
+        pfce_lines,
+        constraint_lines or ["TBD"],
+        _bullets(decision_outcome.get("decision")),
+        _bullets(decision_outcome.get("outcomes_implications")),
+    )
+
+    lines: List[Block] = []
+    if doc.get("short_summary"):
+        lines.append(str(doc["short_summary"]))
+    for n, (heading, body) in enumerate(zip(CASE_STEP_TITLES, sections), start=1):
+        lines += [Heading(f"Step {n}: {heading}"), *body]
+
+    title = str(doc.get("ui_title") or doc.get("title") or doc.get("id") or "Case")
+    return title, lines
+
+
+# ---------- rendering (runs in worker processes) ----------
+
+def content_hash(data: bytes) -> str:
+    """Hash of a case file's bytes plus RENDERER_VERSION."""
+    h = hashlib.sha256(data)
+    h.update(f"\nrenderer:{RENDERER_VERSION}".encode("ascii"))
+    return h.hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def render_case_file(src: str, out: str) -> str:
+    """Render one case file to a PDF at out; returns the content hash it was rendered from."""
+    data = Path(src).read_bytes()
+    doc = yaml.load(data, Loader=_YAML_LOADER) or {}
+    if not isinstance(doc, Mapping):
+        raise ValueError("case file is not a mapping")
+    title, lines = case_brief_lines(doc)
+    _write_atomic(Path(out), build_pdf(title, lines))
+    return content_hash(data)
+
+
+# ---------- manifest ----------
+
+def _read_manifest(path: Path) -> Dict[str, Dict[str, str]]:
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_manifest(path: Path, manifest: Dict[str, Dict[str, str]]) -> None:
+    _write_atomic(path, json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+
+
+# ---------- public API ----------
+
+def export_cases(
+    cases_dir: Path,
+    out_dir: Path,
+    workers: Optional[int] = None,
+    force: bool = False,
+    on_result: Optional[Callable[[ExportResult], None]] = None,
+) -> List[ExportResult]:
+    """
+    Render every *.yaml in cases_dir to out_dir/<stem>.pdf.
+
+    Unchanged cases (same content hash in the manifest, PDF still present)
+    are skipped unless force is set. on_result is called in the parent
+    process as each case finishes, in completion order.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST_NAME
+    manifest = _read_manifest(manifest_path)
+
+    results: List[ExportResult] = []
+
+    def _report(result: ExportResult) -> None:
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    todo: List[Tuple[Path, Path]] = []
+    sources = sorted(cases_dir.glob("*.yaml"))
+    for src in sources:
+        out = out_dir / f"{src.stem}.pdf"
+        entry = manifest.get(src.name) or {}
+        if (
+            not force
+            and out.exists()
+            and entry.get("pdf") == out.name
+            and entry.get("sha256") == content_hash(src.read_bytes())
+        ):
+            _report(ExportResult(src.name, out.name, "skipped"))
+        else:
+            todo.append((src, out))
+
+    # Drop entries for cases that no longer exist
+    live = {src.name for src in sources}
+    manifest = {name: entry for name, entry in manifest.items() if name in live}
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(render_case_file, str(src), str(out)): (src, out) for src, out in todo}
+            for fut in as_completed(futures):
+                src, out = futures[fut]
+                try:
+                    digest = fut.result()
+                except Exception as e:
+                    manifest.pop(src.name, None)
+                    _report(ExportResult(src.name, None, "failed", str(e)))
+                else:
+                    manifest[src.name] = {"sha256": digest, "pdf": out.name}
+                    _report(ExportResult(src.name, out.name, "rendered"))
+                _write_manifest(manifest_path, manifest)
+    else:
+        _write_manifest(manifest_path, manifest)
+
+    return results
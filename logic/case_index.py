@@ -0,0 +1,196 @@
+# logic/case_index.py
+
+"""
+Manifest of the case library keyed by case id.
+
+Built once by reading only the leading header (id, titles, short summary)
+of each data/cases/*.yaml file and kept current by stat() checks: a lookup
+costs one directory stat plus a dict hit, and only files whose (mtime, size)
+signature changed are re-read. Unknown ids therefore never trigger a parse
+of the library, and full case documents are never held by the index.
+"""
+
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+import yaml
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# A top-level mapping key at column 0, e.g. `ui_title: "..."`
+_TOP_LEVEL_KEY = re.compile(r"^([A-Za-z_][\w-]*)\s*:")
+
+# Leading keys every case file starts with; enough for the case selector
+HEADER_FIELDS = ("id", "title", "ui_title", "short_summary")
+
+
+class CaseEntry(NamedTuple):
+    """Header-only summary of one case file (no full document)."""
+    id: str
+    title: str          # canonical / thesis title
+    ui_title: str       # display-only title
+    short_summary: str
+    path: str           # relative to the repository root, posix style
+    mtime_ns: int
+    size: int
+
+
+def read_case_header(path: Path, fields: Iterable[str] = HEADER_FIELDS) -> Dict[str, Any]:
+    """
+    Parse only the leading top-level keys of a case file that belong to
+    fields, stopping at the first top-level key outside that set.
+
+    Returns an empty dict if the file can't be read or parsed.
+    """
+    wanted = set(fields)
+    lines = []
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                m = _TOP_LEVEL_KEY.match(line)
+                if m and m.group(1) not in wanted:
+                    break
+                lines.append(line)
+        data = yaml.load("".join(lines), Loader=_YAML_LOADER)
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _read_entry(path: Path, rel: str, sig: Tuple[int, int]) -> CaseEntry:
+    header = read_case_header(path)
+    if not header.get("id"):
+        # Header doesn't lead with `id:`; fall back to a full parse of this one file.
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                data = yaml.load(f, Loader=_YAML_LOADER) or {}
+        except Exception:
+            data = {}
+        if isinstance(data, dict):
+            header = {k: data.get(k) for k in HEADER_FIELDS}
+
+    cid = str(header.get("id") or path.stem)
+    title = str(header.get("title") or path.stem)
+    ui_title = str(header.get("ui_title") or title)
+    short_summary = str(header.get("short_summary") or "")
+    return CaseEntry(cid, title, ui_title, short_summary, rel, sig[0], sig[1])
+
+
+class CaseIndex:
+    """
+    Thread-safe id → CaseEntry index over a cases directory.
+
+    Ids resolve by filename stem first (<id>.yaml), then by declared `id:`,
+    matching the historical load_case() behaviour. The directory listing is rescanned only
+    when the directory's mtime changes (file added, removed or renamed); an
+    entry whose file was edited in place is re-read when it is next resolved.
+    """
+
+    def __init__(self, cases_dir: Path, root: Path):
+        self._cases_dir = cases_dir
+        self._root = root
+        self._lock = threading.Lock()
+        self._dir_mtime_ns: Optional[int] = None
+        self._by_path: Dict[str, CaseEntry] = {}
+        self._by_id: Dict[str, CaseEntry] = {}
+        self._by_title: Tuple[CaseEntry, ...] = ()
+
+    # ---------- internal ----------
+
+    def _signature(self, path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _entry_for(self, path: Path, sig: Tuple[int, int]) -> CaseEntry:
+        rel = path.relative_to(self._root).as_posix()
+        cached = self._by_path.get(rel)
+        if cached is not None and (cached.mtime_ns, cached.size) == sig:
+            return cached
+        return _read_entry(path, rel, sig)
+
+    def _rebuild_ids(self) -> None:
+        by_id: Dict[str, CaseEntry] = {}
+        for entry in self._by_path.values():
+            by_id.setdefault(entry.id, entry)
+        # <id>.yaml wins over another file that declares the same id
+        for entry in self._by_path.values():
+            by_id[Path(entry.path).stem] = entry
+        self._by_id = by_id
+        self._by_title = tuple(sorted(self._by_path.values(), key=lambda e: e.title))
+
+    def _rescan(self) -> None:
+        by_path: Dict[str, CaseEntry] = {}
+        if self._cases_dir.exists():
+            for path in sorted(self._cases_dir.glob("*.yaml")):
+                sig = self._signature(path)
+                if sig is None:
+                    continue
+                entry = self._entry_for(path, sig)
+                by_path[entry.path] = entry
+        self._by_path = by_path
+        self._rebuild_ids()
+
+    def _refresh_locked(self) -> None:
+        try:
+            dir_mtime = os.stat(self._cases_dir).st_mtime_ns
+        except OSError:
+            dir_mtime = -1
+        if dir_mtime != self._dir_mtime_ns:
+            self._rescan()
+            self._dir_mtime_ns = dir_mtime
+
+    # ---------- public ----------
+
+    def refresh(self) -> None:
+        """Pick up added, removed or renamed case files (one stat when unchanged)."""
+        with self._lock:
+            self._refresh_locked()
+
+    def resolve(self, case_id: Optional[str]) -> Optional[CaseEntry]:
+        """Return the entry for case_id, or None if no case file declares it."""
+        if not case_id:
+            return None
+        case_id = str(case_id)
+
+        with self._lock:
+            self._refresh_locked()
+            entry = self._by_id.get(case_id)
+            if entry is None:
+                return None
+
+            # Edited in place since indexed? Re-read just this file's header.
+            path = self._root / entry.path
+            sig = self._signature(path)
+            if sig is None:
+                self._rescan()
+            elif sig != (entry.mtime_ns, entry.size):
+                self._by_path[entry.path] = self._entry_for(path, sig)
+                self._rebuild_ids()
+            else:
+                return entry
+            return self._by_id.get(case_id)
+
+    def entries(self) -> Tuple[CaseEntry, ...]:
+        """All indexed entries, ordered by path."""
+        with self._lock:
+            self._refresh_locked()
+            return tuple(self._by_path.values())
+
+    def summaries(self, offset: int = 0, limit: Optional[int] = None) -> Tuple[CaseEntry, ...]:
+        """A page of entries ordered by title (the case selector's order)."""
+        with self._lock:
+            self._refresh_locked()
+            ordered = self._by_title
+        stop = None if limit is None else offset + limit
+        return ordered[offset:stop]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh_locked()
+            return len(self._by_path)
@@ -0,0 +1,180 @@
+# logic/coverage.py
+
+"""
+CSF-subcategory × PFCE incidence matrix with vectorized rollups.
+
+The matrix is materialized once per CSF catalog (one instance per framework
+version) from the crosswalk bitmasks: row i is a subcategory, column j is
+logic.principles.PRINCIPLES[j], and cell (i, j) is 1 when the crosswalk maps
+that subcategory to that principle. Subcategories are stored in catalog order
+(function, then category), so function- and category-level rollups are a
+single np.add.reduceat over contiguous row blocks.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from logic import principles as pfce
+from logic.crosswalk import CrosswalkIndex
+
+
+def _functions(csf_raw: Any) -> List[Mapping]:
+    if isinstance(csf_raw, Mapping):
+        return list(csf_raw.get("functions", []) or [])
+    if isinstance(csf_raw, (list, tuple)):
+        return list(csf_raw)
+    return []
+
+
+class IncidenceMatrix:
+    """
+    Dense uint8 incidence matrix plus the row groupings needed for rollups.
+
+    Attributes:
+        sub_ids:       subcategory ids, one per row
+        matrix:        (n_subcategories, n_principles) uint8
+        mapped:        (n_subcategories,) bool, True if the crosswalk has a row
+        function_ids / category_ids: group ids in row order
+        function_of_row / category_of_row: group index of each row
+    """
+
+    __slots__ = (
+        "sub_ids", "matrix", "mapped",
+        "function_ids", "function_of_row", "_function_starts",
+        "category_ids", "category_of_row", "_category_starts", "_category_function",
+    )
+
+    def __init__(self, csf_raw: Any, crosswalk: CrosswalkIndex):
+        sub_ids: List[str] = []
+        masks: List[int] = []
+        mapped: List[bool] = []
+        function_ids: List[str] = []
+        function_of_row: List[int] = []
+        category_ids: List[str] = []
+        category_of_row: List[int] = []
+        category_function: List[int] = []
+
+        for fn in _functions(csf_raw):
+            func_id = fn.get("id")
+            if not func_id:
+                continue
+            f_idx = len(function_ids)
+            function_ids.append(func_id)
+
+            for cat in fn.get("categories", []) or []:
+                cat_id = cat.get("id")
+                if not cat_id:
+                    continue
+                c_idx = len(category_ids)
+                category_ids.append(cat_id)
+                category_function.append(f_idx)
+
+                for item in cat.get("outcomes") or cat.get("subcategories") or []:
+                    sub_id = item.get("id")
+                    if not sub_id:
+                        continue
+                    sub_ids.append(sub_id)
+                    masks.append(crosswalk.mask(sub_id))
+                    mapped.append(sub_id in crosswalk)
+                    function_of_row.append(f_idx)
+                    category_of_row.append(c_idx)
+
+        # Unpack bitmasks into columns in one shot: (n, 1) >> (k,) & 1
+        bits = np.arange(len(pfce.PRINCIPLES), dtype=np.uint8)
+        mask_arr = np.asarray(masks, dtype=np.uint8).reshape(-1, 1)
+        self.matrix = ((mask_arr >> bits) & 1).astype(np.uint8)
+        self.matrix.setflags(write=False)
+
+        self.sub_ids: Tuple[str, ...] = tuple(sub_ids)
+        self.mapped = np.asarray(mapped, dtype=bool)
+        self.function_ids: Tuple[str, ...] = tuple(function_ids)
+        self.function_of_row = np.asarray(function_of_row, dtype=np.intp)
+        self.category_ids: Tuple[str, ...] = tuple(category_ids)
+        self.category_of_row = np.asarray(category_of_row, dtype=np.intp)
+        self._category_function = np.asarray(category_function, dtype=np.intp)
+
+        # Start row of each group (empty groups are dropped by _rollup)
+        self._function_starts = np.searchsorted(self.function_of_row, np.arange(len(function_ids)))
+        self._category_starts = np.searchsorted(self.category_of_row, np.arange(len(category_ids)))
+
+    # ---------- internal ----------
+
+    def _rollup(self, starts: np.ndarray, group_of_row: np.ndarray, n_groups: int) -> np.ndarray:
+        out = np.zeros((n_groups, self.matrix.shape[1]), dtype=np.int64)
+        if not len(self.sub_ids):
+            return out
+        present = np.unique(group_of_row)
+        out[present] = np.add.reduceat(self.matrix, starts[present], axis=0, dtype=np.int64)
+        return out
+
+    # ---------- public ----------
+
+    @property
+    def principles(self) -> Tuple[str, ...]:
+        return pfce.PRINCIPLES
+
+    def function_counts(self) -> np.ndarray:
+        """(n_functions, n_principles): subcategories implicating each principle."""
+        return self._rollup(self._function_starts, self.function_of_row, len(self.function_ids))
+
+    def category_counts(self) -> np.ndarray:
+        """(n_categories, n_principles): subcategories implicating each principle."""
+        return self._rollup(self._category_starts, self.category_of_row, len(self.category_ids))
+
+    def function_sizes(self) -> np.ndarray:
+        return np.bincount(self.function_of_row, minlength=len(self.function_ids))
+
+    def category_sizes(self) -> np.ndarray:
+        return np.bincount(self.category_of_row, minlength=len(self.category_ids))
+
+    def function_shares(self) -> np.ndarray:
+        """function_counts() divided by the number of subcategories per function."""
+        return self.function_counts() / np.maximum(self.function_sizes(), 1)[:, None]
+
+    def category_shares(self) -> np.ndarray:
+        """category_counts() divided by the number of subcategories per category."""
+        return self.category_counts() / np.maximum(self.category_sizes(), 1)[:, None]
+
+    def function_rollup(self, function_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Principle coverage for one CSF function and each of its categories:
+
+        {
+          "function_id": "RS", "subcategories": 13, "mapped": 13,
+          "counts": {"Beneficence": 9, ...},            # registry order
+          "dominant": ("Non-maleficence", ...),          # highest count first
+          "categories": [{"category_id": "RS.MA", "subcategories": 5, "counts": {...}}, ...],
+        }
+
+        Returns None if the function isn't in the catalog.
+        """
+        try:
+            f_idx = self.function_ids.index(function_id)
+        except ValueError:
+            return None
+
+        f_counts = self.function_counts()[f_idx]
+        rows = self.function_of_row == f_idx
+        order = np.argsort(-f_counts, kind="stable")
+
+        cat_idx = np.flatnonzero(self._category_function == f_idx)
+        cat_counts = self.category_counts()[cat_idx]
+        cat_sizes = self.category_sizes()[cat_idx]
+
+        return {
+            "function_id": function_id,
+            "subcategories": int(rows.sum()),
+            "mapped": int(self.mapped[rows].sum()),
+            "counts": dict(zip(pfce.PRINCIPLES, f_counts.tolist())),
+            "dominant": tuple(pfce.PRINCIPLES[i] for i in order if f_counts[i] > 0),
+            "categories": [
+                {
+                    "category_id": self.category_ids[ci],
+                    "subcategories": int(size),
+                    "counts": dict(zip(pfce.PRINCIPLES, counts.tolist())),
+                }
+                for ci, size, counts in zip(cat_idx, cat_sizes, cat_counts)
+            ],
+        }
@@ -0,0 +1,144 @@
+# logic/crosswalk.py
+
+"""
+Hash-indexed view of the CSF→PFCE crosswalk.
+
+Rows are indexed once by csf_id, by CSF category and function (derived from
+the id, e.g. RS.MI-01 → RS.MI → RS), and in reverse from each PFCE principle
+to the csf_ids that implicate it. Each row's principle list is encoded as a
+logic.principles bitmask, so single lookups, batch lookups and set-algebra
+queries over principles are dict, frozenset or integer operations.
+"""
+
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple, Union
+
+from logic import principles as pfce
+
+PrincipleQuery = Union[int, Iterable[str]]
+
+
+def _as_mask(query: PrincipleQuery) -> int:
+    return query if isinstance(query, int) else pfce.to_mask(query)
+
+
+def category_of(csf_id: str) -> str:
+    """GV.OC-01 -> GV.OC"""
+    return csf_id.split("-", 1)[0]
+
+
+def function_of(csf_id: str) -> str:
+    """GV.OC-01 -> GV"""
+    return csf_id.split(".", 1)[0]
+
+
+class CrosswalkIndex:
+    """
+    Read-only index over crosswalk rows ({csf_id, csf_outcome, pfce, rationale}).
+
+    Rows are returned as-is (frozen mappings when built from the catalog);
+    callers must not mutate them.
+    """
+
+    __slots__ = ("_rows", "_by_id", "_mask_by_id", "_by_category", "_by_function", "_by_principle")
+
+    def __init__(self, rows: Iterable[Mapping[str, Any]]):
+        by_id: Dict[str, Mapping[str, Any]] = {}
+        for row in rows:
+            csf_id = str(row.get("csf_id") or "").strip()
+            if csf_id and csf_id not in by_id:
+                by_id[csf_id] = row
+
+        mask_by_id: Dict[str, int] = {}
+        by_category: Dict[str, List[Mapping[str, Any]]] = {}
+        by_function: Dict[str, List[Mapping[str, Any]]] = {}
+        by_principle: Dict[int, set] = {bit: set() for bit in pfce.BIT_BY_NAME.values()}
+        for csf_id, row in by_id.items():
+            mask = pfce.to_mask(row.get("pfce") or ())
+            mask_by_id[csf_id] = mask
+            by_category.setdefault(category_of(csf_id), []).append(row)
+            by_function.setdefault(function_of(csf_id), []).append(row)
+            for bit, ids in by_principle.items():
+                if mask & bit:
+                    ids.add(csf_id)
+
+        self._rows: Tuple[Mapping[str, Any], ...] = tuple(by_id.values())
+        self._by_id = by_id
+        self._mask_by_id = mask_by_id
+        self._by_category = {k: tuple(v) for k, v in by_category.items()}
+        self._by_function = {k: tuple(v) for k, v in by_function.items()}
+        self._by_principle: Dict[int, FrozenSet[str]] = {k: frozenset(v) for k, v in by_principle.items()}
+
+    # ---------- forward lookups (CSF → row) ----------
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, csf_id: object) -> bool:
+        return csf_id in self._by_id
+
+    def rows(self) -> Tuple[Mapping[str, Any], ...]:
+        return self._rows
+
+    def get(self, csf_id: str) -> Optional[Mapping[str, Any]]:
+        return self._by_id.get(csf_id)
+
+    def lookup(self, csf_ids: Iterable[str]) -> List[Mapping[str, Any]]:
+        """Rows for csf_ids, in the given order; unknown ids are skipped."""
+        by_id = self._by_id
+        return [by_id[cid] for cid in csf_ids if cid in by_id]
+
+    def rows_for_category(self, category_id: str) -> Tuple[Mapping[str, Any], ...]:
+        """Every row under a CSF category, e.g. "RS.MI"."""
+        return self._by_category.get(category_id, ())
+
+    def rows_for_function(self, function_id: str) -> Tuple[Mapping[str, Any], ...]:
+        """Every row under a CSF function, e.g. "RS"."""
+        return self._by_function.get(function_id, ())
+
+    # ---------- principle bitmasks ----------
+
+    def mask(self, csf_id: str) -> int:
+        """PFCE bitmask of one row (0 if the id is unknown)."""
+        return self._mask_by_id.get(csf_id, 0)
+
+    def mask_for(self, csf_ids: Iterable[str]) -> int:
+        """Union of the PFCE bitmasks of csf_ids."""
+        masks = self._mask_by_id
+        result = 0
+        for cid in csf_ids:
+            result |= masks.get(cid, 0)
+        return result
+
+    # ---------- reverse lookups (PFCE → CSF) ----------
+
+    def principles(self) -> Tuple[str, ...]:
+        """Principles that appear anywhere in the crosswalk, in registry order."""
+        return pfce.names(self.mask_for(self._by_id))
+
+    def csf_ids_for(self, principle: str) -> FrozenSet[str]:
+        """csf_ids whose row implicates principle (any spelling/case)."""
+        return self._by_principle.get(pfce.bit(principle), frozenset())
+
+    def csf_ids_with_all(self, principles: PrincipleQuery) -> FrozenSet[str]:
+        """
+        csf_ids implicating every given principle, e.g. Justice AND Autonomy.
+        Accepts names or a bitmask.
+        """
+        required = _as_mask(principles)
+        if not required:
+            return frozenset()
+        return frozenset(cid for cid, m in self._mask_by_id.items() if m & required == required)
+
+    def csf_ids_with_any(self, principles: PrincipleQuery) -> FrozenSet[str]:
+        """csf_ids implicating at least one given principle (names or a bitmask)."""
+        wanted = _as_mask(principles)
+        return frozenset(cid for cid, m in self._mask_by_id.items() if m & wanted)
+
+    def principle_counts(self, csf_ids: Iterable[str]) -> Dict[str, int]:
+        """How many of csf_ids implicate each principle (display name → count)."""
+        counts: Dict[str, int] = {}
+        masks = self._mask_by_id
+        for cid in csf_ids:
+            for name in pfce.names(masks.get(cid, 0)):
+                counts[name] = counts.get(name, 0) + 1
+        return counts
@@ -0,0 +1,375 @@
+# logic/decision_analytics.py
+
+"""
+Columnar analytics over the decision audit log (logic.audit_log).
+
+The gzip JSONL segments are compacted into one .npz file of fixed-width
+columns per segment, in <log dir>/columns/. Rows are events; string
+fields are stored as small integer codes into a per-file vocabulary:
+
+    ts               datetime64[s], UTC
+    event            uint8 index into EVENTS
+    function         int16 CSF function code (-1: none)
+    category         int16 CSF category code (-1: none)
+    case             int16 case id code (-1: none)
+    pfce_mask        uint8 logic.principles bitmask
+    constraint_mask  uint64, bit i = constraints[i] was selected
+
+Compaction is incremental. Segments are concatenated gzip members, so a
+column file records how many source bytes it covers and a refresh parses
+only the members appended since. load_columns() merges the files
+(remapping codes into one vocabulary) and every aggregate is a handful of
+vectorised NumPy passes (bincount, shifts, one small matrix product), so
+hundreds of thousands of decisions stay interactive.
+"""
+
+import gzip
+import io
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from logic import principles as pfce
+from logic.audit_log import log_dir, segments_in
+
+logger = logging.getLogger(__name__)
+
+EVENTS: Tuple[str, ...] = ("oe.rationale", "cb.completed")
+RATIONALE, CASE_COMPLETED = range(len(EVENTS))
+
+MAX_CONSTRAINTS = 64          # width of constraint_mask; further distinct constraints are not tracked
+STALE_TAIL_S = 60.0           # an unreadable tail older than this is a crashed writer's, not one in progress
+
+_VOCABS = ("functions", "categories", "cases", "constraints")
+
+
+class DecisionColumns(NamedTuple):
+    ts: np.ndarray
+    event: np.ndarray
+    function: np.ndarray
+    category: np.ndarray
+    case: np.ndarray
+    pfce_mask: np.ndarray
+    constraint_mask: np.ndarray
+    functions: Tuple[str, ...]
+    categories: Tuple[str, ...]
+    cases: Tuple[str, ...]
+    constraints: Tuple[str, ...]
+
+    @property
+    def rows(self) -> int:
+        return int(self.ts.shape[0])
+
+    def where(self, rows: np.ndarray) -> "DecisionColumns":
+        """The rows selected by a boolean mask or index array (vocabularies unchanged)."""
+        return self._replace(**{name: getattr(self, name)[rows] for name in _ARRAYS})
+
+
+_ARRAYS = ("ts", "event", "function", "category", "case", "pfce_mask", "constraint_mask")
+_DTYPES = {
+    "ts": "datetime64[s]", "event": np.uint8, "function": np.int16, "category": np.int16,
+    "case": np.int16, "pfce_mask": np.uint8, "constraint_mask": np.uint64,
+}
+
+
+def empty_columns() -> DecisionColumns:
+    return DecisionColumns(
+        **{name: np.empty(0, dtype=_DTYPES[name]) for name in _ARRAYS},
+        **{vocab: () for vocab in _VOCABS},
+    )
+
+
+# ---------- events -> columns ----------
+
+def _code(vocab: Dict[str, int], value: Any) -> int:
+    if not value:
+        return -1
+    return vocab.setdefault(str(value), len(vocab))
+
+
+def _item_id(item: Any) -> Optional[str]:
+    # Rationale records store CSF items as {"id", "label"}
+    return item.get("id") if isinstance(item, dict) else item
+
+
+def _timestamp(value: Any) -> Optional[np.datetime64]:
+    """The event's ts as datetime64[s], or None when it is missing or malformed."""
+    try:
+        ts = np.datetime64(str(value).rstrip("Z"), "s") if value else None
+    except ValueError:
+        return None
+    return None if ts is None or np.isnat(ts) else ts
+
+
+def columns_from_events(events: Iterable[Dict[str, Any]]) -> DecisionColumns:
+    """Columns for the recognised events; events without a valid ts are dropped."""
+    vocabs: Dict[str, Dict[str, int]] = {v: {} for v in _VOCABS}
+    rows: Dict[str, List[Any]] = {name: [] for name in _ARRAYS}
+
+    for e in events:
+        try:
+            event = EVENTS.index(e.get("event"))
+        except ValueError:
+            continue
+        # Without a time the event has no month; NaT would stretch per-month aggregates to 2**63 months
+        ts = _timestamp(e.get("ts"))
+        if ts is None:
+            continue
+        record = e.get("rationale") or {}
+        csf = record.get("csf") or {}
+
+        mask = e.get("pfce_mask")
+        if mask is None:
+            mask = pfce.to_mask((record.get("pfce") or {}).get("principles") or ())
+        constraint_mask = 0
+        seen = vocabs["constraints"]
+        for c in (record.get("constraints") or {}).get("selected") or ():
+            if c and (c in seen or len(seen) < MAX_CONSTRAINTS):
+                constraint_mask |= 1 << _code(seen, c)
+
+        rows["ts"].append(ts)
+        rows["event"].append(event)
+        rows["function"].append(_code(vocabs["functions"], _item_id(csf.get("function"))))
+        rows["category"].append(_code(vocabs["categories"], _item_id(csf.get("category"))))
+        rows["case"].append(_code(vocabs["cases"], e.get("case_id")))
+        rows["pfce_mask"].append(int(mask) & pfce.ALL_MASK)
+        rows["constraint_mask"].append(constraint_mask)
+
+    arrays = {name: np.array(rows[name], dtype=_DTYPES[name]) for name in _ARRAYS}
+    return DecisionColumns(**arrays, **{v: tuple(vocabs[v]) for v in _VOCABS})
+
+
+def concat(parts: Sequence[DecisionColumns]) -> DecisionColumns:
+    """Rows of all parts, with their codes remapped into one merged vocabulary."""
+    parts = [p for p in parts if p.rows]
+    if not parts:
+        return empty_columns()
+    if len(parts) == 1:
+        return parts[0]
+
+    merged = {v: list(dict.fromkeys(x for p in parts for x in getattr(p, v))) for v in _VOCABS}
+    merged["constraints"] = merged["constraints"][:MAX_CONSTRAINTS]
+    position = {v: {x: i for i, x in enumerate(merged[v])} for v in _VOCABS}
+
+    out: Dict[str, List[np.ndarray]] = {name: [] for name in _ARRAYS}
+    for p in parts:
+        for name in ("ts", "event", "pfce_mask"):
+            out[name].append(getattr(p, name))
+        for name, vocab in (("function", "functions"), ("category", "categories"), ("case", "cases")):
+            # Trailing -1 entry: code -1 indexes it and stays -1
+            remap = np.array([position[vocab][x] for x in getattr(p, vocab)] + [-1], dtype=np.int16)
+            out[name].append(remap[getattr(p, name)])
+        cm = p.constraint_mask
+        remapped = np.zeros_like(cm)
+        for bit, name in enumerate(p.constraints):
+            target = position["constraints"].get(name)
+            if target is not None:
+                remapped |= ((cm >> np.uint64(bit)) & np.uint64(1)) << np.uint64(target)
+        out["constraint_mask"].append(remapped)
+
+    return DecisionColumns(
+        **{name: np.concatenate(out[name]) for name in _ARRAYS},
+        **{v: tuple(merged[v]) for v in _VOCABS},
+    )
+
+
+# ---------- on-disk column files ----------
+
+def columns_dir(directory: Optional[Path] = None) -> Path:
+    return Path(directory or log_dir()) / "columns"
+
+
+def _column_file(segment: Path) -> Path:
+    return columns_dir(segment.parent) / (segment.name[: -len(".jsonl.gz")] + ".npz")
+
+
+def _save(path: Path, cols: DecisionColumns, source_bytes: int) -> None:
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+    np.savez(
+        tmp,
+        source_bytes=np.array(source_bytes, dtype=np.int64),
+        **{name: getattr(cols, name) for name in _ARRAYS},
+        **{v: np.array(getattr(cols, v), dtype=str) for v in _VOCABS},
+    )
+    os.replace(tmp, path)
+
+
+def _load(path: Path) -> Tuple[DecisionColumns, int]:
+    with np.load(path, allow_pickle=False) as f:
+        cols = DecisionColumns(
+            **{name: f[name] for name in _ARRAYS},
+            **{v: tuple(str(x) for x in f[v]) for v in _VOCABS},
+        )
+        return cols, int(f["source_bytes"])
+
+
+def _covered(path: Path) -> int:
+    """Source bytes a column file covers (0 if there is none), without loading its columns."""
+    try:
+        with np.load(path, allow_pickle=False) as f:
+            return int(f["source_bytes"])
+    except (FileNotFoundError, OSError, KeyError, ValueError):
+        return 0
+
+
+def _read_from(segment: Path, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+    """Events appended to segment after offset, and the offset they end at."""
+    with open(segment, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    if not data:
+        return [], offset
+    try:
+        text = gzip.decompress(data)
+    except (EOFError, gzip.BadGzipFile, zlib.error):
+        if time.time() - segment.stat().st_mtime < STALE_TAIL_S:
+            return [], offset                     # a member is being written; next refresh gets it
+        # A crashed writer's truncated tail: keep what decodes and move past it
+        logger.warning("decision analytics: %s ends in an incomplete record", segment.name)
+        lines: List[bytes] = []
+        try:
+            with gzip.GzipFile(fileobj=io.BytesIO(data)) as g:
+                for line in g:
+                    lines.append(line)
+        except (EOFError, gzip.BadGzipFile, zlib.error):
+            pass
+        text = b"".join(lines)
+    events = []
+    for line in text.splitlines():
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            continue
+    return events, offset + len(data)
+
+
+# Serializes compaction within a process (sessions with different cache
+# keys can refresh at once); temp file names carry the pid for other processes.
+_compact_lock = threading.Lock()
+
+
+def compact(directory: Optional[Path] = None) -> List[Path]:
+    """
+    Bring the column file of every segment up to date (parsing only appended
+    members) and drop files whose segment was removed by retention.
+    Returns the column files in segment order.
+    """
+    with _compact_lock:
+        return _compact(directory)
+
+
+def _compact(directory: Optional[Path]) -> List[Path]:
+    out_dir = columns_dir(directory)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    files = []
+    for segment in segments_in(directory):
+        path = _column_file(segment)
+        try:
+            size = segment.stat().st_size
+        except FileNotFoundError:
+            continue
+        covered = _covered(path)
+        if covered < size:
+            events, covered_now = _read_from(segment, covered)
+            if covered_now != covered:
+                cols = _load(path)[0] if covered else empty_columns()
+                _save(path, concat([cols, columns_from_events(events)]), covered_now)
+        if path.exists():
+            files.append(path)
+
+    live = set(files)
+    for stale in out_dir.glob("*.npz"):
+        if stale not in live and not stale.name.endswith(".tmp.npz"):
+            stale.unlink(missing_ok=True)
+    return files
+
+
+def load_columns(directory: Optional[Path] = None) -> DecisionColumns:
+    """Compact, then load every segment's columns as one table."""
+    return concat([_load(path)[0] for path in compact(directory)])
+
+
+def signature(directory: Optional[Path] = None) -> Tuple[Tuple[str, int], ...]:
+    """(segment name, size) pairs; changes whenever the log does (a cache key)."""
+    out = []
+    for segment in segments_in(directory):
+        try:
+            out.append((segment.name, segment.stat().st_size))
+        except FileNotFoundError:
+            continue
+    return tuple(out)
+
+
+# ---------- aggregates ----------
+
+class PrincipleTable(NamedTuple):
+    months: np.ndarray          # datetime64[M], ascending
+    functions: Tuple[str, ...]
+    counts: np.ndarray          # [month, function, principle] decisions implicating the principle
+    totals: np.ndarray          # [month, function] decisions
+
+
+def principles_by_function_month(cols: DecisionColumns) -> PrincipleTable:
+    """How often each PFCE principle was implicated, per CSF function per month."""
+    rows = (cols.event == RATIONALE) & (cols.function >= 0) & ~np.isnat(cols.ts)
+    fn, masks = cols.function[rows].astype(np.int64), cols.pfce_mask[rows]
+    # Month numbers since 1970 -> dense indices over the observed range
+    month_no = cols.ts[rows].astype("datetime64[M]").astype(np.int64)
+    first = int(month_no.min()) if month_no.size else 0
+    n_m = int(month_no.max()) - first + 1 if month_no.size else 0
+
+    n_f, n_p = len(cols.functions), len(pfce.PRINCIPLES)
+    n_masks = pfce.ALL_MASK + 1
+    cell = (month_no - first) * n_f + fn
+    # One pass: decisions per (cell, principle mask), then expand masks into principles
+    joint = np.bincount(cell * n_masks + masks, minlength=n_m * n_f * n_masks).reshape(-1, n_masks)
+    mask_bits = (np.arange(n_masks)[:, None] >> np.arange(n_p)) & 1
+    counts = (joint @ mask_bits).reshape(n_m, n_f, n_p)
+    totals = joint.sum(axis=1).reshape(n_m, n_f)
+
+    seen = totals.sum(axis=1) > 0       # drop months without any rationale
+    months = (np.arange(n_m) + first).astype("datetime64[M]")[seen]
+    counts, totals = counts[seen], totals[seen]
+    return PrincipleTable(months, cols.functions, counts, totals)
+
+
+def top_principles(table: PrincipleTable) -> List[Tuple[str, str, str, int, int]]:
+    """
+    (month, function, most-implicated principle, its count, decisions) for
+    every cell where at least one rationale implicated a principle.
+    """
+    best = table.counts.argmax(axis=-1)
+    out = []
+    for m, f in zip(*np.nonzero(table.counts.max(axis=-1))):
+        p = best[m, f]
+        out.append((
+            str(table.months[m]), table.functions[f], pfce.PRINCIPLES[p],
+            int(table.counts[m, f, p]), int(table.totals[m, f]),
+        ))
+    return out
+
+
+def constraint_cooccurrence(cols: DecisionColumns) -> np.ndarray:
+    """[i, j] = rationales selecting both constraints[i] and constraints[j] (diagonal: each alone)."""
+    # Few distinct selections recur across many rows: reduce to (combination, count) first
+    combos, n = np.unique(cols.constraint_mask[cols.event == RATIONALE], return_counts=True)
+    shifts = np.arange(len(cols.constraints), dtype=np.uint64)
+    bits = ((combos[:, None] >> shifts) & np.uint64(1)).astype(np.int64)
+    return (bits * n[:, None]).T @ bits
+
+
+def principle_counts_by_function(cols: DecisionColumns) -> np.ndarray:
+    """[function, principle] rationales implicating each principle, over all time."""
+    return principles_by_function_month(cols).counts.sum(axis=0)
+
+
+def counts_by(codes: np.ndarray, vocab: Sequence[str]) -> np.ndarray:
+    """Occurrences of each vocabulary entry in a code column (-1 ignored)."""
+    return np.bincount(codes[codes >= 0].astype(np.int64), minlength=len(vocab))
@@ -0,0 +1,134 @@
+# logic/draft.py
+
+"""
+The open-ended wizard's working state as one object.
+
+OpenEndedDraft holds everything the user has entered across the five steps
+in a single slotted object stored under st.session_state["oe_draft"]. Every
+field is an immutable value (str, tuple of ids, int bitmask), so:
+
+    snapshot()            a plain tuple of the field values (no copying)
+    restore(snapshot)     a draft equal to the one that was snapshotted
+    to_dict()/from_dict() the JSON-ready form, for persistence
+
+Widgets still need session-state keys while they are on screen, but
+Streamlit drops those keys once a step stops rendering them. The app seeds
+each widget from the draft and writes its value back, so the draft is the
+one copy that outlives a step change.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Tuple
+
+from logic import principles as pfce
+
+# (field, default) in snapshot order; defaults are immutable
+_FIELDS: Tuple[Tuple[str, Any], ...] = (
+    # Step 1
+    ("decision_context", ""),
+    ("suggested_function", ""),      # keyword pre-suggestion for Step 2
+    # Step 2
+    ("csf_function", ""),
+    ("csf_category", ""),
+    ("subcategories", ()),           # outcome ids, catalog order
+    # Step 3
+    ("pfce_mask", 0),                # logic.principles bitmask
+    ("pfce_analysis", ""),
+    ("tension_a", ""),
+    ("tension_b", ""),
+    # Step 4
+    ("constraints", ()),
+    ("constraints_other", ""),
+    # Step 5
+    ("decision", ""),
+    # Rationale-schema fields no step collects yet
+    ("trigger_example", ""),
+    ("trigger_type", ""),
+    ("triggering_condition", ""),
+    ("decision_type", ""),
+    ("csf_rationale", ""),
+    ("condition_tags", ()),
+    ("pfce_rationale", ""),
+)
+
+FIELD_NAMES: Tuple[str, ...] = tuple(name for name, _ in _FIELDS)
+
+Snapshot = Tuple[Any, ...]
+
+
+def _coerce(default: Any, value: Any) -> Any:
+    # Keep each field's type so a draft built from JSON or widget values stays immutable
+    if isinstance(default, tuple):
+        return tuple(str(v) for v in value or ())
+    if isinstance(default, int):
+        return int(value or 0)
+    return str(value or "")
+
+
+class OpenEndedDraft:
+    __slots__ = FIELD_NAMES
+
+    def __init__(self, **values: Any):
+        unknown = set(values).difference(FIELD_NAMES)
+        if unknown:
+            raise TypeError(f"unknown draft field(s): {', '.join(sorted(unknown))}")
+        for name, default in _FIELDS:
+            setattr(self, name, _coerce(default, values[name]) if name in values else default)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, OpenEndedDraft) and self.snapshot() == other.snapshot()
+
+    __hash__ = None  # mutable
+
+    def __repr__(self) -> str:
+        changed = ", ".join(
+            f"{name}={getattr(self, name)!r}"
+            for name, default in _FIELDS if getattr(self, name) != default
+        )
+        return f"OpenEndedDraft({changed})"
+
+    # ---------- derived views ----------
+
+    @property
+    def pfce_principles(self) -> Tuple[str, ...]:
+        """Selected PFCE principle names, in registry order."""
+        return pfce.names(self.pfce_mask)
+
+    @property
+    def ethical_tension(self) -> str:
+        """The two obligations as one line ("A  ⟷  B"), or whichever is filled in."""
+        return f"{self.tension_a.strip()}  ⟷  {self.tension_b.strip()}".strip(" ⟷ ")
+
+    def is_empty(self) -> bool:
+        return all(getattr(self, name) == default for name, default in _FIELDS)
+
+    # ---------- snapshot / restore ----------
+
+    def snapshot(self) -> Snapshot:
+        """Field values in FIELD_NAMES order. Values are immutable, so this is a full copy."""
+        return tuple(getattr(self, name) for name in FIELD_NAMES)
+
+    @classmethod
+    def restore(cls, snapshot: Iterable[Any]) -> "OpenEndedDraft":
+        draft = cls()
+        for (name, default), value in zip(_FIELDS, snapshot):
+            setattr(draft, name, _coerce(default, value))
+        return draft
+
+    def __reduce__(self):
+        # Pickle as the snapshot tuple rather than a name -> value state dict
+        return (OpenEndedDraft.restore, (self.snapshot(),))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready fields that differ from their defaults (tuples become lists)."""
+        out: Dict[str, Any] = {}
+        for name, default in _FIELDS:
+            value = getattr(self, name)
+            if value != default:
+                out[name] = list(value) if isinstance(value, tuple) else value
+        return out
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "OpenEndedDraft":
+        """Inverse of to_dict(); unknown keys are ignored."""
+        return cls(**{k: v for k, v in data.items() if k in FIELD_NAMES})
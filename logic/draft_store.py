@@ -0,0 +1,193 @@
+# logic/draft_store.py
+
+"""
+Durable autosave for open-ended drafts (see logic.draft).
+
+Drafts are kept in a local SQLite database in WAL mode, so readers (a
+resume on another worker) never block the writer. Sessions call save() as
+often as they like. It only records the latest draft per id in memory, and
+one writer thread commits every pending draft in a single transaction at
+most once per DEBOUNCE_S. A burst of widget changes costs one upsert per
+draft, and many sessions share one commit.
+
+Drafts are addressed by an unguessable id that the app puts in the URL
+(?draft=<id>). Reloading that link, on any worker that can see the
+database, restores the draft and its step. A failed commit (e.g. a lock
+timeout on a shared volume) is retried by the writer with exponential
+back-off, without waiting for another save. Pending writes are flushed at
+interpreter exit, so a rolling restart loses at most the in-flight
+debounce window of a worker that is killed outright.
+
+The database path defaults to data/state/drafts.sqlite3 and can be moved
+(e.g. onto a volume shared by replicas) with MCEDS_DRAFTS_DB.
+"""
+
+import atexit
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from logic.draft import OpenEndedDraft
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_DB_PATH = ROOT_DIR / "data" / "state" / "drafts.sqlite3"
+
+DEBOUNCE_S = 2.0                      # max delay between a change and its commit
+RETENTION_S = 30 * 24 * 3600          # drafts untouched this long are pruned at startup
+RETRY_MAX_S = 60.0                    # longest back-off between retries of a failed commit
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS drafts (
+    id      TEXT PRIMARY KEY,
+    step    INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    updated REAL NOT NULL
+)
+"""
+
+
+class SavedDraft(NamedTuple):
+    step: int
+    draft: OpenEndedDraft
+    updated: float
+
+
+def new_draft_id() -> str:
+    return secrets.token_urlsafe(12)
+
+
+def db_path() -> Path:
+    return Path(os.environ.get("MCEDS_DRAFTS_DB") or DEFAULT_DB_PATH)
+
+
+class DraftStore:
+    """
+    Debounced, batched SQLite persistence for drafts.
+
+    save() is non-blocking; load() sees pending (uncommitted) saves first,
+    and a save stays pending until its commit succeeds. Every read and
+    write opens its own short-lived connection (cheap in WAL mode), so no
+    connection is shared between threads.
+    """
+
+    def __init__(self, path: Optional[Path] = None, debounce_s: float = DEBOUNCE_S):
+        self.path = Path(path or db_path())
+        self._debounce_s = debounce_s
+        self._pending: Dict[str, Tuple[int, str, float]] = {}   # id -> (step, payload json, time)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._failures = 0                  # consecutive failed commits
+        self._closed = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(_SCHEMA)
+                conn.execute("DELETE FROM drafts WHERE updated < ?", (time.time() - RETENTION_S,))
+        finally:
+            conn.close()
+
+        self._writer = threading.Thread(target=self._run, name="draft-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")   # durable across process crashes in WAL mode
+        return conn
+
+    # ---------- public API ----------
+
+    def save(self, draft_id: str, step: int, draft: OpenEndedDraft) -> None:
+        """Queue the latest state of a draft; committed within DEBOUNCE_S."""
+        payload = json.dumps(draft.to_dict(), ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._pending[draft_id] = (int(step), payload, time.time())
+        self._wake.set()
+
+    def load(self, draft_id: str) -> Optional[SavedDraft]:
+        """The saved draft for draft_id, or None if unknown."""
+        with self._lock:
+            pending = self._pending.get(draft_id)
+        if pending is not None:
+            step, payload, updated = pending
+        else:
+            try:
+                conn = self._connect()
+                try:
+                    row = conn.execute(
+                        "SELECT step, payload, updated FROM drafts WHERE id = ?", (draft_id,)
+                    ).fetchone()
+                finally:
+                    conn.close()
+            except sqlite3.Error:
+                logger.exception("draft store: read failed for %s", draft_id)
+                return None
+            if row is None:
+                return None
+            step, payload, updated = row
+        return SavedDraft(int(step), OpenEndedDraft.from_dict(json.loads(payload)), float(updated))
+
+    def flush(self) -> int:
+        """Commit every pending draft now; returns how many were written."""
+        # Entries stay pending until committed, so load() never misses a draft mid-write
+        with self._lock:
+            batch = dict(self._pending)
+        if not batch:
+            return 0
+        rows = [(draft_id, step, payload, updated) for draft_id, (step, payload, updated) in batch.items()]
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO drafts (id, step, payload, updated) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(id) DO UPDATE SET step = excluded.step, "
+                        "payload = excluded.payload, updated = excluded.updated "
+                        "WHERE excluded.updated >= drafts.updated",
+                        rows,
+                    )
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            self._failures += 1
+            logger.exception("draft store: write of %d draft(s) failed; retrying", len(rows))
+            return 0
+        self._failures = 0
+        with self._lock:
+            for draft_id, entry in batch.items():
+                if self._pending.get(draft_id) is entry:   # not superseded by a newer save
+                    del self._pending[draft_id]
+        return len(rows)
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        self.flush()
+
+    # ---------- writer thread ----------
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait()
+            if self._closed:
+                break
+            # Debounce: let the burst that woke us (and other sessions' saves) pile up
+            time.sleep(self._debounce_s)
+            self._wake.clear()
+            self.flush()
+            if self._failures and not self._closed:
+                # The drafts are still pending; retry on our own, since the
+                # session that saved them may never call save() again
+                time.sleep(min(self._debounce_s * 2 ** (self._failures - 1), RETRY_MAX_S))
+                self._wake.set()
@@ -0,0 +1,126 @@
+# logic/keywords.py
+
+"""
+Compiled multi-pattern keyword matcher (word-level Aho-Corasick).
+
+Keyword tables ({label: [keyword, ...]}) are compiled once into a trie over
+word tokens with failure links, so scanning decision text is a single pass
+over its tokens regardless of how many keywords there are. Because matching
+works on whole tokens, "control" does not match inside "controller", and
+multi-word phrases ("shut down", "post-incident review") match across
+whitespace and punctuation.
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+# Words, allowing inner hyphens/apostrophes ("post-incident", "city's")
+_TOKEN_RE = re.compile(r"[^\W_]+(?:['’-][^\W_]+)*")
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """Lowercased word tokens of text with their (start, end) offsets."""
+    return [(m.group().lower(), m.start(), m.end()) for m in _TOKEN_RE.finditer(text or "")]
+
+
+class KeywordMatch(NamedTuple):
+    start: int       # character offsets into the scanned text
+    end: int
+    keyword: str
+    label: str
+
+
+class KeywordScan(NamedTuple):
+    scores: Dict[str, float]           # label -> summed weight (every label present)
+    matches: Tuple[KeywordMatch, ...]  # in text order
+
+    @property
+    def best(self) -> Optional[str]:
+        """Highest-scoring label (table order breaks ties), or None if nothing matched."""
+        best_label, best_score = None, 0.0
+        for label, score in self.scores.items():
+            if score > best_score:
+                best_label, best_score = label, score
+        return best_label
+
+    def keywords_for(self, label: str) -> Tuple[str, ...]:
+        """Distinct keywords matched for label, in first-seen order."""
+        return tuple(dict.fromkeys(m.keyword for m in self.matches if m.label == label))
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over word tokens.
+
+    Each keyword's weight defaults to its token count, so specific phrases
+    ("incident response") outweigh single generic words ("access").
+    """
+
+    __slots__ = ("_labels", "_patterns", "_goto", "_fail", "_out")
+
+    def __init__(self, table: Mapping[str, Iterable[str]], weights: Optional[Mapping[str, float]] = None):
+        self._labels: Tuple[str, ...] = tuple(table)
+        self._patterns: List[Tuple[str, str, int, float]] = []  # keyword, label, n_tokens, weight
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        for label, keywords in table.items():
+            for kw in keywords:
+                tokens = [t for t, _, _ in tokenize(kw)]
+                if not tokens:
+                    continue
+                weight = float(weights.get(kw, len(tokens))) if weights else float(len(tokens))
+                self._add(tokens, len(self._patterns))
+                self._patterns.append((kw, label, len(tokens), weight))
+
+        self._link()
+
+    def _add(self, tokens: List[str], pattern_idx: int) -> None:
+        node = 0
+        for tok in tokens:
+            nxt = self._goto[node].get(tok)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][tok] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = nxt
+        self._out[node] = self._out[node] + (pattern_idx,)
+
+    def _link(self) -> None:
+        # Breadth-first: a node's failure target is always shallower, so its
+        # outputs are final by the time the node is visited.
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for tok, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and tok not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(tok, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def scan(self, text: str) -> KeywordScan:
+        """Single pass over text's tokens; returns per-label scores and matched spans."""
+        scores = {label: 0.0 for label in self._labels}
+        matches: List[KeywordMatch] = []
+        tokens = tokenize(text)
+
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self._patterns
+        node = 0
+        for j, (tok, _, end) in enumerate(tokens):
+            while node and tok not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(tok, 0)
+            for pidx in out[node]:
+                kw, label, n, weight = patterns[pidx]
+                scores[label] += weight
+                matches.append(KeywordMatch(tokens[j - n + 1][1], end, kw, label))
+
+        matches.sort(key=lambda m: (m.start, -m.end))
+        return KeywordScan(scores, tuple(matches))
@@ -1,27 +1,64 @@
 from pathlib import Path
-from typing import List, Dict, Any
+from types import MappingProxyType
+from typing import List, Dict, Any, Iterator, Mapping, NamedTuple, Optional, Tuple
 
+import hashlib
 import json
+import threading
 import yaml
 import streamlit as st
 
+from logic.bundle import read_bundle
+from logic.case_index import CaseEntry, CaseIndex
+from logic.coverage import IncidenceMatrix
+from logic.crosswalk import CrosswalkIndex
+from logic.outcome_search import OutcomeFilterIndex
+from logic.retrieval import SubcategoryIndex
+from logic.similarity import CaseSimilarityIndex
+
 # Base data directories
 ROOT_DIR = Path(__file__).resolve().parents[1]
 DATA_DIR = ROOT_DIR / "data"
 CASES_DIR = DATA_DIR / "cases"
 CROSSWALK_DIR = DATA_DIR / "crosswalk"
 
+# Compiled data bundle (built by tools/build_data_bundle.py)
+BUNDLE_PATH = DATA_DIR / "build" / "data.bundle"
+
+# Optional constraints files, checked in order
+CONSTRAINT_CANDIDATES = [
+    DATA_DIR / "scenario_constraints.yaml",
+    DATA_DIR / "constraints.yaml",
+]
+
 
 # ---------- Generic file helpers ----------
 
+# libyaml-backed loader when available (several times faster than pure Python)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
 def _safe_read_yaml(path: Path) -> Any:
     try:
         with path.open("r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
+            return yaml.load(f, Loader=_YAML_LOADER) or {}
     except Exception:
         return {}
 
 
+def _read_case_file(path: Path) -> Tuple[str, Any]:
+    """(sha256 of the file bytes, parsed document); ("", {}) if unreadable."""
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return "", {}
+    try:
+        doc = yaml.load(data, Loader=_YAML_LOADER) or {}
+    except Exception:
+        doc = {}
+    return hashlib.sha256(data).hexdigest(), doc
+
+
 def _safe_read_json(path: Path) -> Any:
     try:
         with path.open("r", encoding="utf-8") as f:
@@ -30,10 +67,21 @@ def _safe_read_json(path: Path) -> Any:
         return {}
 
 
-# ---------- NIST CSF / PFCE loaders ----------
+def freeze(value: Any) -> Any:
+    """
+    Recursively convert parsed YAML/JSON into read-only equivalents:
+    dicts become MappingProxyType views and lists become tuples.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+# ---------- NIST CSF / PFCE readers ----------
 
-@st.cache_data
-def load_csf_data() -> Dict[str, Any]:
+def _read_csf_data() -> Any:
     """
     Load the minimal NIST CSF 2.0 structure from data/crosswalk/csf_min.json.
 
@@ -63,8 +111,7 @@ def load_csf_data() -> Dict[str, Any]:
     return _safe_read_json(path)
 
 
-@st.cache_data
-def load_pfce_crosswalk() -> List[Dict[str, Any]]:
+def _read_pfce_crosswalk() -> List[Dict[str, Any]]:
     """
     Load the CSF→PFCE crosswalk from data/crosswalk/pfce_crosswalk_scaffold.yaml.
 
@@ -84,8 +131,7 @@ def load_pfce_crosswalk() -> List[Dict[str, Any]]:
     return []
 
 
-@st.cache_data
-def load_pfce_principles() -> List[Dict[str, Any]]:
+def _read_pfce_principles() -> List[Dict[str, Any]]:
     """
     Load PFCE principles from data/crosswalk/pfce_principles.yaml.
 
@@ -129,20 +175,14 @@ def load_pfce_principles() -> List[Dict[str, Any]]:
     return []
 
 
-
-@st.cache_data
-def load_constraints() -> List[str]:
+def _read_constraints() -> List[str]:
     """
     Load a generic list of institutional/governance constraints if a file exists.
 
     If no structured file exists, fall back to a standard list used across the prototype.
     """
     # Try a YAML-based constraints file first, if you later add one.
-    candidates = [
-        DATA_DIR / "scenario_constraints.yaml",
-        DATA_DIR / "constraints.yaml",
-    ]
-    for p in candidates:
+    for p in CONSTRAINT_CANDIDATES:
         if p.exists():
             data = _safe_read_yaml(p)
             if isinstance(data, list):
@@ -166,65 +206,262 @@ def load_constraints() -> List[str]:
     ]
 
 
-# ---------- Case-based mode helpers ----------
+# ---------- Shared read-only catalog ----------
+
+EMPTY_MAPPING: Mapping[str, Any] = MappingProxyType({})
+
 
-@st.cache_data
-def list_cases() -> List[Dict[str, Any]]:
+class CaseRevision(NamedTuple):
+    """A frozen case document and the sha256 of the file it was parsed from."""
+    sha256: str
+    doc: Mapping[str, Any]
+
+
+NO_CASE = CaseRevision("", EMPTY_MAPPING)
+
+
+class DataCatalog:
     """
-    Return a list of available thesis cases from data/cases as:
+    Process-wide, read-only snapshot of the framework data under data/,
+    plus a live index of the case library.
 
-    [
-      {"id": "baltimore", "title": "City of Baltimore Ransomware Attack (2019)", "path": "..."},
-      ...
-    ]
+    Built once per process by get_catalog() and shared by every session and
+    rerun, so cache hits cost nothing (unlike st.cache_data, which pickles
+    and unpickles the whole return value on every hit).
+
+    No-mutation contract: every value reachable from the catalog is frozen
+    (dicts are MappingProxyType views, lists are tuples). Callers must treat
+    them as read-only and use .get(...) with defaults instead of setdefault();
+    copy with dict(...)/list(...) first if a mutable version is needed.
     """
-    cases: List[Dict[str, Any]] = []
-    if not CASES_DIR.exists():
-        return cases
 
-    for path in sorted(CASES_DIR.glob("*.yaml")):
-        data = _safe_read_yaml(path)
-        cid = str(data.get("id") or path.stem)
-        title = data.get("title") or path.stem
-        ui_title = data.get("ui_title") or title
-        short_summary = data.get("short_summary") or ""  # <-- ADD THIS LINE
+    __slots__ = (
+        "csf", "crosswalk", "crosswalk_index", "incidence", "subcategory_index", "outcome_index",
+        "principles", "constraints",
+        "case_index", "case_similarity", "_case_docs", "_case_docs_lock",
+    )
+
+    def __init__(
+        self,
+        csf: Any,
+        crosswalk: Tuple[Mapping[str, Any], ...],
+        principles: Tuple[Mapping[str, Any], ...],
+        constraints: Tuple[str, ...],
+        subcategory_index: Optional[SubcategoryIndex] = None,
+        case_feature_seed: Optional[Mapping[str, Any]] = None,
+    ):
+        self.csf = csf
+        self.crosswalk = crosswalk
+        self.crosswalk_index = CrosswalkIndex(crosswalk)
+        self.incidence = IncidenceMatrix(csf, self.crosswalk_index)
+        self.subcategory_index = subcategory_index or SubcategoryIndex.build(csf)
+        self.outcome_index = OutcomeFilterIndex.from_csf(csf)
+        self.principles = principles
+        self.constraints = constraints
+
+        # id -> header-only case manifest; stays current as files change on disk
+        self.case_index = CaseIndex(CASES_DIR, ROOT_DIR)
+
+        # Per-case similarity features, computed on first use from the cached
+        # revisions below (or seeded from the bundle when one was built)
+        self.case_similarity = CaseSimilarityIndex(
+            self.case_index, ROOT_DIR, case_feature_seed,
+            load_doc=lambda entry: self.entry_revision(entry).doc,
+        )
 
-        cases.append(
-            {
-                "id": cid,
-                "title": title,          # canonical / thesis title
-                "ui_title": ui_title,    # display-only title
-                "short_summary": short_summary,
-                "path": str(path),
-                "raw": data,
-            }
+        # Full case documents, parsed lazily when a walkthrough opens. Keyed by
+        # relative path and tagged with the (mtime_ns, size) they were read at.
+        self._case_docs: Dict[str, Tuple[Tuple[int, int], CaseRevision]] = {}
+        self._case_docs_lock = threading.Lock()
+
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, Any]) -> "DataCatalog":
+        """Freeze a parse_sources() payload into a catalog."""
+        return cls(
+            csf=freeze(payload.get("csf", {})),
+            crosswalk=freeze(payload.get("crosswalk", [])),
+            principles=freeze(payload.get("principles", [])),
+            constraints=tuple(payload.get("constraints", [])),
+            subcategory_index=(
+                SubcategoryIndex.from_payload(payload["subcategory_index"])
+                if payload.get("subcategory_index") else None
+            ),
+            case_feature_seed=payload.get("case_features"),
         )
 
+    def case(self, case_id: Optional[str]) -> Mapping[str, Any]:
+        """
+        Return the frozen case document for case_id, or an empty mapping.
+
+        Resolution goes through case_index (constant time, including for
+        unknown ids); only the one matching file is parsed, and only if it
+        changed since it was last read.
+        """
+        return self.case_revision(case_id).doc
+
+    def case_revision(self, case_id: Optional[str]) -> CaseRevision:
+        """case() plus the content hash of the file, for caches keyed on case content."""
+        entry = self.case_index.resolve(case_id)
+        if entry is None:
+            return NO_CASE
+        return self.entry_revision(entry)
+
+    def entry_revision(self, entry: CaseEntry) -> CaseRevision:
+        """The parsed revision of one indexed case file, re-read only when its (mtime, size) changes."""
+        sig = (entry.mtime_ns, entry.size)
+        with self._case_docs_lock:
+            cached = self._case_docs.get(entry.path)
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+
+        digest, doc = _read_case_file(ROOT_DIR / entry.path)
+        revision = CaseRevision(digest, freeze(doc))
+        with self._case_docs_lock:
+            self._case_docs[entry.path] = (sig, revision)
+        return revision
+
+
+def source_files() -> List[Path]:
+    """
+    The files the readers above parse. Their content hashes key the data
+    bundle, so adding, removing or editing any of them invalidates it.
 
-    # Sort by title for stable UI
-    cases.sort(key=lambda c: c["title"])
-    return cases
+    Case files are deliberately not bundled: hashing them would read the
+    whole case library at cold start. They go through the CaseIndex header
+    scan and are parsed one at a time by load_case().
+    """
+    files = [
+        CROSSWALK_DIR / "csf_min.json",
+        CROSSWALK_DIR / "pfce_crosswalk_scaffold.yaml",
+        CROSSWALK_DIR / "pfce_principles.yaml",
+    ]
+    files += [p for p in CONSTRAINT_CANDIDATES if p.exists()]
+    return [p for p in files if p.exists()]
 
 
-@st.cache_data
-def load_case(case_id: str) -> Dict[str, Any]:
+def parse_sources() -> Dict[str, Any]:
     """
-    Load a single case by id from data/cases/<id>.yaml (or matching id inside the file).
+    Parse every data source into the plain (unfrozen) payload stored in the
+    data bundle and consumed by DataCatalog.from_payload(), including the
+    precomputed subcategory search index. Case similarity features are not
+    part of it: tools/build_data_bundle.py adds them to the bundle, and
+    without one they are computed per case on first use.
+    """
+    csf = _read_csf_data()
+    return {
+        "csf": csf,
+        "crosswalk": _read_pfce_crosswalk(),
+        "principles": _read_pfce_principles(),
+        "constraints": _read_constraints(),
+        "subcategory_index": SubcategoryIndex.build(csf).to_payload(),
+    }
 
-    Returns an empty dict if not found.
+
+def build_catalog() -> DataCatalog:
     """
-    if not CASES_DIR.exists():
-        return {}
+    Build a DataCatalog from the compiled data bundle when its source hashes
+    match the files on disk, otherwise by parsing the sources directly.
+    """
+    payload = read_bundle(BUNDLE_PATH, source_files(), ROOT_DIR)
+    if payload is None:
+        payload = parse_sources()
+    return DataCatalog.from_payload(payload)
+
 
-    # First try by filename
-    direct_path = CASES_DIR / f"{case_id}.yaml"
-    if direct_path.exists():
-        return _safe_read_yaml(direct_path) or {}
+@st.cache_resource
+def get_catalog() -> DataCatalog:
+    """
+    Return the shared DataCatalog, building it on first use.
+
+    st.cache_resource hands every caller the same object (no copy), which is
+    why the catalog contents are frozen.
+    """
+    return build_catalog()
+
+
+# ---------- Public loaders (read-only views into the catalog) ----------
+
+def load_csf_data() -> Any:
+    """Frozen NIST CSF 2.0 structure (see _read_csf_data for the shape)."""
+    return get_catalog().csf
+
+
+def load_pfce_crosswalk() -> Tuple[Mapping[str, Any], ...]:
+    """Frozen CSF→PFCE crosswalk rows."""
+    return get_catalog().crosswalk
+
+
+def load_crosswalk_index() -> CrosswalkIndex:
+    """Shared CrosswalkIndex over the crosswalk rows (by CSF id and by principle)."""
+    return get_catalog().crosswalk_index
+
+
+def load_incidence_matrix() -> IncidenceMatrix:
+    """Shared CSF-subcategory × PFCE incidence matrix (see logic.coverage)."""
+    return get_catalog().incidence
+
+
+def load_subcategory_index() -> SubcategoryIndex:
+    """Shared BM25 index from decision text to CSF subcategories (see logic.retrieval)."""
+    return get_catalog().subcategory_index
+
+
+def load_outcome_index() -> OutcomeFilterIndex:
+    """Shared prefix/trigram filter over CSF subcategory outcomes (see logic.outcome_search)."""
+    return get_catalog().outcome_index
+
+
+def load_case_similarity() -> CaseSimilarityIndex:
+    """Shared similar-case ranker over the case library (see logic.similarity)."""
+    return get_catalog().case_similarity
+
+
+def load_pfce_principles() -> Tuple[Mapping[str, Any], ...]:
+    """Frozen PFCE principle entries."""
+    return get_catalog().principles
+
+
+def load_constraints() -> Tuple[str, ...]:
+    """Institutional/governance constraint labels."""
+    return get_catalog().constraints
+
+
+def list_case_summaries(offset: int = 0, limit: Optional[int] = None) -> Tuple[CaseEntry, ...]:
+    """
+    Return one page of case summaries (id, title, ui_title, short_summary,
+    path), sorted by title. Built from file headers only; call load_case()
+    for the full document.
+    """
+    return get_catalog().case_index.summaries(offset, limit)
+
+
+def iter_case_summaries(page_size: int = 50) -> Iterator[CaseEntry]:
+    """Lazily yield every case summary in title order, one page at a time."""
+    if page_size < 1:
+        raise ValueError(f"page_size must be at least 1, got {page_size}")
+    offset = 0
+    while True:
+        page = list_case_summaries(offset, page_size)
+        yield from page
+        if len(page) < page_size:
+            return
+        offset += page_size
+
+
+def list_cases() -> Tuple[CaseEntry, ...]:
+    """All case summaries, sorted by title (see list_case_summaries)."""
+    return list_case_summaries()
+
+
+def load_case(case_id: str) -> Mapping[str, Any]:
+    """
+    Load a single case by id from data/cases/<id>.yaml (or matching id inside the file).
+
+    Returns a frozen mapping; an empty one if not found.
+    """
+    return get_catalog().case(case_id)
 
-    # Fallback: scan for matching 'id' field
-    for path in CASES_DIR.glob("*.yaml"):
-        data = _safe_read_yaml(path)
-        if str(data.get("id")) == case_id:
-            return data
 
-    return {}
+def load_case_revision(case_id: str) -> CaseRevision:
+    """load_case() plus the sha256 of the case file it came from."""
+    return get_catalog().case_revision(case_id)
@@ -0,0 +1,172 @@
+# logic/navigation.py
+
+"""
+Navigation state machine shared by the Case-Based and Open-Ended modes.
+
+Every way of moving through the app (Previous/Next, Generate, the header
+"Back" buttons, and tile links arriving as query params) is a declared
+transition: a named, pure update of the session-state keys below. Buttons
+fire transitions from on_click callbacks, which Streamlit runs *before* the
+script reruns, so each click produces exactly one script run that already
+sees the new step. Nothing here calls st.rerun().
+
+Session keys owned by navigation:
+
+    landing_complete, active_mode       mode selection
+    cb_view, cb_case_id, cb_prev_case_id, cb_step, cb_step_return
+    oe_step, oe_generate, oe_resume
+    dashboard                           decision analytics page open
+"""
+
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Callable, Dict, Optional
+
+State = MutableMapping[str, Any]
+
+# Steps of a case walkthrough, shared by the UI (app/case_based.py) and
+# the PDF briefs (logic.case_export)
+CASE_STEP_TITLES = (
+    "Technical and Operational Background",
+    "Triggering Condition and Key Events",
+    "Decision Context",
+    "NIST CSF Mapping",
+    "Ethical Tension",
+    "PFCE Analysis",
+    "Institutional and Governance Constraints",
+    "Decision",
+    "Outcomes and Implications",
+)
+
+CB_TOTAL_STEPS = len(CASE_STEP_TITLES)
+OE_TOTAL_STEPS = 5
+
+MODES = ("Case-Based", "Open-Ended")
+
+# walkthrough -> (step key, number of steps)
+WALKTHROUGHS = {
+    "cb": ("cb_step", CB_TOTAL_STEPS),
+    "oe": ("oe_step", OE_TOTAL_STEPS),
+}
+
+_CASE_KEYS = ("cb_step", "cb_step_return")
+_MODE_KEYS = ("cb_view", "cb_case_id", "cb_prev_case_id", *_CASE_KEYS, "oe_step")
+
+TRANSITIONS: Dict[str, Callable[..., None]] = {}
+
+
+def transition(name: str) -> Callable[[Callable[..., None]], Callable[..., None]]:
+    def register(fn: Callable[..., None]) -> Callable[..., None]:
+        TRANSITIONS[name] = fn
+        return fn
+    return register
+
+
+def fire(state: State, name: str, *args: Any) -> None:
+    """Apply transition `name` to state. Usable directly as an on_click callback."""
+    TRANSITIONS[name](state, *args)
+
+
+def _pop(state: State, keys) -> None:
+    for k in keys:
+        state.pop(k, None)
+
+
+# ---------- step transitions ----------
+
+def _step(state: State, walkthrough: str, delta: int) -> None:
+    key, total = WALKTHROUGHS[walkthrough]
+    state[key] = min(max(int(state.get(key) or 1) + delta, 1), total)
+
+
+@transition("next")
+def _next(state: State, walkthrough: str) -> None:
+    _step(state, walkthrough, +1)
+
+
+@transition("prev")
+def _prev(state: State, walkthrough: str) -> None:
+    _step(state, walkthrough, -1)
+
+
+@transition("generate")
+def _generate(state: State) -> None:
+    state["oe_generate"] = True
+
+
+# ---------- mode / case transitions ----------
+
+@transition("open_case")
+def _open_case(state: State, case_id: str) -> None:
+    state["active_mode"] = "Case-Based"
+    state["landing_complete"] = True
+    state["cb_case_id"] = case_id
+    state["cb_prev_case_id"] = case_id
+    state["cb_view"] = "walkthrough"
+    state["cb_step"] = 1
+    state.pop("cb_step_return", None)
+
+
+@transition("enter_mode")
+def _enter_mode(state: State, mode: str, start: Optional[str] = None) -> None:
+    state["active_mode"] = mode
+    state["landing_complete"] = True
+    if start == "walkthrough":
+        if mode == "Case-Based":
+            state["cb_view"] = "select"
+        elif state.get("oe_step", 0) == 0:
+            state["oe_step"] = 1
+
+
+@transition("resume_draft")
+def _resume_draft(state: State, draft_id: str) -> None:
+    # open_ended loads the draft from the store on its next render
+    if state.get("oe_draft_id") == draft_id:
+        return
+    state["active_mode"] = "Open-Ended"
+    state["landing_complete"] = True
+    state["oe_resume"] = draft_id
+
+
+@transition("back_to_cases")
+def _back_to_cases(state: State) -> None:
+    state["cb_view"] = "select"
+    _pop(state, _CASE_KEYS)
+
+
+@transition("back_to_modes")
+def _back_to_modes(state: State) -> None:
+    state["landing_complete"] = False
+    _pop(state, _MODE_KEYS)
+
+
+@transition("open_dashboard")
+def _open_dashboard(state: State) -> None:
+    state["dashboard"] = True
+
+
+@transition("close_dashboard")
+def _close_dashboard(state: State) -> None:
+    state.pop("dashboard", None)
+
+
+# ---------- URL entry ----------
+
+def transition_for_query(params: Mapping[str, Any]) -> Optional[tuple]:
+    """
+    The (name, *args) transition a tile link's query params ask for, or None.
+    ?cb_case_id=<id> opens that case; ?mode=<mode>[&start=walkthrough] enters a mode;
+    ?draft=<id> resumes a saved open-ended draft (see logic.draft_store);
+    ?view=dashboard opens the decision analytics page.
+    """
+    case_id = params.get("cb_case_id")
+    if case_id:
+        return ("open_case", case_id)
+    mode = params.get("mode")
+    if mode in MODES:
+        return ("enter_mode", mode, params.get("start"))
+    draft_id = params.get("draft")
+    if draft_id:
+        return ("resume_draft", draft_id)
+    if params.get("view") == "dashboard":
+        return ("open_dashboard",)
+    return None
@@ -0,0 +1,142 @@
+# logic/outcome_search.py
+
+"""
+As-you-type filtering of CSF subcategory outcomes for the Step 2 picker.
+
+Every outcome (id plus outcome text) is one document, numbered in catalog
+order. Postings are int bitsets over those numbers, the same representation
+as the PFCE masks: intersecting a query's terms is a chain of `&`, and the
+matches of a category come out in catalog order by walking the set bits.
+
+    word prefixes   every 1-2 character prefix of each word ("r", "rs", "0")
+    trigrams        every 3-character window of each word
+
+A query term of one or two characters must prefix a word; a longer term
+must occur as a substring of a word ("cover" finds "recovery"). Its
+trigram bitsets give a superset of the matches, which is then checked
+against the text, so the result is exact.
+"""
+
+import re
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Tuple
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def _trigrams(word: str) -> Iterable[str]:
+    return (word[i:i + 3] for i in range(len(word) - 2))
+
+
+def _bits(mask: int) -> Iterable[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class OutcomeFilterIndex:
+    """
+    Prefix/trigram index over CSF subcategory outcomes.
+
+    sub_ids[i], words[i]: outcome id and the words of "<id> <text>"
+    grams: key (1-2 char prefix or 3-char gram) -> bitset of outcome numbers
+    by_cat: category id -> bitset of its outcomes
+    """
+
+    __slots__ = ("sub_ids", "_position", "_words", "_grams", "_by_cat")
+
+    def __init__(self, outcomes: Iterable[Tuple[str, str, str]]):
+        """outcomes: (category id, subcategory id, outcome text) in catalog order."""
+        self._position: Dict[str, int] = {}
+        self._words: List[Tuple[str, ...]] = []
+        self._grams: Dict[str, int] = {}
+        self._by_cat: Dict[str, int] = {}
+
+        sub_ids: List[str] = []
+        for cat_id, sub_id, text in outcomes:
+            if sub_id in self._position:
+                continue
+            n = len(sub_ids)
+            bit = 1 << n
+            sub_ids.append(sub_id)
+            self._position[sub_id] = n
+            self._by_cat[cat_id] = self._by_cat.get(cat_id, 0) | bit
+
+            words = tuple(dict.fromkeys(_words(f"{sub_id} {text}")))
+            self._words.append(words)
+            keys = set()
+            for w in words:
+                keys.update(w[:k] for k in (1, 2) if len(w) >= k)
+                keys.update(_trigrams(w))
+            for key in keys:
+                self._grams[key] = self._grams.get(key, 0) | bit
+        self.sub_ids: Tuple[str, ...] = tuple(sub_ids)
+
+    @classmethod
+    def from_csf(cls, csf_raw: Any) -> "OutcomeFilterIndex":
+        if isinstance(csf_raw, Mapping):
+            functions = csf_raw.get("functions", []) or []
+        elif isinstance(csf_raw, (list, tuple)):
+            functions = csf_raw
+        else:
+            functions = []
+
+        def outcomes() -> Iterable[Tuple[str, str, str]]:
+            for fn in functions:
+                for cat in fn.get("categories", []) or []:
+                    cat_id = cat.get("id")
+                    if not cat_id:
+                        continue
+                    for item in cat.get("outcomes") or cat.get("subcategories") or []:
+                        sub_id = item.get("id")
+                        if sub_id:
+                            text = (item.get("outcome") or item.get("description") or "").strip()
+                            yield cat_id, sub_id, text
+
+        return cls(outcomes())
+
+    def __len__(self) -> int:
+        return len(self.sub_ids)
+
+    # ---------- queries ----------
+
+    def _term_mask(self, term: str, candidates: int) -> int:
+        if len(term) < 3:
+            return candidates & self._grams.get(term, 0)
+        for gram in _trigrams(term):
+            candidates &= self._grams.get(gram, 0)
+            if not candidates:
+                return 0
+        # Trigrams can co-occur without the whole term; confirm against the words
+        exact = 0
+        for i in _bits(candidates):
+            if any(term in w for w in self._words[i]):
+                exact |= 1 << i
+        return exact
+
+    def mask(self, query: str, cat_id: str) -> int:
+        """Bitset of cat_id's outcomes matching every term of query (all of them if blank)."""
+        mask = self._by_cat.get(cat_id, 0)
+        for term in dict.fromkeys(_words(query)):
+            mask = self._term_mask(term, mask)
+            if not mask:
+                break
+        return mask
+
+    def search(self, query: str, cat_id: str) -> List[str]:
+        """Ids of cat_id's outcomes matching query, in catalog order."""
+        return [self.sub_ids[i] for i in _bits(self.mask(query, cat_id))]
+
+    def count(self, cat_id: str) -> int:
+        return bin(self._by_cat.get(cat_id, 0)).count("1")
+
+    def in_catalog_order(self, sub_ids: Iterable[str]) -> List[str]:
+        """Known ids from sub_ids in catalog order; unknown ids follow, sorted."""
+        known = sorted((self._position[s] for s in set(sub_ids) if s in self._position))
+        unknown = sorted(s for s in set(sub_ids) if s not in self._position)
+        return [self.sub_ids[i] for i in known] + unknown
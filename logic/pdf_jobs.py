@@ -0,0 +1,90 @@
+# logic/pdf_jobs.py
+
+"""
+Background PDF rendering for decision rationales.
+
+Documents are laid out by logic.pdf_layout and rendered on a small, bounded
+thread pool. The app hands render() to a deferred download button, so it
+is called from Streamlit's download handler when the user clicks, and the
+script thread never waits on ReportLab.
+Jobs are keyed by a hash of the normalized rationale (title + lines). The
+same rationale submitted again, from a rerun or from another session, reuses
+the finished or in-flight job instead of rendering again.
+"""
+
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+from logic.pdf_layout import Block, build_pdf
+
+PDF_WORKERS = 2
+PDF_CACHE_SIZE = 64
+
+
+def _normalize_text(text: str) -> str:
+    return unicodedata.normalize("NFC", str(text)).rstrip()
+
+
+def normalize_lines(lines: Iterable[Optional[Block]]) -> List[Block]:
+    """NFC-normalized, right-stripped, non-empty lines (layout blocks keep their type)."""
+    out: List[Block] = []
+    for ln in lines:
+        if ln is None:
+            continue
+        if isinstance(ln, str):
+            ln = _normalize_text(ln)
+            if ln:
+                out.append(ln)
+        else:
+            ln = ln._replace(text=_normalize_text(ln.text))
+            if ln.text:
+                out.append(ln)
+    return out
+
+
+def rationale_key(title: str, lines: Iterable[Optional[Block]]) -> str:
+    """Content hash of a rationale document (after normalize_lines)."""
+    h = hashlib.sha256(title.encode("utf-8"))
+    for ln in normalize_lines(lines):
+        h.update(b"\n")
+        # Block type is part of the content: Heading("x") != Paragraph("x")
+        h.update(repr(ln if isinstance(ln, str) else (type(ln).__name__, *ln)).encode("utf-8"))
+    return h.hexdigest()
+
+
+class PdfJobPool:
+    """
+    Bounded worker pool plus an LRU of rendering jobs keyed by rationale_key.
+
+    Failed jobs are evicted, so resubmitting retries them. Finished PDFs stay
+    cached until PDF_CACHE_SIZE newer rationales push them out.
+    """
+
+    def __init__(self, workers: int = PDF_WORKERS, cache_size: int = PDF_CACHE_SIZE):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf")
+        self._cache_size = cache_size
+        self._jobs: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, title: str, lines: Iterable[Optional[Block]]) -> Future:
+        """Queue a rationale for rendering (reusing a queued or finished job); returns its future."""
+        clean = normalize_lines(lines)
+        key = rationale_key(title, clean)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not (job.done() and job.exception() is not None):
+                self._jobs.move_to_end(key)
+                return job
+            job = self._jobs[key] = self._executor.submit(build_pdf, title, clean)
+            while len(self._jobs) > self._cache_size:
+                self._jobs.popitem(last=False)
+        # Returned rather than looked up again: a later submit may evict the key
+        return job
+
+    def render(self, title: str, lines: Iterable[Optional[Block]], timeout: Optional[float] = None) -> bytes:
+        """Submit (or reuse) a job and wait for its PDF; for callers off the script thread."""
+        return self.submit(title, lines).result(timeout=timeout)
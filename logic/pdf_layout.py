@@ -0,0 +1,206 @@
+# logic/pdf_layout.py
+
+"""
+Width-accurate text layout for the app's PDF documents.
+
+Text is wrapped by real glyph widths (ReportLab font metrics) rather than by
+character count. Word widths are memoized per (font, size, word), so the
+vocabulary a document repeats (CSF ids, principle names, boilerplate) is
+measured once per process. Each paragraph, or the part of it that fits on the
+current page, is drawn as a single PDF text object instead of one drawString
+per line.
+
+Documents are sequences of blocks:
+
+    Heading("Decision context")
+    Paragraph("Free text …")            # or a plain str
+    Bullet("RS.MI-01 — …", level=1)
+
+Plain strings are classified by blocks_from_lines(): "• x" / "- x" become
+bullets (two leading spaces per nesting level), other indented lines become
+indented paragraphs.
+"""
+
+from functools import lru_cache
+from io import BytesIO
+from typing import Iterable, List, NamedTuple, Tuple, Union
+
+from reportlab.lib.pagesizes import LETTER
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+FONT = "Helvetica"
+FONT_BOLD = "Helvetica-Bold"
+
+TITLE_SIZE = 14
+HEADING_SIZE = 11
+BODY_SIZE = 10
+LEADING = 1.4            # line height as a multiple of font size
+
+MARGIN = 54
+BOTTOM_MARGIN = 72
+INDENT = 14              # per nesting level
+BULLET_GAP = 10          # bullet glyph to text
+
+PARAGRAPH_SPACE = 6
+HEADING_SPACE_BEFORE = 8
+HEADING_SPACE_AFTER = 2
+
+
+class Heading(NamedTuple):
+    text: str
+
+
+class Paragraph(NamedTuple):
+    text: str
+    level: int = 0
+
+
+class Bullet(NamedTuple):
+    text: str
+    level: int = 0
+
+
+Block = Union[str, Heading, Paragraph, Bullet]
+
+_BULLET_MARKERS = ("• ", "- ", "* ")
+
+
+# ---------- measuring and wrapping ----------
+
+@lru_cache(maxsize=65536)
+def word_width(word: str, font: str, size: float) -> float:
+    """Advance width of word in points (memoized per font and size)."""
+    return stringWidth(word, font, size)
+
+
+def _break_word(word: str, font: str, size: float, max_width: float) -> List[str]:
+    # A single token wider than the line (URLs, long ids): split by glyphs.
+    pieces: List[str] = []
+    current = ""
+    for ch in word:
+        if current and word_width(current + ch, font, size) > max_width:
+            pieces.append(current)
+            current = ch
+        else:
+            current += ch
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def wrap(text: str, font: str, size: float, max_width: float) -> List[str]:
+    """Greedy word wrap of text into lines no wider than max_width points."""
+    words = text.split()
+    if not words:
+        return [""]
+
+    space = word_width(" ", font, size)
+    lines: List[str] = []
+    current: List[str] = []
+    width = 0.0
+    for word in words:
+        w = word_width(word, font, size)
+        if w > max_width:
+            if current:
+                lines.append(" ".join(current))
+                current, width = [], 0.0
+            *full, word = _break_word(word, font, size, max_width)
+            lines.extend(full)
+            w = word_width(word, font, size)
+        if current and width + space + w > max_width:
+            lines.append(" ".join(current))
+            current, width = [word], w
+        else:
+            width += (space if current else 0.0) + w
+            current.append(word)
+    if current:
+        lines.append(" ".join(current))
+    return lines
+
+
+# ---------- blocks ----------
+
+def blocks_from_lines(lines: Iterable[Block]) -> List[Block]:
+    """Classify plain-string lines as bullets / indented paragraphs; blocks pass through."""
+    blocks: List[Block] = []
+    for ln in lines:
+        if not isinstance(ln, str):
+            blocks.append(ln)
+            continue
+        stripped = ln.lstrip(" ")
+        level = (len(ln) - len(stripped)) // 2
+        for marker in _BULLET_MARKERS:
+            if stripped.startswith(marker):
+                blocks.append(Bullet(stripped[len(marker):], level))
+                break
+        else:
+            blocks.append(Paragraph(stripped, level))
+    return blocks
+
+
+def _style(block: Block) -> Tuple[str, float, float, float, str]:
+    """font, size, text x offset, bullet x offset, bullet glyph"""
+    if isinstance(block, Heading):
+        return FONT_BOLD, HEADING_SIZE, 0.0, 0.0, ""
+    if isinstance(block, Bullet):
+        bullet_x = block.level * INDENT
+        return FONT, BODY_SIZE, bullet_x + BULLET_GAP, bullet_x, "•" if block.level == 0 else "–"
+    return FONT, BODY_SIZE, block.level * INDENT, 0.0, ""
+
+
+# ---------- rendering ----------
+
+def build_pdf(title: str, blocks: Iterable[Block], pagesize: Tuple[float, float] = LETTER) -> bytes:
+    """Lay out title and blocks on pages of pagesize and return the PDF bytes."""
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=pagesize)
+    width, height = pagesize
+    text_width = width - 2 * MARGIN
+    top = height - MARGIN
+
+    y = top
+    for line in wrap(title, FONT_BOLD, TITLE_SIZE, text_width):
+        c.setFont(FONT_BOLD, TITLE_SIZE)
+        c.drawString(MARGIN, y, line)
+        y -= TITLE_SIZE * LEADING
+    y -= TITLE_SIZE * 0.3
+
+    for block in blocks_from_lines(blocks):
+        font, size, text_x, bullet_x, glyph = _style(block)
+        leading = size * LEADING
+        is_heading = isinstance(block, Heading)
+        if is_heading and y < top:
+            y -= HEADING_SPACE_BEFORE
+
+        lines = wrap(block.text, font, size, text_width - text_x)
+        # Keep a heading with at least one following line
+        needed = leading * (2 if is_heading else 1)
+
+        first = True
+        while lines:
+            if y - needed < BOTTOM_MARGIN:
+                c.showPage()
+                y = top
+            fit = max(1, int((y - BOTTOM_MARGIN) // leading))
+            chunk, lines = lines[:fit], lines[fit:]
+
+            if glyph and first:
+                c.setFont(font, size)
+                c.drawString(MARGIN + bullet_x, y, glyph)
+
+            t = c.beginText(MARGIN + text_x, y)
+            t.setFont(font, size, leading)
+            for line in chunk:
+                t.textLine(line)
+            c.drawText(t)
+
+            y -= leading * len(chunk)
+            needed = leading
+            first = False
+
+        y -= HEADING_SPACE_AFTER if is_heading else PARAGRAPH_SPACE
+
+    c.showPage()
+    c.save()
+    return buffer.getvalue()
@@ -0,0 +1,62 @@
+# logic/perf.py
+
+"""
+Wall-clock timing of script runs and fragment reruns.
+
+Wrap a unit of work in timed(label); the duration is logged at DEBUG level
+(streamlit run ... --logger.level=debug) and kept in a small per-label
+window, so summary() can compare, e.g., a full "app" run against an
+"oe.step2" fragment rerun for the same interaction. Timings are recorded
+even when the block exits via st.stop() / st.rerun().
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+WINDOW = 200   # samples kept per label
+
+_samples: Dict[str, Deque[float]] = {}
+_lock = threading.Lock()
+
+
+def record(label: str, ms: float) -> None:
+    with _lock:
+        _samples.setdefault(label, deque(maxlen=WINDOW)).append(ms)
+    logger.debug("%s: %.1f ms", label, ms)
+
+
+@contextmanager
+def timed(label: str) -> Iterator[None]:
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(label, (time.perf_counter() - t0) * 1000)
+
+
+def summary() -> Dict[str, Dict[str, float]]:
+    """{label: {"count", "mean_ms", "p50_ms", "p95_ms"}} over the recent window."""
+    with _lock:
+        snapshot = {label: np.asarray(s, dtype=float) for label, s in _samples.items() if s}
+    return {
+        label: {
+            "count": float(len(arr)),
+            "mean_ms": float(arr.mean()),
+            "p50_ms": float(np.percentile(arr, 50)),
+            "p95_ms": float(np.percentile(arr, 95)),
+        }
+        for label, arr in sorted(snapshot.items())
+    }
+
+
+def reset() -> None:
+    with _lock:
+        _samples.clear()
@@ -0,0 +1,98 @@
+# logic/principles.py
+
+"""
+Canonical registry of the five PFCE principles.
+
+Every principle set (crosswalk rows, user selections, case analyses) is
+encoded as a small integer bitmask, so union, intersection, coverage and
+similarity are single integer operations:
+
+    to_mask(["justice", "Autonomy"]) == JUSTICE | AUTONOMY
+    names(mask) -> ("Autonomy", "Justice")   # always in registry order
+
+Name lookup is case- and separator-insensitive, which reconciles the
+crosswalk's lowercase ids ("non-maleficence") with the UI's display names
+("Non-maleficence").
+"""
+
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+# Display names in canonical order; bit i belongs to PRINCIPLES[i]
+PRINCIPLES: Tuple[str, ...] = (
+    "Beneficence",
+    "Non-maleficence",
+    "Autonomy",
+    "Justice",
+    "Explicability",
+)
+
+BENEFICENCE, NON_MALEFICENCE, AUTONOMY, JUSTICE, EXPLICABILITY = (1 << i for i in range(len(PRINCIPLES)))
+
+ALL_MASK = (1 << len(PRINCIPLES)) - 1
+
+BIT_BY_NAME: Dict[str, int] = {name: 1 << i for i, name in enumerate(PRINCIPLES)}
+
+
+def _key(name: Any) -> str:
+    return "".join(ch for ch in str(name or "").lower() if ch.isalpha())
+
+
+_BIT_BY_KEY: Dict[str, int] = {_key(name): bit for name, bit in BIT_BY_NAME.items()}
+
+# names(mask) for every possible mask, precomputed (32 entries)
+_NAMES_BY_MASK: Tuple[Tuple[str, ...], ...] = tuple(
+    tuple(name for i, name in enumerate(PRINCIPLES) if mask & (1 << i))
+    for mask in range(ALL_MASK + 1)
+)
+
+
+def canonical(name: Any) -> Optional[str]:
+    """Registry display name for name ("justice" -> "Justice"), or None if unknown."""
+    bit = _BIT_BY_KEY.get(_key(name))
+    return PRINCIPLES[bit.bit_length() - 1] if bit else None
+
+
+def bit(name: Any) -> int:
+    """Bit for a single principle name; 0 if unknown."""
+    return _BIT_BY_KEY.get(_key(name), 0)
+
+
+def to_mask(names: Iterable[Any]) -> int:
+    """Encode principle names as a bitmask; unknown names are ignored."""
+    mask = 0
+    for name in names or ():
+        mask |= _BIT_BY_KEY.get(_key(name), 0)
+    return mask
+
+
+def names(mask: int) -> Tuple[str, ...]:
+    """Decode a bitmask into display names, in registry order."""
+    return _NAMES_BY_MASK[mask & ALL_MASK]
+
+
+def count(mask: int) -> int:
+    """Number of principles in mask."""
+    return (mask & ALL_MASK).bit_count()
+
+
+def coverage(mask: int, of: int) -> float:
+    """Share of the principles in `of` that mask also contains (1.0 if `of` is empty)."""
+    if not of:
+        return 1.0
+    return count(mask & of) / count(of)
+
+
+def jaccard(a: int, b: int) -> float:
+    """|a ∩ b| / |a ∪ b| for two masks (0.0 when both are empty)."""
+    union = a | b
+    return count(a & b) / count(union) if union else 0.0
+
+
+def analysis_mask(pfce_analysis: Any) -> int:
+    """
+    Mask of the principles named in a case's ethical.pfce_analysis list
+    ([{principle, description}, ...]); other shapes yield 0.
+    """
+    if not isinstance(pfce_analysis, (list, tuple)):
+        return 0
+    return to_mask(p.get("principle") for p in pfce_analysis if isinstance(p, Mapping))
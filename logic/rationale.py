@@ -0,0 +1,256 @@
+# logic/rationale.py
+
+"""
+Decision rationale document model and its export renderers.
+
+An open-ended walkthrough is captured once as a RationaleDocument: a
+JSON-ready record with stable field names (what a GRC pipeline ingests),
+plus a presentation outline derived from it. Each output format is a pure
+function of the document, so the app can hand renderers to download buttons
+and produce a format only when it is requested:
+
+    to_json(doc)        machine-readable record (RATIONALE_SCHEMA)
+    to_markdown(doc)    Markdown
+    to_html(doc)        self-contained HTML page
+    to_pdf_blocks(doc)  logic.pdf_layout blocks for the PDF renderer
+"""
+
+import html
+import json
+import re
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Tuple, Union
+
+from logic.draft import OpenEndedDraft
+from logic.pdf_layout import Block, Bullet, Heading, Paragraph
+
+RATIONALE_SCHEMA = "mceds.rationale.open-ended/1"
+
+OPEN_ENDED_TITLE = "Decision Rationale (Open-Ended Mode)"
+
+EMPTY = "—"
+
+
+class RationaleDocument(NamedTuple):
+    title: str
+    record: Dict[str, Any]
+
+
+# ---------- presentation outline ----------
+
+class Field(NamedTuple):
+    label: str
+    value: str
+    optional: bool = False     # omit entirely when empty instead of showing "—"
+
+
+class Text(NamedTuple):
+    text: str
+
+
+class Items(NamedTuple):
+    label: str                 # "" for an unlabeled list
+    items: Tuple[str, ...]
+
+
+Entry = Union[Field, Text, Items]
+
+
+class Section(NamedTuple):
+    heading: str
+    entries: Tuple[Entry, ...]
+
+
+# ---------- building ----------
+
+def _labeled(item_id: str, labels: Mapping[str, str]) -> Dict[str, str]:
+    return {"id": item_id, "label": labels.get(item_id, "")}
+
+
+def build_open_ended_rationale(
+    draft: OpenEndedDraft,
+    timestamp: str,
+    func_labels: Mapping[str, str],
+    cat_labels: Mapping[str, str],
+    sub_labels: Mapping[str, str],
+    pfce_focus: str = "",
+) -> RationaleDocument:
+    """Capture the open-ended walkthrough (see logic.draft) as a RationaleDocument."""
+    d = draft
+    func_id = d.csf_function.strip()
+    cat_id = d.csf_category.strip()
+    principles = list(d.pfce_principles)
+
+    record = {
+        "schema": RATIONALE_SCHEMA,
+        "mode": "open-ended",
+        "generated_at": timestamp,
+        "trigger": {
+            "example": d.trigger_example.strip(),
+            "type": d.trigger_type.strip(),
+            "condition": d.triggering_condition.strip(),
+        },
+        "decision_context": {
+            "type": d.decision_type.strip(),
+            "text": d.decision_context.strip(),
+        },
+        "csf": {
+            "function": _labeled(func_id, func_labels) if func_id else None,
+            "category": _labeled(cat_id, cat_labels) if cat_id else None,
+            "subcategories": [_labeled(sid, sub_labels) for sid in d.subcategories],
+            "rationale": d.csf_rationale.strip(),
+        },
+        "ethics": {
+            "condition_tags": list(d.condition_tags),
+            "pfce_analysis": d.pfce_analysis.strip(),
+            "tension": d.ethical_tension.strip(),
+        },
+        "pfce": {
+            "principles": principles,
+            "focus": pfce_focus if principles else "",
+            "rationale": d.pfce_rationale.strip(),
+        },
+        "constraints": {
+            "selected": list(d.constraints),
+            "other": d.constraints_other.strip(),
+        },
+        "decision": d.decision.strip(),
+    }
+    return RationaleDocument(OPEN_ENDED_TITLE, record)
+
+
+def _ref(ref: Any) -> str:
+    # {"id": "RS", "label": "Respond (RS)"} -> label, falling back to id
+    if not ref:
+        return ""
+    return ref.get("label") or ref.get("id") or ""
+
+
+def sections(doc: RationaleDocument) -> Tuple[Section, ...]:
+    """Presentation outline shared by the on-screen view and every text format."""
+    r = doc.record
+    trigger, context, csf = r["trigger"], r["decision_context"], r["csf"]
+    ethics, principles, constraints = r["ethics"], r["pfce"], r["constraints"]
+
+    return (
+        Section("Triggering condition and key events", (
+            Field("Example", trigger["example"], optional=True),
+            Field("Trigger type", trigger["type"]),
+            Text(trigger["condition"]),
+        )),
+        Section("Decision context", (
+            Field("Decision context type", context["type"], optional=True),
+            Text(context["text"]),
+        )),
+        Section("NIST CSF mapping", (
+            Field("Function", _ref(csf["function"])),
+            Field("Category", _ref(csf["category"])),
+            Items("Subcategories / outcomes", tuple(
+                f"{s['id']} — {s['label'] or EMPTY}" for s in csf["subcategories"]
+            )),
+            Field("Rationale", csf["rationale"], optional=True),
+        )),
+        Section("PFCE analysis and ethical tension", (
+            Field("Tags", ", ".join(ethics["condition_tags"]), optional=True),
+            Text(ethics["pfce_analysis"]),
+            Field("Ethical tension", ethics["tension"]),
+        )),
+        Section("PFCE principles", (
+            Text(", ".join(principles["principles"])),
+            Field("Overall ethical focus", principles["focus"], optional=True),
+            Field("PFCE rationale", principles["rationale"], optional=True),
+        )),
+        Section("Institutional and governance constraints", (
+            Items("", tuple(constraints["selected"])),
+            Field("Other", constraints["other"], optional=True),
+        )),
+        Section("Decision", (
+            Text(r["decision"]),
+        )),
+    )
+
+
+def visible_entries(section: Section) -> Iterable[Entry]:
+    """Entries of a section with empty optional fields dropped."""
+    return (e for e in section.entries if not (isinstance(e, Field) and e.optional and not e.value))
+
+
+# ---------- renderers ----------
+
+def to_json(doc: RationaleDocument) -> str:
+    return json.dumps(doc.record, ensure_ascii=False, indent=2)
+
+
+def to_markdown(doc: RationaleDocument) -> str:
+    out: List[str] = [f"# {doc.title}", "", f"**Timestamp:** {doc.record['generated_at']}"]
+    for section in sections(doc):
+        out += ["", f"## {section.heading}", ""]
+        for e in visible_entries(section):
+            if isinstance(e, Field):
+                out.append(f"**{e.label}:** {e.value or EMPTY}  ")
+            elif isinstance(e, Text):
+                out += [e.text or EMPTY, ""]
+            else:
+                if e.label:
+                    out.append(f"**{e.label}:**")
+                out += [f"- {item}" for item in e.items or (EMPTY,)]
+                out.append("")
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(out)).rstrip() + "\n"
+
+
+_HTML_STYLE = (
+    "body{font-family:system-ui,-apple-system,'Segoe UI',Helvetica,Arial,sans-serif;"
+    "max-width:46rem;margin:2rem auto;padding:0 1rem;line-height:1.5;color:#1f2937}"
+    "h1{font-size:1.5rem}h2{font-size:1.1rem;margin-top:1.6rem;border-bottom:1px solid #e5e7eb}"
+    ".meta{color:#6b7280}"
+)
+
+
+def to_html(doc: RationaleDocument) -> str:
+    esc = html.escape
+    out: List[str] = [
+        "<!DOCTYPE html>",
+        '<html lang="en"><head><meta charset="utf-8">',
+        f"<title>{esc(doc.title)}</title>",
+        f"<style>{_HTML_STYLE}</style>",
+        "</head><body>",
+        f"<h1>{esc(doc.title)}</h1>",
+        f'<p class="meta">Timestamp: {esc(doc.record["generated_at"])}</p>',
+    ]
+    for section in sections(doc):
+        out.append(f"<h2>{esc(section.heading)}</h2>")
+        for e in visible_entries(section):
+            if isinstance(e, Field):
+                out.append(f"<p><strong>{esc(e.label)}:</strong> {esc(e.value or EMPTY)}</p>")
+            elif isinstance(e, Text):
+                out.append(f"<p>{esc(e.text or EMPTY)}</p>")
+            else:
+                if e.label:
+                    out.append(f"<p><strong>{esc(e.label)}:</strong></p>")
+                out.append("<ul>" + "".join(f"<li>{esc(i)}</li>" for i in e.items or (EMPTY,)) + "</ul>")
+    out.append("</body></html>")
+    return "\n".join(out) + "\n"
+
+
+def to_pdf_blocks(doc: RationaleDocument) -> List[Block]:
+    blocks: List[Block] = [f"Timestamp: {doc.record['generated_at']}"]
+    for section in sections(doc):
+        blocks.append(Heading(section.heading))
+        for e in visible_entries(section):
+            if isinstance(e, Field):
+                blocks.append(Paragraph(f"{e.label}: {e.value or EMPTY}"))
+            elif isinstance(e, Text):
+                blocks.append(Paragraph(e.text or EMPTY))
+            else:
+                if e.label:
+                    blocks.append(Paragraph(f"{e.label}:"))
+                blocks += [Bullet(item) for item in e.items or (EMPTY,)]
+    return blocks
+
+
+# (label, file extension, mime type, renderer); PDF goes through logic.pdf_jobs
+TEXT_FORMATS: Tuple[Tuple[str, str, str, Callable[[RationaleDocument], str]], ...] = (
+    ("JSON", "json", "application/json", to_json),
+    ("Markdown", "md", "text/markdown", to_markdown),
+    ("HTML", "html", "text/html", to_html),
+)
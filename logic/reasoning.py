@@ -1,46 +1,89 @@
 # logic/reasoning.py
 
-from typing import List, Dict
+from typing import Iterable, List, Dict, Mapping, Union
 
-def apply_crosswalk(selected_csf_ids: List[str], crosswalk: List[Dict]):
+from logic import principles as pfce
+from logic.crosswalk import CrosswalkIndex
+from logic.keywords import KeywordMatcher, KeywordScan
+
+
+# Decision-text cues for each NIST CSF 2.0 function
+CSF_HINT_KEYWORDS = {
+    "GV": ["policy", "policies", "authority", "approval", "oversight", "governance", "charter", "compliance", "board", "council"],
+    "ID": ["inventory", "inventories", "classify", "classification", "asset", "assets", "dependency", "dependencies", "risk register", "risk assessment"],
+    "PR": ["access", "permission", "privilege", "authorization", "encrypt", "encryption", "credential", "password", "data protection", "control", "controls", "configuration"],
+    "DE": ["monitor", "monitoring", "alert", "alerts", "anomaly", "anomalies", "flagged", "suspicious", "detection", "log review"],
+    "RS": ["disconnect", "isolate", "contain", "mitigate", "shutdown", "shut down", "take offline", "incident response", "triage", "manual control", "disable automation", "block traffic"],
+    "RC": ["restore", "restoration", "rebuild", "recover", "back online", "return to operations", "post-incident review", "lessons learned"],
+}
+
+# Compiled once at import; scanning is a single pass per call
+CSF_HINT_MATCHER = KeywordMatcher(CSF_HINT_KEYWORDS)
+
+
+def scan_csf_functions(description: str) -> KeywordScan:
+    """Weighted CSF function scores and matched keyword spans for decision text."""
+    return CSF_HINT_MATCHER.scan(description or "")
+
+
+def apply_crosswalk(
+    selected_csf_ids: List[str],
+    crosswalk: Union[CrosswalkIndex, Iterable[Mapping]],
+):
     """
     Given CSF outcome IDs selected by the user,
     return the PFCE principles and rationale mapped to them.
+
+    Pass the shared CrosswalkIndex (logic.loaders.load_crosswalk_index) for
+    O(1) lookups; a plain list of rows is indexed on the fly.
     """
+    index = crosswalk if isinstance(crosswalk, CrosswalkIndex) else CrosswalkIndex(crosswalk)
 
     results = []
-    for csf_id in selected_csf_ids:
-        match = next((item for item in crosswalk if item["csf_id"] == csf_id), None)
-        if match:
-            results.append({
-                "csf_id": csf_id,
-                "csf_outcome": match["csf_outcome"],
-                "pfce": match["pfce"],
-                "rationale": match["rationale"]
-            })
+    for match in index.lookup(selected_csf_ids):
+        mask = index.mask(match["csf_id"])
+        results.append({
+            "csf_id": match["csf_id"],
+            "csf_outcome": match["csf_outcome"],
+            "pfce": pfce.names(mask),
+            "pfce_mask": mask,
+            "rationale": match["rationale"]
+        })
     return results
 
 
-def summarize_pfce(principles: List[str]):
+def summarize_pfce(principles: Union[int, List[str]]):
     """
     Provide a user-friendly summary of PFCE principles involved.
+
+    Accepts principle names (any case) or a logic.principles bitmask;
+    principles are listed in canonical registry order.
     """
-    if not principles:
+    mask = principles if isinstance(principles, int) else pfce.to_mask(principles)
+    if not mask:
         return "No ethical principles triggered."
 
-    unique_principles = sorted(set(principles))
-    return ", ".join(unique_principles)
+    return ", ".join(pfce.names(mask))
 
 
 def analyze_open_ended_description(description: str):
     """
-    Placeholder for free-text analysis.
-    Later, this may allow keyword detection,
-    prompting the user for refined CSF categories.
+    Keyword analysis of free-text decision context.
+
+    Returns one observation per CSF function whose cue words appear in the
+    text, strongest first, e.g.
+    "RS: disconnect, isolate (score 2)".
     """
 
     if not description:
         return []
 
-    # Example stub you can expand later
-    return ["This description suggests possible mission impact or data exposure."]
+    scan = scan_csf_functions(description)
+    ranked = sorted(
+        (fn for fn, score in scan.scores.items() if score > 0),
+        key=lambda fn: -scan.scores[fn],
+    )
+    return [
+        f"{fn}: {', '.join(scan.keywords_for(fn))} (score {scan.scores[fn]:g})"
+        for fn in ranked
+    ]
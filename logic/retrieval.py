@@ -0,0 +1,154 @@
+# logic/retrieval.py
+
+"""
+BM25 retrieval from free-text decision context to CSF subcategory outcomes.
+
+Each subcategory is indexed as one document: its outcome text, its parent
+category title, and its implementation examples from csf_min.json. The
+sparse term index (term -> posting arrays) is built at bundle time by
+tools/build_data_bundle.py and rebuilt from the sources when the bundle is
+stale, so a query is a handful of numpy scatter-adds plus a partial sort.
+"""
+
+from collections import Counter
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+import numpy as np
+
+from logic.keywords import tokenize
+
+# BM25 parameters (standard defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_STOPWORDS = frozenset(
+    """
+    a an and are as at be been by can for from has have in into is it its of on or
+    our that the their them these this those to was we were what when where which
+    who will with within e g i e eg ie etc such other including include includes
+    """.split()
+)
+
+
+def _stem(token: str) -> str:
+    # Light suffix stripping so "systems"/"system" and "restoring"/"restore" meet.
+    if len(token) > 5 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 5 and token.endswith("ing"):
+        return token[:-3]
+    if len(token) > 4 and token.endswith("ed"):
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def analyze(text: str) -> List[str]:
+    """Index/query terms for text: lowercased, stopwords dropped, lightly stemmed."""
+    return [_stem(tok) for tok, _, _ in tokenize(text) if tok not in _STOPWORDS and len(tok) > 1]
+
+
+class SubcategoryHit(NamedTuple):
+    sub_id: str
+    score: float
+
+
+def _documents(csf_raw: Any) -> Iterable[Tuple[str, str]]:
+    if isinstance(csf_raw, Mapping):
+        functions = csf_raw.get("functions", []) or []
+    elif isinstance(csf_raw, (list, tuple)):
+        functions = csf_raw
+    else:
+        functions = []
+
+    for fn in functions:
+        for cat in fn.get("categories", []) or []:
+            cat_title = cat.get("title") or cat.get("name") or ""
+            for item in cat.get("outcomes") or cat.get("subcategories") or []:
+                sub_id = item.get("id")
+                if not sub_id:
+                    continue
+                parts = [item.get("outcome") or item.get("description") or "", cat_title]
+                parts += [str(ex) for ex in item.get("examples") or ()]
+                yield sub_id, " ".join(parts)
+
+
+class SubcategoryIndex:
+    """
+    Sparse BM25 index over CSF subcategories.
+
+    postings: term -> (doc indices int32, precomputed BM25 term weights float32)
+    The per-posting weight already folds in idf, tf saturation and length
+    normalization, so scoring a query is a sum over its terms' postings.
+    """
+
+    __slots__ = ("sub_ids", "_postings")
+
+    def __init__(self, sub_ids: Tuple[str, ...], postings: Dict[str, Tuple[np.ndarray, np.ndarray]]):
+        self.sub_ids = tuple(sub_ids)
+        self._postings = postings
+
+    @classmethod
+    def build(cls, csf_raw: Any) -> "SubcategoryIndex":
+        sub_ids: List[str] = []
+        term_counts: List[Counter] = []
+        for sub_id, text in _documents(csf_raw):
+            sub_ids.append(sub_id)
+            term_counts.append(Counter(analyze(text)))
+
+        n_docs = len(sub_ids)
+        doc_len = np.array([sum(c.values()) for c in term_counts], dtype=np.float64)
+        avgdl = float(doc_len.mean()) if n_docs else 0.0
+
+        raw: Dict[str, Tuple[List[int], List[int]]] = {}
+        for doc, counts in enumerate(term_counts):
+            for term, tf in counts.items():
+                ids, tfs = raw.setdefault(term, ([], []))
+                ids.append(doc)
+                tfs.append(tf)
+
+        postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for term, (ids, tfs) in raw.items():
+            ids_arr = np.asarray(ids, dtype=np.int32)
+            tf = np.asarray(tfs, dtype=np.float64)
+            df = len(ids)
+            idf = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            norm = BM25_K1 * (1.0 - BM25_B + BM25_B * doc_len[ids_arr] / (avgdl or 1.0))
+            weight = idf * tf * (BM25_K1 + 1.0) / (tf + norm)
+            postings[term] = (ids_arr, weight.astype(np.float32))
+
+        return cls(tuple(sub_ids), postings)
+
+    # ---------- bundle (de)serialization ----------
+
+    def to_payload(self) -> Dict[str, Any]:
+        return {"sub_ids": list(self.sub_ids), "postings": self._postings}
+
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, Any]) -> "SubcategoryIndex":
+        return cls(tuple(payload["sub_ids"]), dict(payload["postings"]))
+
+    # ---------- queries ----------
+
+    def __len__(self) -> int:
+        return len(self.sub_ids)
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every subcategory for query (float32, index-aligned with sub_ids)."""
+        scores = np.zeros(len(self.sub_ids), dtype=np.float32)
+        for term in analyze(query):
+            posting = self._postings.get(term)
+            if posting is not None:
+                scores[posting[0]] += posting[1]
+        return scores
+
+    def search(self, query: str, k: int = 5) -> List[SubcategoryHit]:
+        """Top-k subcategories for query, best first; only positive scores."""
+        if k <= 0 or not self.sub_ids:
+            return []
+        scores = self.scores(query)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [SubcategoryHit(self.sub_ids[i], float(scores[i])) for i in top if scores[i] > 0]
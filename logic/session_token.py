@@ -0,0 +1,195 @@
+# logic/session_token.py
+
+"""
+Stateless replica mode: the session's navigation and wizard state as a
+signed, compressed URL token (?s=<token>).
+
+With MCEDS_STATE_SECRET set (the same value on every replica), each run
+writes the compact state into the URL, and a session that lands on a
+replica which has never seen it (round-robin balancing, a lost node)
+rebuilds itself from the token instead of relying on sticky sessions.
+Without the secret the mode is off and nothing changes.
+
+Token layout (base64url, no padding):
+
+    version (1 byte) | HMAC-SHA256 tag (16 bytes) | raw-deflate(JSON payload)
+
+The payload is positional and terse: the open-ended draft travels as its
+snapshot tuple (logic.draft) with trailing defaults dropped, so the
+field names never enter the URL. Tokens longer than MAX_TOKEN_CHARS are
+not emitted; the ?draft= resume link (logic.draft_store) still covers
+that session.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import zlib
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Dict, List, Optional
+
+from logic import navigation as nav
+from logic.draft import FIELD_NAMES, OpenEndedDraft
+
+TOKEN_PARAM = "s"
+TOKEN_VERSION = 1
+TAG_BYTES = 16
+MAX_TOKEN_CHARS = 1800            # comfortably under the ~2 KB limit of older proxies and browsers
+MAX_PAYLOAD_BYTES = 64 * 1024     # decompression cap for untrusted input
+
+# Session key holding the last token this session emitted or applied
+STATE_KEY = "state_token"
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+def _secret() -> bytes:
+    return os.environ.get("MCEDS_STATE_SECRET", "").encode("utf-8")
+
+
+def enabled() -> bool:
+    return bool(_secret())
+
+
+# ---------- encoding ----------
+
+def _tag(secret: bytes, body: bytes) -> bytes:
+    return hmac.new(secret, body, hashlib.sha256).digest()[:TAG_BYTES]
+
+
+def encode(payload: Mapping[str, Any], secret: Optional[bytes] = None) -> str:
+    secret = secret if secret is not None else _secret()
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    comp = zlib.compressobj(9, zlib.DEFLATED, -15)
+    body = bytes([TOKEN_VERSION]) + comp.compress(raw) + comp.flush()
+    blob = body[:1] + _tag(secret, body) + body[1:]
+    return base64.urlsafe_b64encode(blob).rstrip(b"=").decode("ascii")
+
+
+def decode(token: str, secret: Optional[bytes] = None) -> Dict[str, Any]:
+    """Verify and unpack a token; raises InvalidToken on any mismatch."""
+    secret = secret if secret is not None else _secret()
+    try:
+        blob = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (ValueError, TypeError) as e:
+        raise InvalidToken("malformed token") from e
+    if len(blob) <= 1 + TAG_BYTES or blob[0] != TOKEN_VERSION:
+        raise InvalidToken("unsupported token")
+
+    body = blob[:1] + blob[1 + TAG_BYTES:]
+    if not hmac.compare_digest(blob[1:1 + TAG_BYTES], _tag(secret, body)):
+        raise InvalidToken("bad signature")
+
+    try:
+        inflater = zlib.decompressobj(-15)
+        raw = inflater.decompress(body[1:], MAX_PAYLOAD_BYTES)
+        if inflater.unconsumed_tail:
+            raise InvalidToken("payload too large")
+        payload = json.loads(raw.decode("utf-8"))
+    except (zlib.error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidToken("corrupt payload") from e
+    if not isinstance(payload, dict):
+        raise InvalidToken("corrupt payload")
+    return payload
+
+
+# ---------- session state <-> payload ----------
+
+_DEFAULTS = OpenEndedDraft().snapshot()
+
+
+def _trimmed_snapshot(draft: OpenEndedDraft) -> List[Any]:
+    # restore() leaves missing trailing fields at their defaults
+    values = list(draft.snapshot())
+    while values and values[-1] == _DEFAULTS[len(values) - 1]:
+        values.pop()
+    return [list(v) if isinstance(v, tuple) else v for v in values]
+
+
+def capture(state: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+    """Compact payload for the current session state, or None on the landing page."""
+    if not state.get("landing_complete"):
+        return None
+    if state.get("active_mode") == "Case-Based":
+        if state.get("cb_view") == "walkthrough" and state.get("cb_case_id"):
+            return {"m": "cb", "c": state["cb_case_id"], "s": state.get("cb_step", 1)}
+        return {"m": "cb"}
+
+    payload: Dict[str, Any] = {"m": "oe", "s": state.get("oe_step", 1)}
+    draft = state.get("oe_draft")
+    if isinstance(draft, OpenEndedDraft):
+        payload["d"] = _trimmed_snapshot(draft)
+    if state.get("oe_draft_id"):
+        payload["i"] = state["oe_draft_id"]
+    return payload
+
+
+def _step(value: Any, total: int) -> int:
+    try:
+        return min(max(int(value), 1), total)
+    except (TypeError, ValueError):
+        return 1
+
+
+def apply(state: MutableMapping[str, Any], payload: Mapping[str, Any]) -> None:
+    """Rebuild session state from a capture() payload (through the navigation transitions)."""
+    mode = payload.get("m")
+    if mode == "cb":
+        case_id = payload.get("c")
+        if isinstance(case_id, str) and case_id:
+            nav.fire(state, "open_case", case_id)
+            state["cb_step"] = _step(payload.get("s"), nav.CB_TOTAL_STEPS)
+        else:
+            nav.fire(state, "enter_mode", "Case-Based", "walkthrough")
+    elif mode == "oe":
+        # Widget keys of the current draft would override the restored values
+        for key in [k for k in state if k.startswith("oe_")]:
+            del state[key]
+        nav.fire(state, "enter_mode", "Open-Ended", "walkthrough")
+        state["oe_step"] = _step(payload.get("s"), nav.OE_TOTAL_STEPS)
+        snapshot = payload.get("d")
+        if isinstance(snapshot, list):
+            state["oe_draft"] = OpenEndedDraft.restore(snapshot[:len(FIELD_NAMES)])
+        if isinstance(payload.get("i"), str):
+            state["oe_draft_id"] = payload["i"]
+    else:
+        raise InvalidToken("unknown mode")
+
+
+# ---------- URL sync ----------
+
+def restore_from(params: Mapping[str, Any], state: MutableMapping[str, Any]) -> bool:
+    """
+    Apply the ?s= token unless this session emitted or already applied it.
+    Returns True when state was rebuilt; raises InvalidToken for a bad token.
+    A no-op unless the mode is enabled.
+    """
+    token = params.get(TOKEN_PARAM) if enabled() else None
+    if not token or token == state.get(STATE_KEY):
+        return False
+    apply(state, decode(token))
+    state[STATE_KEY] = token
+    return True
+
+
+def sync_to(params: MutableMapping[str, Any], state: MutableMapping[str, Any]) -> None:
+    """
+    Write the current state's token into the URL, or drop it when there is
+    nothing to write (landing page, oversized state). A no-op unless enabled.
+    """
+    if not enabled():
+        return
+    payload = capture(state)
+    token = encode(payload) if payload is not None else None
+    if token is not None and len(token) > MAX_TOKEN_CHARS:
+        token = None
+    state[STATE_KEY] = token
+    if token is None:
+        if TOKEN_PARAM in params:
+            del params[TOKEN_PARAM]
+    elif params.get(TOKEN_PARAM) != token:
+        params[TOKEN_PARAM] = token
@@ -0,0 +1,312 @@
+# logic/similarity.py
+
+"""
+Similar-case retrieval: rank the case library against an open-ended decision.
+
+Each case is reduced to a compact feature record (CSF functions and
+categories, PFCE bitmask, hashed term counts of its decision text) the first
+time a ranking needs it, and cached per case file version (mtime, size).
+Documents come from the catalog's own per-version cache, so a case opened in
+a walkthrough is not parsed a second time. A data bundle built by
+tools/build_data_bundle.py can seed the features (keyed by each case file's
+sha256), which replaces the parse with a hash. The library is then stacked
+into small numpy matrices and a query is scored against every case with a
+few vectorized operations:
+
+    score = 0.4 * csf_overlap + 0.3 * pfce_jaccard + 0.3 * text_cosine
+"""
+
+import hashlib
+import re
+import threading
+from collections import Counter
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import yaml
+
+from logic import principles as pfce
+from logic.case_index import CaseEntry, CaseIndex
+from logic.retrieval import analyze
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+CSF_FUNCTION_IDS = ("GV", "ID", "PR", "DE", "RS", "RC")
+
+# Hashed term space for text vectors (collisions are harmless at this size)
+TEXT_DIM = 1 << 11
+
+WEIGHT_CSF = 0.4
+WEIGHT_PFCE = 0.3
+WEIGHT_TEXT = 0.3
+
+# "Respond (RS)" / "Mitigation (MI)" and "DE.AE – Adverse Event Analysis"
+_PAREN_CODE = re.compile(r"\(([A-Z]{2})\)")
+_CAT_FULL = re.compile(r"\b([A-Z]{2})\.([A-Z]{2})\b")
+
+
+class CaseFeatures(NamedTuple):
+    case_id: str
+    ui_title: str
+    functions: Tuple[str, ...]       # e.g. ("RS",)
+    categories: Tuple[str, ...]      # e.g. ("RS.MI",)
+    pfce_mask: int
+    terms: Tuple[Tuple[int, int], ...]   # (hashed term bucket, count)
+
+
+class SimilarCase(NamedTuple):
+    case_id: str
+    ui_title: str
+    score: float
+    csf: float
+    pfce: float
+    text: float
+
+
+def _bucket(term: str) -> int:
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=4).digest(), "little") % TEXT_DIM
+
+
+def hashed_terms(text: str) -> Tuple[Tuple[int, int], ...]:
+    """Bag of analyzed terms as sorted (bucket, count) pairs."""
+    counts = Counter(_bucket(t) for t in analyze(text))
+    return tuple(sorted(counts.items()))
+
+
+def _flatten(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return " ".join(_flatten(v) for v in value)
+    if isinstance(value, Mapping):
+        return " ".join(_flatten(v) for v in value.values())
+    return str(value)
+
+
+def parse_csf_mapping(mapping: Any) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Function and category ids from a case's technical.nist_csf_mapping, which
+    writes them as prose: "Respond (RS)" + "Mitigation (MI)", or "DE.AE – ...".
+    """
+    functions: List[str] = []
+    categories: List[str] = []
+    for m in mapping if isinstance(mapping, (list, tuple)) else ():
+        if not isinstance(m, Mapping):
+            continue
+        fm = _PAREN_CODE.search(str(m.get("function") or ""))
+        func = fm.group(1) if fm else ""
+        if func:
+            functions.append(func)
+
+        cats = m.get("categories") or []
+        if isinstance(cats, str):
+            cats = [cats]
+        for c in cats:
+            c = str(c)
+            full = _CAT_FULL.search(c)
+            if full:
+                categories.append(f"{full.group(1)}.{full.group(2)}")
+                functions.append(full.group(1))
+                continue
+            code = _PAREN_CODE.search(c)
+            if code and func:
+                categories.append(f"{func}.{code.group(1)}")
+
+    return tuple(dict.fromkeys(functions)), tuple(dict.fromkeys(categories))
+
+
+def case_features(case_id: str, ui_title: str, doc: Mapping[str, Any]) -> CaseFeatures:
+    """Reduce a full case document to its similarity features."""
+    technical = doc.get("technical") or {}
+    ethical = doc.get("ethical") or {}
+    background = doc.get("background") or {}
+
+    functions, categories = parse_csf_mapping(technical.get("nist_csf_mapping"))
+    text = " ".join([
+        _flatten(doc.get("short_summary")),
+        _flatten(technical.get("decision_context")),
+        _flatten(background.get("triggering_condition_key_events")),
+        _flatten([t.get("description") for t in ethical.get("tension") or () if isinstance(t, Mapping)]),
+    ])
+    return CaseFeatures(
+        case_id=case_id,
+        ui_title=ui_title,
+        functions=functions,
+        categories=categories,
+        pfce_mask=pfce.analysis_mask(ethical.get("pfce_analysis")),
+        terms=hashed_terms(text),
+    )
+
+
+def feature_key(path: Path) -> str:
+    """
+    Seed key for a case file: its sha256 plus the hashed term space, so seeds
+    computed with a different TEXT_DIM are never reused.
+    """
+    with path.open("rb") as f:
+        return f"{hashlib.file_digest(f, 'sha256').hexdigest()}:{TEXT_DIM}"
+
+
+def features_from_file(entry: CaseEntry, path: Path) -> CaseFeatures:
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            doc = yaml.load(f, Loader=_YAML_LOADER) or {}
+    except Exception:
+        doc = {}
+    return case_features(entry.id, entry.ui_title, doc if isinstance(doc, Mapping) else {})
+
+
+class _Matrices(NamedTuple):
+    features: Tuple[CaseFeatures, ...]
+    functions: np.ndarray        # (n, 6) bool
+    category_ids: Tuple[str, ...]
+    categories: np.ndarray       # (n, n_categories) bool
+    pfce_bits: np.ndarray        # (n, 5) bool
+    idf: np.ndarray              # (TEXT_DIM,) float32
+    text: np.ndarray             # (n, TEXT_DIM) float32, rows L2-normalized tf-idf
+
+
+def _stack(features: Sequence[CaseFeatures]) -> _Matrices:
+    n = len(features)
+    func_col = {f: i for i, f in enumerate(CSF_FUNCTION_IDS)}
+    category_ids = tuple(sorted({c for f in features for c in f.categories}))
+    cat_col = {c: i for i, c in enumerate(category_ids)}
+
+    functions = np.zeros((n, len(CSF_FUNCTION_IDS)), dtype=bool)
+    categories = np.zeros((n, len(category_ids)), dtype=bool)
+    tf = np.zeros((n, TEXT_DIM), dtype=np.float32)
+    masks = np.zeros(n, dtype=np.uint8)
+
+    for row, f in enumerate(features):
+        functions[row, [func_col[x] for x in f.functions if x in func_col]] = True
+        categories[row, [cat_col[c] for c in f.categories]] = True
+        masks[row] = f.pfce_mask
+        if f.terms:
+            buckets, counts = zip(*f.terms)
+            tf[row, list(buckets)] = 1.0 + np.log(np.asarray(counts, dtype=np.float32))
+
+    df = (tf > 0).sum(axis=0)
+    idf = np.log((1.0 + n) / (1.0 + df)).astype(np.float32) + 1.0
+    text = tf * idf
+    text /= np.maximum(np.linalg.norm(text, axis=1, keepdims=True), 1e-9)
+
+    pfce_bits = ((masks[:, None] >> np.arange(len(pfce.PRINCIPLES), dtype=np.uint8)) & 1).astype(bool)
+    return _Matrices(tuple(features), functions, category_ids, categories, pfce_bits, idf, text)
+
+
+class CaseSimilarityIndex:
+    """
+    Feature cache plus stacked matrices over the whole case library.
+
+    Features are cached per (path, mtime, size); the matrices are rebuilt
+    only when the set of case file versions changes. load_doc supplies a
+    case's parsed document (the catalog's cached revision); without it the
+    file is parsed here. Seed features (e.g. from the data bundle) are
+    trusted only when the file's feature_key matches.
+    """
+
+    def __init__(self, case_index: CaseIndex, root: Path,
+                 seed: Optional[Mapping[str, Tuple[str, CaseFeatures]]] = None,
+                 load_doc: Optional[Callable[[CaseEntry], Mapping[str, Any]]] = None):
+        self._case_index = case_index
+        self._root = root
+        self._seed = dict(seed or {})
+        self._load_doc = load_doc
+        self._lock = threading.Lock()
+        self._features: Dict[str, Tuple[Tuple[int, int], CaseFeatures]] = {}
+        self._version: Optional[Tuple[Tuple[str, int, int], ...]] = None
+        self._matrices: Optional[_Matrices] = None
+
+    def _features_for(self, entry: CaseEntry) -> CaseFeatures:
+        sig = (entry.mtime_ns, entry.size)
+        cached = self._features.get(entry.path)
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+
+        path = self._root / entry.path
+        seeded = self._seed.get(entry.path)
+        if seeded is not None and seeded[0] == feature_key(path):
+            feats = seeded[1]._replace(case_id=entry.id, ui_title=entry.ui_title)
+        elif self._load_doc is not None:
+            feats = case_features(entry.id, entry.ui_title, self._load_doc(entry))
+        else:
+            feats = features_from_file(entry, path)
+        self._features[entry.path] = (sig, feats)
+        return feats
+
+    def matrices(self) -> _Matrices:
+        entries = self._case_index.entries()
+        version = tuple((e.path, e.mtime_ns, e.size) for e in entries)
+        with self._lock:
+            if self._matrices is None or version != self._version:
+                features = [self._features_for(e) for e in entries]
+                live = {e.path for e in entries}
+                self._features = {p: v for p, v in self._features.items() if p in live}
+                self._matrices = _stack(features)
+                self._version = version
+            return self._matrices
+
+    def rank(
+        self,
+        function_id: Optional[str],
+        category_id: Optional[str],
+        pfce_mask: int,
+        text: str,
+        k: int = 3,
+    ) -> List[SimilarCase]:
+        """Top-k cases most similar to an open-ended decision, best first."""
+        m = self.matrices()
+        n = len(m.features)
+        if not n or k <= 0:
+            return []
+
+        # CSF overlap: same function (0.4) and same category (0.6)
+        func_hit = np.zeros(n, dtype=np.float32)
+        if function_id in CSF_FUNCTION_IDS:
+            func_hit = m.functions[:, CSF_FUNCTION_IDS.index(function_id)].astype(np.float32)
+        cat_hit = np.zeros(n, dtype=np.float32)
+        if category_id in m.category_ids:
+            cat_hit = m.categories[:, m.category_ids.index(category_id)].astype(np.float32)
+        csf = 0.4 * func_hit + 0.6 * cat_hit
+
+        # PFCE Jaccard over bit columns
+        q_bits = ((np.uint8(pfce_mask) >> np.arange(len(pfce.PRINCIPLES), dtype=np.uint8)) & 1).astype(bool)
+        inter = (m.pfce_bits & q_bits).sum(axis=1)
+        union = (m.pfce_bits | q_bits).sum(axis=1)
+        pfce_sim = np.where(union > 0, inter / np.maximum(union, 1), 0.0).astype(np.float32)
+
+        # Text cosine against the library's tf-idf rows
+        q = np.zeros(TEXT_DIM, dtype=np.float32)
+        for bucket, count in hashed_terms(text):
+            q[bucket] = 1.0 + np.log(count)
+        q *= m.idf
+        norm = float(np.linalg.norm(q))
+        text_sim = (m.text @ (q / norm)) if norm > 0 else np.zeros(n, dtype=np.float32)
+
+        score = WEIGHT_CSF * csf + WEIGHT_PFCE * pfce_sim + WEIGHT_TEXT * text_sim
+        k = min(k, n)
+        top = np.argpartition(-score, k - 1)[:k]
+        top = top[np.argsort(-score[top], kind="stable")]
+        return [
+            SimilarCase(
+                m.features[i].case_id, m.features[i].ui_title, float(score[i]),
+                float(csf[i]), float(pfce_sim[i]), float(text_sim[i]),
+            )
+            for i in top
+            if score[i] > 0
+        ]
+
+
+def build_feature_seed(case_index: CaseIndex, root: Path) -> Dict[str, Tuple[str, CaseFeatures]]:
+    """
+    Precompute features for every case as {relpath: (feature_key, CaseFeatures)},
+    for storage in the data bundle. Parses and hashes the whole library, so
+    it belongs in the bundle build, never in a cold start.
+    """
+    seed: Dict[str, Tuple[str, CaseFeatures]] = {}
+    for entry in case_index.entries():
+        path = root / entry.path
+        seed[entry.path] = (feature_key(path), features_from_file(entry, path))
+    return seed
@@ -0,0 +1,23 @@
+"""
+Shared setup for the tools that drive the app headlessly through AppTest.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import tempfile
+from pathlib import Path
+
+
+def isolate_app_state() -> None:
+    """
+    Point the app's draft store and audit log at a throwaway directory, so a
+    run leaves nothing in data/state or data/logs. Call it before the first
+    AppTest run: the cleanup is then registered before the app registers its
+    own exit flushes, so it runs after them.
+    """
+    tmp = tempfile.TemporaryDirectory(prefix="mceds-tools-")
+    atexit.register(tmp.cleanup)
+    os.environ["MCEDS_DRAFTS_DB"] = str(Path(tmp.name) / "drafts.sqlite3")
+    os.environ["MCEDS_AUDIT_DIR"] = str(Path(tmp.name) / "logs")
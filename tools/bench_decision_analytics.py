@@ -0,0 +1,116 @@
+"""
+Time decision-log compaction and the dashboard aggregates at scale.
+
+Writes a synthetic audit log (logic.audit_log) of N decisions spread over a
+year into a temporary directory, then times: the first compaction into
+column files, a no-op refresh, an incremental refresh after more events,
+loading the merged columns, and each aggregate the dashboard shows.
+
+Usage:
+    python tools/bench_decision_analytics.py [--events 300000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from logic import decision_analytics as da  # noqa: E402
+from logic import principles as pfce  # noqa: E402
+from logic.audit_log import AuditLog, segments_in  # noqa: E402
+
+FUNCTIONS = ("GV", "ID", "PR", "DE", "RS", "RC")
+CONSTRAINTS = (
+    "Budget limitations", "Staffing shortages", "Legacy systems", "Legal or regulatory requirements",
+    "Vendor dependencies", "Political pressure", "Public records obligations", "Interagency coordination",
+)
+CASES = ("baltimore", "sandiego", "riverton")
+
+
+@contextmanager
+def _timed(label: str) -> Iterator[None]:
+    t0 = time.perf_counter()
+    yield
+    print(f"  {label:<34} {(time.perf_counter() - t0) * 1000:9.1f} ms")
+
+
+def _write_events(log: AuditLog, n: int, rng: random.Random) -> None:
+    for _ in range(n):
+        if rng.random() < 0.15:
+            log.record("cb.completed", case_id=rng.choice(CASES), case_sha256="0" * 64)
+            continue
+        fn = rng.choice(FUNCTIONS)
+        mask = rng.randrange(1, pfce.ALL_MASK + 1)
+        log.record(
+            "oe.rationale",
+            draft_id="x" * 16,
+            pfce_mask=mask,
+            rationale={
+                "csf": {
+                    "function": {"id": fn, "label": fn},
+                    "category": {"id": f"{fn}.{rng.choice('ABCDE')}{rng.choice('ABCDE')}", "label": ""},
+                },
+                "pfce": {"principles": list(pfce.names(mask))},
+                "constraints": {"selected": rng.sample(CONSTRAINTS, rng.randrange(0, 4))},
+                "decision": "Isolate affected systems while preserving critical services.",
+            },
+        )
+    log.flush()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=300_000, help="synthetic decisions to log")
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        log = AuditLog(directory)
+
+        print(f"Writing {args.events:,} events ...")
+        _write_events(log, args.events, rng)
+        print(f"  {len(segments_in(directory))} segment(s), "
+              f"{sum(p.stat().st_size for p in segments_in(directory)) / 1e6:.1f} MB compressed")
+
+        print("Compaction:")
+        with _timed("first compaction"):
+            da.compact(directory)
+        with _timed("refresh, nothing new"):
+            da.compact(directory)
+        _write_events(log, 1000, rng)
+        with _timed("refresh after 1,000 new events"):
+            da.compact(directory)
+
+        print("Queries:")
+        with _timed("load_columns"):
+            cols = da.load_columns(directory)
+        # The log stamps real time; spread the rows over a year so there are months to group by
+        year_s = 365 * 24 * 3600
+        cols = cols._replace(ts=cols.ts - (np.arange(cols.rows) * year_s // cols.rows).astype("timedelta64[s]"))
+        with _timed("principles by function by month"):
+            table = da.principles_by_function_month(cols)
+        with _timed("top principle per cell"):
+            top = da.top_principles(table)
+        with _timed("constraint co-occurrence"):
+            da.constraint_cooccurrence(cols)
+        with _timed("case completions"):
+            da.counts_by(cols.case, cols.cases)
+        print(f"  {cols.rows:,} rows, {len(table.months)} months, {len(top)} (month, function) cells")
+        log.close()
+
+
+if __name__ == "__main__":
+    main()
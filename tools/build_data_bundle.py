@@ -0,0 +1,52 @@
+"""
+Compile the CSF, crosswalk, PFCE principle and constraint sources into the
+binary data bundle (data/build/data.bundle) that logic.loaders reads at cold
+start. Case files are indexed by header instead (see logic.case_index), but
+their similarity features are precomputed here, keyed by each file's sha256
+so an edited case simply falls back to computing its own.
+
+The bundle records the sha256 of every source file; the app ignores it and
+parses the sources directly whenever any of them has changed, so re-running
+this script after editing data is an optimization, not a requirement.
+
+Usage:
+    python tools/build_data_bundle.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from logic.bundle import hash_sources, read_bundle, write_bundle  # noqa: E402
+from logic.case_index import CaseIndex  # noqa: E402
+from logic.loaders import BUNDLE_PATH, CASES_DIR, parse_sources, source_files  # noqa: E402
+from logic.similarity import build_feature_seed  # noqa: E402
+
+
+def main() -> None:
+    sources = source_files()
+
+    t0 = time.perf_counter()
+    payload = parse_sources()
+    payload["case_features"] = build_feature_seed(CaseIndex(CASES_DIR, ROOT_DIR), ROOT_DIR)
+    parse_ms = (time.perf_counter() - t0) * 1000
+
+    size = write_bundle(BUNDLE_PATH, payload, hash_sources(sources, ROOT_DIR))
+
+    t0 = time.perf_counter()
+    if read_bundle(BUNDLE_PATH, sources, ROOT_DIR) is None:
+        raise SystemExit(f"❌ Bundle at {BUNDLE_PATH} failed to read back")
+    load_ms = (time.perf_counter() - t0) * 1000
+
+    print(f"✅ Wrote {BUNDLE_PATH} ({size / 1024:.1f} KiB, {len(sources)} source files)")
+    print(f"   Parse sources: {parse_ms:.1f} ms, load bundle: {load_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Install the self-hosted Inter font into app/static/fonts/, optionally
+subset to the glyphs the app actually renders.
+
+logic/assets.py declares the @font-face (font-display: swap) for
+app/static/fonts/InterVariable.woff2 whenever the file is present, so
+installing it is all the stylesheet needs. Get InterVariable.woff2 (or
+.ttf) from the official Inter release (https://github.com/rsms/inter/releases,
+SIL Open Font License) on any connected machine, run this script once and
+commit the output.
+
+--subset keeps Basic Latin, Latin-1, general punctuation and every character
+that appears in the app sources and data files. It needs fontTools and
+brotli (pip install fonttools brotli), which are build-time tools only.
+
+Usage:
+    python tools/build_fonts.py --source PATH/InterVariable.woff2 [--subset]
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from logic.assets import FONT_FACES, FONTS_DIR  # noqa: E402
+
+OUTPUT_NAME = next(file_name for family, file_name, _ in FONT_FACES if family == "Inter")
+
+# Always kept when subsetting, so user-typed text in the usual Latin range renders
+BASE_RANGES = (
+    (0x0020, 0x007E),   # Basic Latin
+    (0x00A0, 0x00FF),   # Latin-1 Supplement
+    (0x2010, 0x2027),   # dashes, quotes, bullets, ellipsis
+    (0x2030, 0x203A),   # per mille, primes, angle quotes
+    (0x20AC, 0x20AC),   # euro
+    (0x2190, 0x2194),   # arrows (← ↑ → ↓ ↔)
+)
+
+# Files whose text the font may have to render
+TEXT_GLOBS = (
+    "app/**/*.py",
+    "app/styles/*.css",
+    "data/cases/*.yaml",
+    "data/crosswalk/*.yaml",
+    "data/crosswalk/csf_min.json",
+    "data/*constraints.yaml",
+)
+
+
+def used_codepoints() -> set[int]:
+    codepoints = {cp for lo, hi in BASE_RANGES for cp in range(lo, hi + 1)}
+    for pattern in TEXT_GLOBS:
+        for path in ROOT_DIR.glob(pattern):
+            if path.is_file():
+                codepoints.update(ord(ch) for ch in path.read_text(encoding="utf-8", errors="ignore"))
+    return {cp for cp in codepoints if cp >= 0x20}
+
+
+def subset_font(source: Path, dest: Path) -> int:
+    """Write a woff2 subset of source to dest; returns the number of codepoints requested."""
+    try:
+        from fontTools import subset
+    except ImportError:
+        raise SystemExit("❌ --subset needs fontTools and brotli: pip install fonttools brotli")
+
+    codepoints = used_codepoints()
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = ["*"]        # keep kerning, ligatures, tabular figures
+    options.name_IDs = ["*"]
+    options.notdef_outline = True
+
+    font = subset.load_font(str(source), options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    subset.save_font(font, str(dest), options)
+    return len(codepoints)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", type=Path, required=True, help="InterVariable .woff2 or .ttf")
+    parser.add_argument("--subset", action="store_true", help="keep only glyphs the app uses")
+    args = parser.parse_args()
+
+    if not args.source.is_file():
+        raise SystemExit(f"❌ {args.source} not found")
+
+    FONTS_DIR.mkdir(parents=True, exist_ok=True)
+    dest = FONTS_DIR / OUTPUT_NAME
+
+    if args.subset:
+        n = subset_font(args.source, dest)
+        detail = f"subset to {n} codepoints"
+    elif args.source.suffix.lower() == ".woff2":
+        shutil.copyfile(args.source, dest)
+        detail = "copied"
+    else:
+        raise SystemExit("❌ Non-woff2 sources must be converted: pass --subset")
+
+    print(
+        f"✅ Wrote {dest} ({args.source.stat().st_size / 1024:.1f} KiB → "
+        f"{dest.stat().st_size / 1024:.1f} KiB, {detail})"
+    )
+    print("   Re-run tools/build_static_assets.py so the built stylesheet declares it.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Minify and fingerprint the app stylesheet (app/styles/*.css) into
+app/static/css/, which Streamlit serves at /app/static/ (see
+.streamlit/config.toml). Until this has been run, or whenever the sources
+change afterwards, the app inlines the source CSS instead.
+
+Pass --measure to compare the bytes the app sends per rerun with the
+stylesheet inlined versus linked. It is a best-effort dev aid: it walks
+AppTest's public main/sidebar blocks, but sizes them through each node's
+.proto, which Streamlit does not document as stable, so it may break on a
+Streamlit upgrade. The build itself does not depend on it.
+
+Usage:
+    python tools/build_static_assets.py [--measure]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from logic.assets import CSS_BUILD_DIR, build_stylesheet  # noqa: E402
+
+APP_PATH = ROOT_DIR / "app" / "main.py"
+
+# (label, query params, session state) of the views to measure
+MEASURED_VIEWS = (
+    ("landing", {}, {}),
+    ("case walkthrough", {"cb_case_id": "baltimore"}, {}),
+    ("open-ended step 2", {"mode": "Open-Ended", "start": "walkthrough"}, {"oe_step": 2}),
+)
+
+
+def _element_bytes(node) -> int:
+    proto = getattr(node, "proto", None)
+    total = proto.ByteSize() if proto is not None and hasattr(proto, "ByteSize") else 0
+    for child in getattr(node, "children", {}).values():
+        total += _element_bytes(child)
+    return total
+
+
+def rerun_bytes(inline: bool) -> list[tuple[str, int]]:
+    """Serialized size of every element each measured view sends on a rerun."""
+    from streamlit.testing.v1 import AppTest
+
+    os.environ["MCEDS_INLINE_CSS"] = "1" if inline else "0"
+    sizes = []
+    for label, params, state in MEASURED_VIEWS:
+        at = AppTest.from_file(str(APP_PATH), default_timeout=30)
+        for k, v in params.items():
+            at.query_params[k] = v
+        at.run()
+        for k, v in state.items():
+            at.session_state[k] = v
+        at.run()  # the rerun an interaction triggers
+        sizes.append((label, _element_bytes(at.main) + _element_bytes(at.sidebar)))
+    return sizes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--measure", action="store_true", help="report bytes sent per rerun")
+    args = parser.parse_args()
+
+    manifest = build_stylesheet()
+    print(
+        f"✅ Wrote {CSS_BUILD_DIR / manifest['file']} "
+        f"({manifest['source_bytes'] / 1024:.1f} KiB → {manifest['bytes'] / 1024:.1f} KiB minified)"
+    )
+
+    if args.measure:
+        inline = dict(rerun_bytes(inline=True))
+        linked = dict(rerun_bytes(inline=False))
+        print("\nBytes sent per rerun (inline stylesheet → linked stylesheet):")
+        for label in inline:
+            print(f"   {label:<20} {inline[label]:>8,} → {linked[label]:>8,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Check that every navigation click costs exactly one script run.
+
+Drives the app headlessly through each declared transition in
+logic/navigation.py (tile links, Previous/Next in both modes, Generate,
+the header Back buttons, and the decision analytics page) and counts full
+script runs from the "app" timer in logic.perf. A handler that mutates
+state after the click and then calls st.rerun() shows up here as two runs.
+
+Usage:
+    python tools/check_navigation.py
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from logic import perf  # noqa: E402
+from logic.navigation import CB_TOTAL_STEPS, OE_TOTAL_STEPS  # noqa: E402
+from tools._apptest_env import isolate_app_state  # noqa: E402
+
+APP_PATH = ROOT_DIR / "app" / "main.py"
+EXPECTED_RUNS = 1
+
+
+def _new_app(**query) -> AppTest:
+    at = AppTest.from_file(str(APP_PATH), default_timeout=30)
+    for k, v in query.items():
+        at.query_params[k] = v
+    return at
+
+
+def _script_runs(action: Callable[[], None]) -> int:
+    perf.reset()
+    action()
+    return int(perf.summary().get("app", {}).get("count", 0))
+
+
+def _click(at: AppTest, label_prefix: str = "", key: str = "") -> Callable[[], None]:
+    def run() -> None:
+        if key:
+            at.button(key=key).click().run()
+        else:
+            next(b for b in at.button if b.label.startswith(label_prefix)).click().run()
+    return run
+
+
+def main() -> None:
+    isolate_app_state()
+    checks: List[Tuple[str, int, bool]] = []
+
+    def check(name: str, action: Callable[[], None], ok: Callable[[], bool]) -> None:
+        runs = _script_runs(action)
+        checks.append((name, runs, runs == EXPECTED_RUNS and ok()))
+
+    # Case-Based: tile link, Next to the end, Previous, Back to cases, Back to modes
+    cb = _new_app(cb_case_id="baltimore")
+    check("open case (?cb_case_id=)", cb.run, lambda: cb.session_state["cb_step"] == 1)
+    for step in range(2, CB_TOTAL_STEPS + 1):
+        check(f"case Next → {step}", _click(cb, "Next"), lambda s=step: cb.session_state["cb_step"] == s)
+    check("case Previous", _click(cb, "◀"), lambda: cb.session_state["cb_step"] == CB_TOTAL_STEPS - 1)
+    check("Back to Case Selection", _click(cb, key="back_to_cases"),
+          lambda: cb.session_state["cb_view"] == "select")
+    check("Back to Mode Selection", _click(cb, key="back_to_modes"),
+          lambda: not cb.session_state["landing_complete"])
+
+    # Open-Ended: tile link, Next through every step, Previous, Generate
+    oe = _new_app(mode="Open-Ended", start="walkthrough")
+    check("enter mode (?mode=)", oe.run, lambda: oe.session_state["oe_step"] == 1)
+    oe.text_area(key="oe_decision_context").input("Isolate the network after ransomware").run()
+    for step in range(2, OE_TOTAL_STEPS + 1):
+        check(f"open-ended Next → {step}", _click(oe, "Next"),
+              lambda s=step: oe.session_state["oe_step"] == s)
+        if step == 2:
+            # Step 2 holds back Next until a CSF outcome is selected
+            oe.radio(key="oe_csf_choice_step2").set_value("RS").run()
+            oe.radio(key="oe_csf_category").set_value("RS.MI").run()
+            oe.checkbox(key="oe_sub_RS.MI-01").check().run()
+    check("open-ended Generate", _click(oe, key="oe_generate_pdf"),
+          lambda: not oe.session_state["oe_generate"])
+    check("open-ended Previous", _click(oe, "◀"),
+          lambda: oe.session_state["oe_step"] == OE_TOTAL_STEPS - 1)
+
+    # Decision analytics: sidebar button in, Back out to where the user was
+    check("open Decision Analytics", _click(oe, key="open_dashboard"),
+          lambda: oe.session_state["dashboard"])
+    check("close Decision Analytics", _click(oe, key="dashboard_back"),
+          lambda: "dashboard" not in oe.session_state and oe.session_state["oe_step"] == OE_TOTAL_STEPS - 1)
+
+    width = max(len(name) for name, _, _ in checks)
+    for name, runs, ok in checks:
+        print(f"{'✅' if ok else '❌'} {name:<{width}}  {runs} run{'s' if runs != 1 else ''}")
+
+    failed = [name for name, _, ok in checks if not ok]
+    if failed:
+        raise SystemExit(f"❌ {len(failed)} navigation(s) did not take exactly {EXPECTED_RUNS} script run")
+    print(f"✅ {len(checks)} navigations, {EXPECTED_RUNS} script run each")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Export every case walkthrough (data/cases/*.yaml, all nine steps) as a PDF
+brief, rendering cases in parallel across CPU cores.
+
+Output goes to data/build/case_pdfs/ by default, alongside a manifest of
+the content hash each PDF was rendered from. Re-runs only render new or
+changed cases; pass --force to render everything.
+
+Usage:
+    python tools/export_case_pdfs.py [--out DIR] [--workers N] [--force]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from logic.case_export import ExportResult, export_cases  # noqa: E402
+from logic.loaders import CASES_DIR, DATA_DIR  # noqa: E402
+
+DEFAULT_OUT_DIR = DATA_DIR / "build" / "case_pdfs"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT_DIR, help="output directory")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="re-render cases even if unchanged")
+    args = parser.parse_args()
+
+    def _print(result: ExportResult) -> None:
+        if result.status == "failed":
+            print(f"❌ {result.source}: {result.error}")
+        elif result.status == "rendered":
+            print(f"✅ {result.source} → {result.pdf}")
+
+    t0 = time.perf_counter()
+    results = export_cases(CASES_DIR, args.out, workers=args.workers, force=args.force, on_result=_print)
+    elapsed = time.perf_counter() - t0
+
+    counts = {s: sum(1 for r in results if r.status == s) for s in ("rendered", "skipped", "failed")}
+    print(
+        f"\n{counts['rendered']} rendered, {counts['skipped']} unchanged, "
+        f"{counts['failed']} failed in {elapsed:.2f} s → {args.out}"
+    )
+    if counts["failed"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
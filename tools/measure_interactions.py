@@ -0,0 +1,87 @@
+"""
+Measure the per-interaction cost of the open-ended wizard's checkbox steps.
+
+Toggles Step 2 subcategory checkboxes (oe_sub_*) and Step 3 principle
+checkboxes (oe_pfce_*) headlessly, then compares, from logic.perf timings:
+
+    full rerun      the whole script (main(): CSS, sidebar, header, step)
+    step fragment   the step fragment's own timer within that full run
+
+AppTest always reruns the whole script, so this does not drive a real
+fragment-only rerun. The fragment figure is its share of a full run, which
+approximates what a toggle re-executes in the browser now that each step is
+an st.fragment (less the fragment-rerun overhead itself).
+
+Usage:
+    python tools/measure_interactions.py [--toggles N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from logic import perf  # noqa: E402
+from logic.draft import OpenEndedDraft  # noqa: E402
+from tools._apptest_env import isolate_app_state  # noqa: E402
+
+APP_PATH = ROOT_DIR / "app" / "main.py"
+
+
+def _open_step(step: int, state: dict) -> AppTest:
+    at = AppTest.from_file(str(APP_PATH), default_timeout=30)
+    at.query_params["mode"] = "Open-Ended"
+    at.query_params["start"] = "walkthrough"
+    at.run()
+    for k, v in state.items():
+        at.session_state[k] = v
+    at.session_state["oe_step"] = step
+    at.run()
+    return at
+
+
+def _toggle(at: AppTest, prefix: str, toggles: int) -> None:
+    boxes = [cb.key for cb in at.checkbox if cb.key and cb.key.startswith(prefix)]
+    for i in range(toggles):
+        box = at.checkbox(key=boxes[i % len(boxes)])
+        box.set_value(not box.value)
+        at.run()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--toggles", type=int, default=30, help="checkbox toggles per step")
+    args = parser.parse_args()
+    isolate_app_state()
+
+    scenarios = (
+        ("Step 2 (oe_sub_*)", 2, "oe_sub_", "oe.step2",
+         {"oe_draft": OpenEndedDraft(csf_function="RS", csf_category="RS.MA")}),
+        ("Step 3 (oe_pfce_*)", 3, "oe_pfce_", "oe.step3",
+         {"oe_draft": OpenEndedDraft(subcategories=("RS.MA-01", "RS.MA-02"))}),
+    )
+
+    print(f"Per-interaction cost over {args.toggles} toggles (mean ms):")
+    for label, step, prefix, fragment, state in scenarios:
+        at = _open_step(step, state)
+        perf.reset()
+        _toggle(at, prefix, args.toggles)
+        stats = perf.summary()
+        full = stats["app"]["mean_ms"]
+        frag = stats[fragment]["mean_ms"]
+        print(
+            f"   {label:<20} full rerun {full:6.1f}   step fragment {frag:6.1f} "
+            f"({frag / max(full, 1e-6):.0%} of the full run; {args.toggles} toggles: "
+            f"{full * args.toggles:,.0f} ms, fragment share {frag * args.toggles:,.0f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()